@@ -36,16 +36,23 @@ class ClockApp:
         self.container.os_interaction().restart_spotify_daemon()
         tornado.ioloop.IOLoop.current().stop()
 
-    def go(self):
-
-        signal.signal(signal.SIGTERM, self.shutdown_function)
+    def start(self, serve_api: bool = True):
+        """Builds and starts all services and emits the startup events."""
+        # async handlers and loop delivered events run on the loop started in go()
+        self.container.event_bus().attach_loop(
+            tornado.ioloop.IOLoop.current().asyncio_loop
+        )
 
         config = self.container.config()
         context = self.container.alarm_clock_context()
         self.container.persistence()
 
+        event_journal = self.container.event_journal()
+        if event_journal is not None:
+            event_journal.share("config", config)
+
         logger.info("config available")
-        ci: any = None
+        self.ci = None
 
         if self.is_on_hardware():
             # self.container.button_manager()
@@ -56,19 +63,25 @@ class ClockApp:
                 ComputerInfrastructure,
             )
 
-            ci = ComputerInfrastructure(executor=self.container.executor())
-            self.container.brightness_sensor.override(providers.Object(ci))
+            self.ci = ComputerInfrastructure(executor=self.container.executor())
+            self.container.brightness_sensor.override(providers.Object(self.ci))
             self.container.device.override(
                 providers.Singleton(dummy, height=64, width=256, mode="RGB")
             )
 
-        alarm_audio_service: AlarmAudioService = self.container.alarm_audio_service()
+        self.alarm_audio_service: AlarmAudioService = (
+            self.container.alarm_audio_service()
+        )
         self.container.system_service()
-        if ci is not None:
-            ci.configure(alarm_audio_service)
+        self.container.frame_scheduler()
+        if self.ci is not None:
+            self.ci.configure(self.alarm_audio_service)
 
-        api = self.container.api()
-        api.start()
+        if serve_api:
+            api = self.container.api()
+            api.start()
+        else:
+            self.container.display()
 
         self.container.speaker()
 
@@ -80,14 +93,29 @@ class ClockApp:
         self.container.event_bus().emit(PlaybackChangedEvent(Mode.Idle))
         self.container.event_bus().emit(StartupFinishedEvent())
 
-        tornado.ioloop.IOLoop.current().start()
-
-        alarm_audio_service.scheduler_service.shutdown()
+    def stop(self):
+        self.container.persistence().flush()
+        self.container.alarm_journal().close()
+        self.alarm_audio_service.scheduler_service.shutdown()
         if self.is_on_hardware():
             self.container.mcp_manager().close()
             self.container.gpio_manager().cleanup()
-        elif ci is not None:
-            ci.stop()
+        elif self.ci is not None:
+            self.ci.stop()
+
+        event_journal = self.container.event_journal()
+        if event_journal is not None:
+            event_journal.close()
+
+    def go(self):
+
+        signal.signal(signal.SIGTERM, self.shutdown_function)
+
+        self.start()
+
+        tornado.ioloop.IOLoop.current().start()
+
+        self.stop()
 
         logger.info("shutdown complete")
         sys.exit(0)
@@ -0,0 +1,85 @@
+"""
+Encode/decode throughput of the config codec against jsonpickle, which was
+used for the config file and the config api before, for configs with a
+growing number of alarms.
+
+run from src: python -m benchmarks.config_codec_benchmark [-n 200]
+"""
+
+import argparse
+import sys
+import time
+from typing import Callable
+
+import jsonpickle
+
+from core.domain.config_codec import dumps_config, loads_config
+from core.domain.model import (
+    AlarmDefinition,
+    AudioStream,
+    Config,
+    StreamAudioEffect,
+    VisualEffect,
+)
+
+
+def build_config(alarms: int) -> Config:
+    config = Config()
+    for i in range(5):
+        config.add_audio_stream(AudioStream(f"Stream {i}", f"http://radio/{i}.mp3"))
+    config.add_audio_stream(config.get_offline_stream())
+    for i in range(alarms):
+        alarm = AlarmDefinition()
+        alarm.alarm_name = f"Alarm {i}"
+        alarm.hour, alarm.min = 5 + i % 12, i % 60
+        alarm.recurring = ["MONDAY", "WEDNESDAY", "FRIDAY"] if i % 2 else None
+        alarm.onetime = None
+        if not alarm.recurring:
+            alarm.set_future_date(alarm.hour, alarm.min)
+        alarm.is_active = i % 3 != 0
+        alarm.visual_effect = VisualEffect() if i % 2 else None
+        alarm.audio_effect = StreamAudioEffect(
+            config.audio_streams[i % len(config.audio_streams)], volume=0.4
+        )
+        config.add_alarm_definition(alarm)
+    return config
+
+
+def per_call_us(func: Callable[[], object], repeat: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser("config_codec_benchmark")
+    parser.add_argument("-n", "--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(
+        f"{'alarms':>6} | {'jsonpickle enc':>14} | {'codec enc':>10} | "
+        f"{'jsonpickle dec':>14} | {'codec dec':>10}"
+    )
+    print("-" * 68)
+    for alarms in (1, 10, 50):
+        config = build_config(alarms)
+        legacy_text = jsonpickle.encode(config, indent=2)
+        text = dumps_config(config)
+
+        legacy_encode = per_call_us(
+            lambda: jsonpickle.encode(config, indent=2), args.repeat
+        )
+        encode = per_call_us(lambda: dumps_config(config), args.repeat)
+        legacy_decode = per_call_us(lambda: jsonpickle.decode(legacy_text), args.repeat)
+        decode = per_call_us(lambda: loads_config(text), args.repeat)
+        print(
+            f"{alarms:>6} | {legacy_encode:>11.0f} us | {encode:>7.0f} us | "
+            f"{legacy_decode:>11.0f} us | {decode:>7.0f} us"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+"""
+Headless rendering benchmark of Display for every ModeName, on a device that
+drops frames and with the offscreen Qt platform.
+
+Each scenario renders frames with the frame cache cleared, so every frame is
+painted. Reported are per-frame latency percentiles and the memory allocated
+per frame (tracemalloc peak, measured in a separate pass). The run fails
+when a scenario exceeds the stored baseline by more than the tolerance.
+Baselines are machine specific, record them on the target with
+--update-baseline.
+
+run from src: python -m benchmarks.display_benchmark [--update-baseline]
+"""
+
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import datetime
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from luma.core.device import device
+from luma.core.interface.serial import noop
+
+from core.application.frame_scheduler import FrameScheduler
+from core.domain.mode_coordinator import AlarmClockModeCoordinator, ModeName
+from core.domain.alarm_definition_editor import AlarmProperty
+from core.domain.model import (
+    AlarmClockContext,
+    AlarmDefinition,
+    AudioStream,
+    Config,
+    Mode,
+    NextAlarmInfo,
+    PlaybackContent,
+    RoomBrightness,
+    SpotifyStream,
+    StreamAudioEffect,
+    VisualEffect,
+)
+from core.infrastructure.event_bus import EventBus
+from core.interface.display import widgets
+from core.interface.display.display import Display
+from core.interface.display.display_content import DisplayContent
+from core.interface.display.format import DisplayFormatter
+from utils.geolocation import GeoLocation, Weather
+from utils.sound_device import SoundDevice
+
+baseline_file = os.path.join(os.path.dirname(__file__), "display_baseline.json")
+
+
+class FixedVolumeSoundDevice(SoundDevice):
+    """Sound device without a mixer, keeps the volume in memory."""
+
+    def __init__(self):
+        super().__init__()
+        self.volume = 0.5
+
+    def get_system_volume(self) -> float:
+        return self.volume
+
+    def set_system_volume(self, volume: float):
+        self.volume = volume
+
+
+class NullDevice(device):
+    """
+    Device that drops every frame. Display saves each frame shown on luma's
+    dummy device as a png, which would be timed along with the rendering.
+    """
+
+    def __init__(self, width: int, height: int, mode: str):
+        super().__init__(serial_interface=noop())
+        self.capabilities(width, height, 0, mode)
+
+    def display(self, image):
+        assert image.size == self.size
+
+
+class FrameClock:
+    """
+    Monotonic clock of the widgets, advanced by one scroll frame per rendered
+    frame instead of the few microseconds a frame takes here.
+    """
+
+    frame_interval = FrameScheduler.min_scroll_frame_interval.total_seconds()
+
+    def __init__(self):
+        self.now = time.monotonic()
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class DisplayBench:
+    """Display with synthetic content, switchable between the benchmark scenarios."""
+
+    def __init__(self):
+        self.clock = FrameClock()
+        # only the scroller reads the clock of the widgets module
+        widgets.time = self.clock
+        self.event_bus = EventBus()
+        self.config = Config(self.event_bus)
+        self.config.add_audio_stream(
+            AudioStream(stream_name="fm4", stream_url="https://example.invalid/fm4")
+        )
+        alarm = AlarmDefinition()
+        alarm.alarm_name = "morning"
+        alarm.hour = 6
+        alarm.min = 45
+        alarm.recurring = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY"]
+        alarm.onetime = None
+        alarm.is_active = True
+        alarm.visual_effect = VisualEffect()
+        alarm.audio_effect = StreamAudioEffect(
+            audio_stream=self.config.audio_streams[0], volume=0.3
+        )
+        self.config.add_alarm_definition(alarm)
+
+        self.context = AlarmClockContext(self.config, is_online=True)
+        self.playback_content = PlaybackContent(
+            self.context, FixedVolumeSoundDevice(), self.event_bus
+        )
+        self.display_content = DisplayContent(
+            self.context, self.playback_content, self.event_bus
+        )
+        self.display_content.current_weather = Weather(61, 12.5)
+        self.display_content.update_next_alarm(
+            NextAlarmInfo(GeoLocation().now() + datetime.timedelta(hours=3), alarm)
+        )
+        self.coordinator = AlarmClockModeCoordinator(self.event_bus, self.context)
+        self.context.mode_coordinator = self.coordinator
+
+        self.display = Display(
+            NullDevice(width=256, height=64, mode="RGB"),
+            self.display_content,
+            self.playback_content,
+            DisplayFormatter(self.display_content, self.context),
+            self.context,
+            self.event_bus,
+        )
+
+    def reset(self):
+        self.coordinator.return_to_default_mode()
+        self.display_content.room_brightness = RoomBrightness(1.0)
+        self.playback_content.playback_mode = Mode.Idle
+        self.playback_content.audio_stream = None
+        self.display_content.is_scrolling = False
+        self.display_content.scroll_resumes_at = None
+
+    def default_normal(self):
+        self.reset()
+
+    def default_gloomy(self):
+        self.reset()
+        self.display_content.room_brightness = RoomBrightness(0.0)
+
+    def default_scrolling(self):
+        self.reset()
+        self.playback_content.playback_mode = Mode.Spotify
+        self.playback_content.audio_stream = SpotifyStream(
+            {
+                "name": "A Rather Long Track Name (Extended Remastered Version)",
+                "artists": ["Some Artist", "Another Artist", "Featured Guest"],
+            }
+        )
+
+    def alarm_view(self):
+        self.reset()
+        self.coordinator.handle_mode_button()
+
+    def alarm_edit(self):
+        self.alarm_view()
+        self.coordinator.handle_invoke_button()
+
+    def edit_property(self, alarm_property: AlarmProperty):
+        self.alarm_edit()
+        while self.coordinator.editing_service.property_to_edit != alarm_property:
+            self.coordinator.navigate_properties(1)
+        self.coordinator.handle_invoke_button()
+
+    def property_edit(self):
+        self.edit_property(AlarmProperty.HOUR)
+
+    def day_picker(self):
+        self.edit_property(AlarmProperty.RECURRING)
+
+    def scenarios(self) -> Dict[str, tuple[Callable[[], None], ModeName]]:
+        return {
+            "default_normal": (self.default_normal, ModeName.DEFAULT),
+            "default_gloomy": (self.default_gloomy, ModeName.DEFAULT),
+            "default_scrolling": (self.default_scrolling, ModeName.DEFAULT),
+            "alarm_view": (self.alarm_view, ModeName.ALARM_VIEW),
+            "alarm_edit": (self.alarm_edit, ModeName.ALARM_EDIT),
+            "property_edit": (self.property_edit, ModeName.PROPERTY_EDIT),
+            "day_picker": (self.day_picker, ModeName.DAY_PICKER),
+        }
+
+    def frame(self, index: int):
+        self.clock.now += self.clock.frame_interval
+        if self.display_content.scroll_resumes_at is not None:
+            # the frame scheduler sleeps through the pause between cycles
+            self.clock.now = max(self.clock.now, self.display_content.scroll_resumes_at)
+        self.display_content.show_blink_segment = index % 2 == 0
+        self.display.frame_cache.clear()
+        self.display.refresh()
+
+
+def percentile(samples: List[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def measure(bench: DisplayBench, frames: int) -> dict:
+    first_start = time.perf_counter()
+    bench.frame(0)
+    first_frame_ms = (time.perf_counter() - first_start) * 1000
+
+    samples = []
+    for i in range(frames):
+        start = time.perf_counter()
+        bench.frame(i)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    allocations = []
+    for i in range(min(frames, 50)):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        bench.frame(i)
+        _, peak = tracemalloc.get_traced_memory()
+        allocations.append((peak - before) / 1024)
+    tracemalloc.stop()
+
+    return dict(
+        first_frame_ms=round(first_frame_ms, 3),
+        p50_ms=round(percentile(samples, 50), 3),
+        p95_ms=round(percentile(samples, 95), 3),
+        p99_ms=round(percentile(samples, 99), 3),
+        max_ms=round(max(samples), 3),
+        alloc_kib=round(statistics.mean(allocations), 1),
+    )
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "alloc_kib"):
+            limit = reference[metric] * tolerance
+            if result[metric] > limit:
+                regressions.append(
+                    f"{name}: {metric} {result[metric]} > {limit:.3f} "
+                    f"(baseline {reference[metric]})"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser("display_benchmark")
+    parser.add_argument("-n", "--frames", type=int, default=200)
+    parser.add_argument("-t", "--tolerance", type=float, default=1.5)
+    parser.add_argument("-u", "--update-baseline", action="store_true")
+    parser.add_argument("scenarios", nargs="*", help="default: all")
+    args = parser.parse_args()
+
+    bench = DisplayBench()
+    scenarios = bench.scenarios()
+    names = args.scenarios or list(scenarios)
+
+    results = {}
+    print(
+        f"{'scenario':<18} | {'first':>8} | {'p50':>7} | {'p95':>7} | "
+        f"{'p99':>7} | {'max':>7} | {'alloc/frame':>12}"
+    )
+    print("-" * 86)
+    for name in names:
+        setup, expected_mode = scenarios[name]
+        setup()
+        assert bench.display.current_mode_name() == expected_mode, name
+        result = measure(bench, args.frames)
+        results[name] = result
+        print(
+            f"{name:<18} | {result['first_frame_ms']:>5.2f} ms | "
+            f"{result['p50_ms']:>4.2f} ms | {result['p95_ms']:>4.2f} ms | "
+            f"{result['p99_ms']:>4.2f} ms | {result['max_ms']:>4.2f} ms | "
+            f"{result['alloc_kib']:>8.1f} KiB"
+        )
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(baseline_file):
+            with open(baseline_file) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(baseline_file, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline written to {baseline_file}")
+        return 0
+
+    if not os.path.exists(baseline_file):
+        print("no baseline stored, run with --update-baseline")
+        return 0
+
+    with open(baseline_file) as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Per-emit overhead of EventBus, compared to the previous dispatch path
+(uuid4 event ids, qualname lookup and timeit wrapping of every handler),
+and alarm delivery latency through the EventDispatcher while slow UI and
+background events are flooding it.
+
+run from src: python -m benchmarks.event_bus_benchmark
+"""
+
+import logging
+import statistics
+import time
+from timeit import timeit
+from uuid import uuid4
+
+from core.domain.events import (
+    AlarmTriggeredEvent,
+    ForcedDisplayUpdateEvent,
+    SpotifyStoppedEvent,
+    VolumeChangedEvent,
+    WeatherUpdatedEvent,
+)
+from core.infrastructure.event_bus import EventBus, logger
+from core.infrastructure.event_dispatcher import EventDispatcher
+
+
+class PreviousEventBus(EventBus):
+    """EventBus with the dispatch path as it was before the handler tables."""
+
+    def emit(self, event):
+        event_id = uuid4()
+        event_type = type(event)
+        suppress_logging = getattr(event, "suppress_logging", False)
+        handlers = [handler for _, _, handler, _ in self._handlers.get(event_type, ())]
+
+        if not handlers:
+            logger.warning(f"No handlers registered for {event_type.__name__}")
+            return
+
+        if not suppress_logging:
+            logger.info(
+                f"Emitting {event_type.__name__}({event_id}) to {len(handlers)} handler(s)"
+            )
+        handler_times = {}
+        for handler in handlers:
+            try:
+                handler_name = (
+                    f"{handler.__func__.__qualname__}"
+                    if hasattr(handler, "__func__")
+                    else handler.__name__
+                )
+                handler_times[handler_name] = (
+                    timeit(lambda: handler(event), number=1) * 1000
+                )
+            except Exception as e:
+                logger.error(
+                    f"Error in handler {handler_name} for {event_type.__name__}: {e}",
+                    exc_info=True,
+                )
+        if not suppress_logging:
+            msg = f"Emitted {event_type.__name__}({event_id}) to {len(handlers)} handler(s) with execution times:"
+            for handler, exec_time in handler_times.items():
+                msg += "\n - " + f"{handler}: {exec_time:.2f} ms"
+            logger.debug(msg)
+
+
+class Subscriber:
+
+    def handle(self, event):
+        pass
+
+
+def per_emit_us(bus: EventBus, event, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        bus.emit(event)
+    return (time.perf_counter() - start) * 1_000_000 / number
+
+
+def alarm_latency_under_load(noise: int, alarms: int = 50) -> dict[str, float]:
+    bus = EventBus(dispatcher=EventDispatcher())
+    latencies = []
+    # the alarm "definition" carries the emit timestamp
+    bus.register(
+        AlarmTriggeredEvent,
+        lambda e: latencies.append(time.perf_counter() - e.alarm_definition),
+    )
+    bus.register(WeatherUpdatedEvent, lambda _: time.sleep(0.002))
+    bus.register(SpotifyStoppedEvent, lambda _: time.sleep(0.002))
+
+    for _ in range(noise):
+        bus.emit_async(WeatherUpdatedEvent(suppress_logging=True))
+        bus.emit_async(SpotifyStoppedEvent(suppress_logging=True))
+    for _ in range(alarms):
+        bus.emit_async(AlarmTriggeredEvent(time.perf_counter(), suppress_logging=True))
+        time.sleep(0.002)
+    bus.shutdown(wait=True)
+    return dict(
+        p50_us=statistics.median(latencies) * 1_000_000,
+        max_us=max(latencies) * 1_000_000,
+    )
+
+
+def main(number: int = 100_000):
+    # as in production: INFO is logged, DEBUG is not
+    logging.basicConfig(level=logging.WARNING)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    scenarios = {
+        "display update, suppressed": ForcedDisplayUpdateEvent(suppress_logging=True),
+        "volume change, logged": VolumeChangedEvent(new_volume=50),
+    }
+    print(f"{'scenario':<30} | {'handlers':>8} | {'before':>10} | {'after':>10}")
+    print("-" * 70)
+    for handler_count in (1, 3):
+        buses = {"before": PreviousEventBus(), "after": EventBus()}
+        for bus in buses.values():
+            for event in scenarios.values():
+                for _ in range(handler_count):
+                    bus.register(type(event), Subscriber().handle)
+
+        for name, event in scenarios.items():
+            results = {
+                label: per_emit_us(bus, event, number) for label, bus in buses.items()
+            }
+            print(
+                f"{name:<30} | {handler_count:>8} | "
+                f"{results['before']:>7.2f} us | {results['after']:>7.2f} us"
+            )
+
+        for bus in buses.values():
+            bus.shutdown()
+
+    logging.getLogger("tac.core.infrastructure.event_dispatcher").setLevel(
+        logging.ERROR
+    )
+    print()
+    print(f"{'queued noise events':<30} | {'alarm p50':>10} | {'alarm max':>10}")
+    print("-" * 57)
+    for noise in (0, 1_000, 10_000):
+        result = alarm_latency_under_load(noise)
+        print(
+            f"{2 * noise:<30} | {result['p50_us']:>7.0f} us | "
+            f"{result['max_us']:>7.0f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
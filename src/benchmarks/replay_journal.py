@@ -0,0 +1,153 @@
+"""
+Replays an event journal recorded with ClockApp --journal against a fresh
+ClockApp in software mode, without the web api, and reports handler and
+display refresh timings of the replay.
+
+Only root events, the ones emitted from outside of any handler, are
+replayed; the events derived from them are emitted again by the handlers.
+The startup of the recorded session and the frame ticks are skipped as the
+replaying app produces its own. References to the config resolve to the
+config of the replaying app. Events recorded from emit_async are replayed
+through emit_async, so that they take the dispatcher's priority queues as
+they did when recorded.
+
+The replaying app works on a copy of the live config in a temporary
+directory, with an alarm journal of its own there, and records no event
+journal; the files of the installed clock are left alone.
+
+run from src: python -m benchmarks.replay_journal PATH [--speed 10]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from typing import List
+
+from core.infrastructure.event_journal import JournalRecord, journal_files, read_journal
+
+
+def root_records(
+    path: str, shared: dict, startup_type: type, skip_types: tuple
+) -> List[JournalRecord]:
+    records = [
+        record
+        for file in journal_files(path)
+        for record in read_journal(file, shared)
+        if record.is_root
+    ]
+    # drop what the recorded app emitted itself while starting up
+    for i, record in enumerate(records):
+        if isinstance(record.event, startup_type):
+            records = records[i + 1 :]
+            break
+    return [r for r in records if not isinstance(r.event, skip_types)]
+
+
+def replay(bus, records: List[JournalRecord], speed: float):
+    if not records:
+        return
+    first_ns = records[0].timestamp_ns
+    start = time.monotonic()
+    for record in records:
+        if speed > 0:
+            due = start + (record.timestamp_ns - first_ns) / 1e9 / speed
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        if record.is_async:
+            bus.emit_async(record.event)
+        else:
+            bus.emit(record.event)
+
+
+def report(registry, top: int):
+    for name, title in (
+        ("tac_event_handler_seconds", "handlers"),
+        ("tac_display_refresh_phase_seconds", "display refresh"),
+    ):
+        histograms = [h for h in registry.histograms(name) if h.count > 0]
+        histograms.sort(key=lambda h: h.sum, reverse=True)
+        print(f"\n{title}")
+        print(f"{'count':>7} {'total ms':>10} {'mean ms':>9} {'p95 ms':>8}  labels")
+        for histogram in histograms[:top]:
+            labels = " ".join(f"{k}={v}" for k, v in histogram.labels)
+            print(
+                f"{histogram.count:>7} {histogram.sum * 1000:>10.1f} "
+                f"{histogram.sum / histogram.count * 1000:>9.2f} "
+                f"{histogram.quantile(0.95) * 1000:>8.1f}  {labels}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser("replay_journal")
+    parser.add_argument("journal", help="journal path, rotated files are included")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="time scale of the recorded timing, 0 replays as fast as possible",
+    )
+    parser.add_argument(
+        "--settle", type=float, default=2.0, help="seconds to wait after the last event"
+    )
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    # the container reads its own arguments while being imported
+    sys.argv = ["ClockApp", "--software"]
+    import tornado.ioloop
+    from dependency_injector import providers
+
+    from app_clock import ClockApp
+    from core.domain.events import ForcedDisplayUpdateEvent, StartupFinishedEvent
+    from resources.resources import config_file, init_logging
+    from utils.metrics import MetricsRegistry
+
+    init_logging()
+    workdir = tempfile.TemporaryDirectory(prefix="tac-replay-")
+    replay_config_file = os.path.join(workdir.name, "config.json")
+    if os.path.exists(config_file):
+        shutil.copyfile(config_file, replay_config_file)
+
+    app = ClockApp()
+    app.container.config_path.override(providers.Object(replay_config_file))
+    app.container.alarm_journal_path.override(
+        providers.Object(os.path.join(workdir.name, "alarm_journal.bin"))
+    )
+    config = app.container.config()
+    records = root_records(
+        args.journal,
+        {"config": config},
+        StartupFinishedEvent,
+        (ForcedDisplayUpdateEvent, StartupFinishedEvent),
+    )
+    print(f"replaying {len(records)} events from {args.journal}")
+
+    app.start(serve_api=False)
+    loop = tornado.ioloop.IOLoop.current()
+    bus = app.container.event_bus()
+
+    def run():
+        started = time.perf_counter()
+        try:
+            replay(bus, records, args.speed)
+            time.sleep(args.settle)
+        finally:
+            print(f"replayed in {time.perf_counter() - started:.1f}s")
+            loop.add_callback(loop.stop)
+
+    threading.Thread(target=run, name="JournalReplay", daemon=True).start()
+    loop.start()
+    app.stop()
+    workdir.cleanup()
+
+    report(MetricsRegistry(), args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Compares luma's ssd1322 with diff_to_previous(num_segments=4), as wired in the
+DI container, against NumpySSD1322 fed with RGB and with "L" frames on a
+capturing serial interface.
+
+run from src: python -m benchmarks.ssd1322_benchmark
+"""
+
+import time
+
+from luma.core.framebuffer import diff_to_previous
+from luma.oled.device import ssd1322
+from PIL import Image, ImageDraw, ImageFont
+
+from core.infrastructure.oled import NumpySSD1322
+
+
+class CaptureSerial:
+    """Serial interface that records what would go over SPI."""
+
+    def __init__(self):
+        self.data_bytes = 0
+        self.commands = 0
+
+    def command(self, *cmd):
+        self.commands += 1
+
+    def data(self, data):
+        self.data_bytes += len(data)
+
+    def cleanup(self):
+        pass
+
+    def reset(self):
+        self.data_bytes = 0
+        self.commands = 0
+
+
+def clock_frame(
+    mode: str, minute: int, show_blink: bool, background: str = "black"
+) -> Image.Image:
+    image = Image.new(mode, (256, 64), background)
+    draw = ImageDraw.Draw(image)
+    digits = ImageFont.load_default(size=44)
+    small = ImageFont.load_default(size=12)
+    foreground = "white" if background == "black" else "black"
+    draw.text((4, 6), "07", font=digits, fill=foreground)
+    if show_blink:
+        draw.text((58, 4), ":", font=digits, fill=foreground)
+    draw.text((74, 6), f"{minute:02d}", font=digits, fill=foreground)
+    draw.line((150, 4, 150, 59), fill="gray")
+    draw.text((158, 8), "12.5 C  sunny", font=small, fill=foreground)
+    draw.text((158, 26), "Radio Paradise", font=small, fill=foreground)
+    draw.text((158, 44), "alarm 07:30", font=small, fill=foreground)
+    return image
+
+
+def scenarios(mode: str) -> dict[str, list[Image.Image]]:
+    return {
+        "blink": [clock_frame(mode, 30, i % 2 == 0) for i in range(40)],
+        "minute": [clock_frame(mode, i % 60, True) for i in range(40)],
+        "static": [clock_frame(mode, 30, True)] * 40,
+        "full": [
+            clock_frame(mode, 30, True, "black" if i % 2 else "white")
+            for i in range(40)
+        ],
+    }
+
+
+def run(name: str, device, serial: CaptureSerial, frames: list[Image.Image]):
+    device.display(frames[0])
+    serial.reset()
+    start = time.perf_counter()
+    for frame in frames[1:]:
+        device.display(frame)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / (len(frames) - 1)
+    print(
+        f"{name:<32} | {elapsed_ms:>8.2f} ms/frame | "
+        f"{serial.data_bytes / (len(frames) - 1):>8.0f} B/frame | "
+        f"{serial.commands / (len(frames) - 1):>5.1f} cmd/frame"
+    )
+
+
+def main():
+    print(f"{'device / scenario':<32} | {'time':>16} | {'spi data':>14} | {'commands':>15}")
+    print("-" * 90)
+    grayscale = scenarios("L")
+    for scenario, frames in scenarios("RGB").items():
+        serial = CaptureSerial()
+        device = ssd1322(serial, framebuffer=diff_to_previous(num_segments=4))
+        run(f"ssd1322 diff_to_previous {scenario}", device, serial, frames)
+
+        serial = CaptureSerial()
+        run(f"NumpySSD1322 RGB {scenario}", NumpySSD1322(serial), serial, frames)
+
+        serial = CaptureSerial()
+        device = NumpySSD1322(serial, mode="L")
+        run(f"NumpySSD1322 L {scenario}", device, serial, grayscale[scenario])
+
+
+if __name__ == "__main__":
+    main()
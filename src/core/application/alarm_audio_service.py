@@ -1,6 +1,6 @@
 import datetime
 import logging
-import os
+import time
 from core.application.basic_audio_service import BasicAudioService
 from core.application.system_service import safe_action
 from core.domain.events import (
@@ -22,11 +22,12 @@ from core.domain.model import (
     Config,
 )
 from core.interface.display.display_content import DisplayContent
+from core.infrastructure.alarm_journal import NO_VOLUME, AlarmJournal, AlarmState
 from core.infrastructure.brightness_sensor import IBrightnessSensor
 from core.infrastructure.event_bus import EventBus
+from core.infrastructure.handler_watchdog import HandlerLane, handler_lane
 from core.infrastructure.scheduler import SchedulerService, SchedulerStores
-from resources.resources import active_alarm_definition_file
-from utils.extensions import get_job_arg
+from utils.geolocation import GeoLocation
 from utils.os_interactions import OSInteraction
 
 logger = logging.getLogger("tac.core.application.alarm_audio_service")
@@ -42,6 +43,7 @@ class AlarmAudioService(BasicAudioService):
         event_bus: EventBus,
         scheduler_service: SchedulerService,
         os_interaction: OSInteraction,
+        alarm_journal: AlarmJournal,
     ) -> None:
         super().__init__(
             alarm_clock_context,
@@ -55,34 +57,65 @@ class AlarmAudioService(BasicAudioService):
         self.event_bus.on(AlarmTriggeredEvent)(self._alarm_triggered)
         self.event_bus.on(AlarmStoppedEvent)(self._alarm_stopped_event)
         self.event_bus.on(StartupFinishedEvent)(self._handle_startup_finished)
+        self._pre_alarm_trigger_in_mins: int = None
+        self.alarm_journal = alarm_journal
 
     def consider_failed_alarm(self):
-        if os.path.exists(active_alarm_definition_file):
-            ad: AlarmDefinition = AlarmDefinition.deserialize(
-                active_alarm_definition_file
-            )
-            ad.id = -1
-            logger.info("failed audioeffect found %s", ad.alarm_name)
-            self._ring_alarm(ad)
+        state = self.alarm_journal.last()
+        if state is None or not state.is_ringing:
+            return
+        # the journal survives reboots, an alarm cut off by a power loss is
+        # only resumed while it would still be ringing
+        age = time.time() - state.timestamp
+        if age >= self.alarm_clock_context.config.alarm_duration_in_mins * 60:
+            logger.info("failed alarm from %ds ago is over, not resumed", age)
+            self.alarm_journal.stopped()
+            return
+        ad = self._recover_alarm(state)
+        logger.info("failed audioeffect found %s", ad.alarm_name)
+        self._ring_alarm(ad)
+
+    def _recover_alarm(self, state: AlarmState) -> AlarmDefinition:
+        # one-time alarms are gone from the config once they rang
+        config = self.alarm_clock_context.config
+        known = config.get_alarm_definition_by_id(state.alarm_id)
+        # the alarm rang at hour:min of the configured location, not of the host
+        triggered_at = datetime.datetime.fromtimestamp(
+            state.timestamp, GeoLocation().now().tzinfo
+        )
+        ad = AlarmDefinition()
+        ad.id = -1
+        ad.alarm_name = known.alarm_name if known else "Recovered alarm"
+        ad.hour, ad.min = triggered_at.hour, triggered_at.minute
+        ad.recurring = None
+        ad.onetime = None
+        ad.is_active = True
+        ad.visual_effect = None
+        ad.audio_effect = StreamAudioEffect(
+            audio_stream=config.get_audio_stream_by_id(state.stream_id)
+            or config.get_offline_stream(),
+            volume=(
+                config.default_volume
+                if state.volume == NO_VOLUME
+                else round(state.volume, 3)
+            ),
+        )
+        return ad
 
     def _handle_startup_finished(self, _: StartupFinishedEvent):
         self.consider_failed_alarm()
 
     def _config_changed(self, event: ConfigChangedEvent):
         config: Config = event.config
-        self.scheduler_service.remove_all_jobs(jobstore=SchedulerStores.alarm.value)
-        alDef: AlarmDefinition
-        for alDef in config.alarm_definitions:
-            if not alDef.is_active:
-                continue
-            logger.info("adding job for '%s'", alDef.alarm_name)
-            self.scheduler_service.add_cron_job(
-                func=self._ring_alarm,
-                args=(alDef,),
-                job_id=f"{alDef.id}",
-                jobstore=SchedulerStores.alarm.value,
-                **alDef.get_cron_args(),
-            )
+        alarms_changed = self.scheduler_service.sync_alarm_jobs(
+            config.alarm_definitions, self._ring_alarm
+        )
+        if (
+            not alarms_changed
+            and self._pre_alarm_trigger_in_mins == config.pre_alarm_trigger_in_mins
+        ):
+            return
+        self._pre_alarm_trigger_in_mins = config.pre_alarm_trigger_in_mins
         self.scheduler_service.cleanup_alarms(config)
         self.update_next_alarm()
 
@@ -107,18 +140,24 @@ class AlarmAudioService(BasicAudioService):
         )
 
     def _update_alarm_sort_orders(self):
-        next_run_times = {}
-        for job in self.scheduler_service.get_jobs(
-            jobstore=SchedulerStores.alarm.value
-        ):
-            job_alarm_def: AlarmDefinition = get_job_arg(job, AlarmDefinition)
-            if job_alarm_def is None or job.next_run_time is None:
-                continue
-            next_run_times[job_alarm_def.id] = job.next_run_time.timestamp()
-        self.alarm_clock_context.config.alarm_definitions.sort(
-            key=lambda a: (not a.is_active, next_run_times.get(a.id, float("inf")))
-        )
+        # alarm job ids are the alarm definition ids
+        next_alarms = self.scheduler_service.next_alarms.next_run_times()
+        next_run_times = {
+            job_id: next_run_time.timestamp()
+            for job_id, next_run_time in next_alarms.items()
+        }
+        config = self.alarm_clock_context.config
+        with config.transaction(notify=False):
+            config.alarm_definitions = sorted(
+                config.alarm_definitions,
+                key=lambda a: (
+                    not a.is_active,
+                    next_run_times.get(f"{a.id}", float("inf")),
+                ),
+            )
 
+    # slow when pinging, but a stop must never overtake the start
+    @handler_lane(HandlerLane.INLINE)
     def _alarm_triggered(self, event: AlarmTriggeredEvent = None):
         self._preprocess_ring_alarm(event.alarm_definition)
         audio_effect = self._get_appropriate_alarm_effect()
@@ -131,10 +170,9 @@ class AlarmAudioService(BasicAudioService):
         )
 
         if event.alarm_definition.is_onetime() and event.alarm_definition.id >= 0:
-            self.alarm_clock_context.config.remove_alarm_definition(
-                event.alarm_definition.id
-            )
-            self.event_bus.emit(ConfigChangedEvent(self.alarm_clock_context.config))
+            config = self.alarm_clock_context.config
+            with config.transaction():
+                config.remove_alarm_definition(event.alarm_definition.id)
         else:
             self.update_next_alarm()
 
@@ -163,7 +201,7 @@ class AlarmAudioService(BasicAudioService):
 
     def _trigger_pre_alarm(self, alarm_definition: AlarmDefinition):
         def do():
-            self.event_bus.emit(PreAlarmTriggeredEvent(alarm_definition))
+            self.event_bus.emit_async(PreAlarmTriggeredEvent(alarm_definition))
 
         safe_action(
             do, "trigger pre-alarm '%s'" % alarm_definition.alarm_name, logger=logger
@@ -172,7 +210,7 @@ class AlarmAudioService(BasicAudioService):
     def _ring_alarm(self, alarm_definition: AlarmDefinition):
         def do():
 
-            self.event_bus.emit(AlarmTriggeredEvent(alarm_definition))
+            self.event_bus.emit_async(AlarmTriggeredEvent(alarm_definition))
 
         safe_action(do, "ring alarm '%s'" % alarm_definition.alarm_name, logger=logger)
 
@@ -186,6 +224,7 @@ class AlarmAudioService(BasicAudioService):
             func=self._set_to_idle_mode,
         )
 
+    @handler_lane(HandlerLane.INLINE)
     def _alarm_stopped_event(self, _: AlarmStoppedEvent):
         self.scheduler_service.stop_generic_trigger(SchedulerJobIds.stop_alarm.value)
         self.alarm_clock_context.active_alarm_definition = None
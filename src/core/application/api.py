@@ -13,7 +13,6 @@ from PIL.Image import Image
 from core.application.alarm_audio_service import AlarmAudioService
 from core.domain.events import (
     PlaybackChangedEvent,
-    ConfigChangedEvent,
     ShutdownSystemRequest,
     SpotifyApiEvent,
     TerminateAppRequest,
@@ -24,6 +23,7 @@ from core.infrastructure.event_bus import EventBus
 from core.interface.display.display import Display
 from core.interface.display.format import ColorType
 from resources.resources import webroot_file, ssl_dir, icons_dir
+from utils.metrics import MetricsRegistry
 
 from core.domain.model import (
     AlarmDefinition,
@@ -88,7 +88,7 @@ class LibreSpotifyEventHandler(tornado.web.RequestHandler):
 
             spotify_event = SpotifyApiEvent(spotify_event_dict)
             logger.info("received librespotify event %s", spotify_event)
-            self.event_bus.emit(spotify_event)
+            self.event_bus.emit_async(spotify_event)
         except Exception:
             logger.warning("%s", traceback.format_exc())
 
@@ -120,7 +120,9 @@ class ConfigHandler(tornado.web.RequestHandler):
     def get(self, *args, **kwargs):
         try:
             self.render(
-                os.path.basename(webroot_file), config=self.config, api=self.api
+                os.path.basename(webroot_file),
+                config=self.config.snapshot(),
+                api=self.api,
             )
         except:
             logger.warning("%s", traceback.format_exc())
@@ -180,9 +182,9 @@ class SystemApiHandler(tornado.web.RequestHandler):
             if type == "wifi":
                 status = self.get_argument("status", None)
                 if status == "connected":
-                    self.event_bus.emit(WifiStatusChangedEvent(is_online=True))
+                    self.event_bus.emit_async(WifiStatusChangedEvent(is_online=True))
                 elif status == "disconnected":
-                    self.event_bus.emit(WifiStatusChangedEvent(is_online=False))
+                    self.event_bus.emit_async(WifiStatusChangedEvent(is_online=False))
                 else:
                     logger.warning("Unknown wifi status: %s", status)
             else:
@@ -201,14 +203,14 @@ class ConfigApiHandler(tornado.web.RequestHandler):
     def get(self):
         try:
             self.set_header("Content-Type", "application/json")
-            self.write(self.config.serialize())
+            self.write(self.config.snapshot().serialized)
         except:
             logger.warning("%s", traceback.format_exc())
 
     def delete(self, *args):
         try:
-            self.parse_delete_payload(args)
-            self.event_bus.emit(ConfigChangedEvent(self.config))
+            with self.config.transaction():
+                self.parse_delete_payload(args)
         except:
             logger.warning("%s", traceback.format_exc())
 
@@ -221,8 +223,8 @@ class ConfigApiHandler(tornado.web.RequestHandler):
 
     def post(self, *args):
         try:
-            self.parse_post_payload(args)
-            self.event_bus.emit(ConfigChangedEvent(self.config))
+            with self.config.transaction():
+                self.parse_post_payload(args)
         except:
             logger.warning("%s", traceback.format_exc())
 
@@ -305,6 +307,26 @@ class ConfigApiHandler(tornado.web.RequestHandler):
         return ala
 
 
+class MetricsHandler(tornado.web.RequestHandler):
+
+    def get(self):
+        self.set_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.write(MetricsRegistry().exposition())
+
+
+class InstrumentedApplication(tornado.web.Application):
+    """Records the duration of every request before logging it."""
+
+    def log_request(self, handler: tornado.web.RequestHandler) -> None:
+        MetricsRegistry().histogram(
+            "tac_http_request_seconds",
+            "Duration of HTTP requests",
+            handler=type(handler).__name__,
+            method=handler.request.method,
+        ).observe(handler.request.request_time())
+        super().log_request(handler)
+
+
 class Api:
 
     app: tornado.web.Application
@@ -346,6 +368,7 @@ class Api:
                 SystemApiHandler,
                 {"event_bus": self.event_bus},
             ),
+            (r"/api/metrics", MetricsHandler),
             (
                 r"/api/librespotify",
                 LibreSpotifyEventHandler,
@@ -366,7 +389,7 @@ class Api:
             ),
         ]
 
-        self.app = tornado.web.Application(handlers, template_path=template_path)
+        self.app = InstrumentedApplication(handlers, template_path=template_path)
 
     def get_git_log(self) -> str:
 
@@ -389,6 +412,7 @@ class Api:
                         color_type=ColorType.IN16
                     ),
                     refresh_duration_in_ms=self.alarm_audio_service.display_content.refresh_duration_in_ms,
+                    frame_cache=self.display.frame_cache.stats(),
                 ),
                 is_online=self.alarm_audio_service.alarm_clock_context.environment.is_online,
                 is_daytime=self.alarm_audio_service.alarm_clock_context.environment.is_daytime,
@@ -12,14 +12,22 @@ from core.infrastructure.i2c_devices import I2CManager, MCPManager
 from core.infrastructure.mcp23017.buttons import ButtonsManager
 from core.infrastructure.mcp23017.rotary_encoder import RotaryEncoderManager
 from core.infrastructure.scheduler import SchedulerService
+from core.infrastructure.tick_service import TickService
 from core.interface.display.display import Display
+from core.interface.display.render_worker import RenderWorker
 from core.application.api import Api
 from core.infrastructure.audio import Speaker
 from core.application.alarm_audio_service import AlarmAudioService
 from core.application.system_service import SystemService
+from core.application.frame_scheduler import FrameScheduler
+from core.infrastructure.oled import NumpySSD1322
 from core.infrastructure.persistence import Persistence
-from core.infrastructure.event_bus import EventBus
-from resources.resources import config_file
+from core.infrastructure.alarm_journal import AlarmJournal
+from core.infrastructure.async_event_bus import AsyncEventBus
+from core.infrastructure.event_dispatcher import EventDispatcher
+from core.infrastructure.event_journal import EventJournal
+from core.infrastructure.handler_watchdog import HandlerWatchdog
+from resources.resources import alarm_journal_file, config_file
 from core.domain.model import (
     AlarmClockContext,
     Config,
@@ -28,9 +36,7 @@ from core.domain.model import (
 from core.interface.display.display_content import DisplayContent
 from utils.os_interactions import OSInteraction
 from utils.sound_device import TACSoundDevice
-from luma.oled.device import ssd1322
 from luma.core.interface.serial import spi
-from luma.core.framebuffer import diff_to_previous
 
 
 class DIContainer(containers.DeclarativeContainer):
@@ -39,6 +45,30 @@ class DIContainer(containers.DeclarativeContainer):
     def create_argument_parser():
         parser = argparse.ArgumentParser(prog="ClockApp")
         parser.add_argument("-s", "--software", action="store_true")
+        parser.add_argument(
+            "-g",
+            "--native-grayscale",
+            action="store_true",
+            help="render 8-bit grayscale frames straight to the SSD1322",
+        )
+        parser.add_argument(
+            "-r",
+            "--render-worker",
+            action="store_true",
+            help="paint the default screens in a separate process",
+        )
+        parser.add_argument(
+            "-l",
+            "--loop-events",
+            action="store_true",
+            help="deliver asynchronous events on the tornado loop instead of dispatcher threads",
+        )
+        parser.add_argument(
+            "-j",
+            "--journal",
+            metavar="PATH",
+            help="record every emitted event to a rotating binary journal at PATH",
+        )
         return parser
 
     argument_parser = providers.Singleton(create_argument_parser)
@@ -51,15 +81,38 @@ class DIContainer(containers.DeclarativeContainer):
         ThreadPoolExecutor, max_workers=20, thread_name_prefix="GlobalExecutor"
     )
 
-    event_bus = providers.Singleton(EventBus, executor=executor)
+    event_dispatcher = providers.Singleton(
+        lambda args: None if args.loop_events else EventDispatcher(),
+        args=argument_args,
+    )
+
+    event_journal = providers.Singleton(
+        lambda args: EventJournal(args.journal) if args.journal else None,
+        args=argument_args,
+    )
+
+    handler_watchdog = providers.Singleton(HandlerWatchdog, budget_ms=100)
+
+    event_bus = providers.Singleton(
+        AsyncEventBus,
+        executor=executor,
+        dispatcher=event_dispatcher,
+        recorder=event_journal,
+        watchdog=handler_watchdog,
+    )
+
+    # overridden to keep a journal replay away from the live files
+    config_path = providers.Object(config_file)
+    alarm_journal_path = providers.Object(alarm_journal_file)
 
     config = providers.Singleton(
-        lambda event_bus: (
-            Config.deserialize(config_file, event_bus)
-            if os.path.exists(config_file)
+        lambda event_bus, path: (
+            Config.deserialize(path, event_bus)
+            if os.path.exists(path)
             else Config(event_bus=event_bus)
         ),
         event_bus=event_bus,
+        path=config_path,
     )
 
     os_interaction = providers.Singleton(
@@ -101,11 +154,14 @@ class DIContainer(containers.DeclarativeContainer):
         event_bus=event_bus,
     )
 
+    alarm_journal = providers.Singleton(AlarmJournal, path=alarm_journal_path)
+
     persistence = providers.Singleton(
         Persistence,
-        config_file=config_file,
+        config_file=config_path,
         event_bus=event_bus,
         executor=executor,
+        alarm_journal=alarm_journal,
     )
 
     vlc_instance = providers.Singleton(
@@ -159,7 +215,6 @@ class DIContainer(containers.DeclarativeContainer):
         scheduler_service=scheduler_service,
         event_bus=event_bus,
         display_content=display_content,
-        brightness_sensor=brightness_sensor,
         os_interaction=os_interaction,
     )
 
@@ -172,12 +227,21 @@ class DIContainer(containers.DeclarativeContainer):
         event_bus=event_bus,
         scheduler_service=scheduler_service,
         os_interaction=os_interaction,
+        alarm_journal=alarm_journal,
     )
 
     serial_interface = providers.Singleton(spi, device=0, port=0, bus_speed_hz=16000000)
-    framebuffer = providers.Singleton(diff_to_previous, num_segments=4)
-    device = providers.Singleton(
-        ssd1322, serial_interface=serial_interface, framebuffer=framebuffer
+    device = providers.Selector(
+        providers.Callable(
+            lambda args: "grayscale" if args.native_grayscale else "rgb",
+            args=argument_args,
+        ),
+        rgb=providers.Singleton(
+            NumpySSD1322, serial_interface=serial_interface, mode="RGB"
+        ),
+        grayscale=providers.Singleton(
+            NumpySSD1322, serial_interface=serial_interface, mode="L"
+        ),
     )
 
     display_formatter = providers.Singleton(
@@ -186,6 +250,25 @@ class DIContainer(containers.DeclarativeContainer):
         alarm_clock_context=alarm_clock_context,
     )
 
+    frame_scheduler = providers.Singleton(
+        FrameScheduler,
+        alarm_clock_context=alarm_clock_context,
+        event_bus=event_bus,
+        display_content=display_content,
+        brightness_sensor=brightness_sensor,
+        tick_service=providers.Singleton(TickService, name="frame"),
+    )
+
+    render_worker = providers.Singleton(
+        lambda args, device: (
+            RenderWorker(device.width, device.height, device.mode)
+            if args.render_worker
+            else None
+        ),
+        args=argument_args,
+        device=device,
+    )
+
     display = providers.Singleton(
         Display,
         device=device,
@@ -194,6 +277,7 @@ class DIContainer(containers.DeclarativeContainer):
         display_formatter=display_formatter,
         event_bus=event_bus,
         alarm_clock_context=alarm_clock_context,
+        render_worker=render_worker,
     )
 
     api = providers.Singleton(
@@ -0,0 +1,151 @@
+import datetime
+import logging
+import threading
+import time
+
+from core.application.system_service import safe_action
+from core.domain.events import ForcedDisplayUpdateEvent, StartupFinishedEvent
+from core.domain.mode_coordinator import ModeName
+from core.domain.model import AlarmClockContext, RoomBrightness
+from core.infrastructure.brightness_sensor import IBrightnessSensor
+from core.infrastructure.event_bus import EventBus
+from core.infrastructure.tick_service import TickService
+from core.interface.display.display_content import DisplayContent
+from utils.geolocation import GeoLocation
+
+logger = logging.getLogger("tac.core.application.frame_scheduler")
+
+
+class FrameScheduler:
+    """
+    Schedules display refreshes from what is on screen instead of polling:
+    blink edges on second boundaries, minute rollovers, visual effect and
+    alarm preview changes, and a high frame rate only while text moves; a
+    marquee pausing between cycles wakes it when it moves again.
+    In between, only the room brightness is sampled. Nothing is scheduled
+    outside the default mode; the next forced display update wakes it again.
+
+    Ticks come from a TickService, which calls back only once now() is past
+    the deadline, so boundaries need no safety offset.
+    """
+
+    min_scroll_frame_interval = datetime.timedelta(milliseconds=50)
+    room_brightness_poll_interval = datetime.timedelta(seconds=2)
+
+    def __init__(
+        self,
+        alarm_clock_context: AlarmClockContext,
+        event_bus: EventBus,
+        display_content: DisplayContent,
+        brightness_sensor: IBrightnessSensor,
+        tick_service: TickService,
+    ):
+        self.alarm_clock_context = alarm_clock_context
+        self.event_bus = event_bus
+        self.display_content = display_content
+        self.brightness_sensor = brightness_sensor
+        self.tick_service = tick_service
+
+        self._lock = threading.Lock()
+        self._render_due: datetime.datetime = None
+        self._own_update: ForcedDisplayUpdateEvent = None
+
+        self.event_bus.on(StartupFinishedEvent)(self._startup_finished)
+
+    def _startup_finished(self, _: StartupFinishedEvent):
+        self.event_bus.on(ForcedDisplayUpdateEvent)(self._forced_display_update)
+        self.tick_service.start(self._tick)
+        now = GeoLocation().now()
+        self._schedule(now, render_due=now)
+
+    def _forced_display_update(self, event: ForcedDisplayUpdateEvent):
+        if event is self._own_update:
+            return
+        # something else changed the screen, e.g. a mode switch or playback
+        # start; it is rendered already, but the next deadline may be earlier
+        self._schedule(GeoLocation().now(), render_due=None)
+
+    def _schedule(self, run_date: datetime.datetime, render_due: datetime.datetime):
+        with self._lock:
+            self._render_due = render_due
+            self.tick_service.wake_at(run_date)
+
+    def _stop(self):
+        with self._lock:
+            self._render_due = None
+            self.tick_service.cancel()
+
+    def _is_default_mode(self) -> bool:
+        mode_coordinator = self.alarm_clock_context.mode_coordinator
+        return (
+            mode_coordinator is None
+            or mode_coordinator.current_mode_name == ModeName.DEFAULT
+        )
+
+    def _tick(self, _: datetime.datetime):
+        def do():
+            tac_time = GeoLocation().now()
+            if not self._is_default_mode():
+                self._stop()
+                return
+
+            changed = self.display_content.update_presentation_state(
+                show_blink_segment=tac_time.second % 2 == 0,
+                room_brightness=RoomBrightness(
+                    self.brightness_sensor.get_room_brightness()
+                ),
+            )
+            render_due = self._render_due
+            if changed or (render_due is not None and tac_time >= render_due):
+                self._own_update = ForcedDisplayUpdateEvent(suppress_logging=True)
+                self.event_bus.emit(self._own_update)
+                self.display_content.refresh_duration_in_ms = int(
+                    (GeoLocation().now() - tac_time).total_seconds() * 1000
+                )
+
+            self._schedule_next(GeoLocation().now())
+
+        safe_action(do, debug_msg="regular display update", logger=logger)
+
+    def next_render(self, now: datetime.datetime) -> datetime.datetime:
+        """Earliest point in time after now at which the screen content changes."""
+        if self.display_content.scroll_due():
+            frame_interval = max(
+                self.min_scroll_frame_interval,
+                datetime.timedelta(
+                    milliseconds=2 * (self.display_content.refresh_duration_in_ms or 0)
+                ),
+            )
+            return now + frame_interval
+
+        next_minute = now.replace(second=0, microsecond=0) + datetime.timedelta(
+            minutes=1
+        )
+        # the separator blinks on the normal and the dimmed screen alike
+        next_blink = now.replace(microsecond=0) + datetime.timedelta(seconds=1)
+        deadlines = [next_minute, next_blink]
+
+        scroll_resumes_at = self.display_content.scroll_resumes_at
+        if scroll_resumes_at is not None:
+            deadlines.append(
+                now + datetime.timedelta(seconds=scroll_resumes_at - time.monotonic())
+            )
+
+        next_alarm_info = self.display_content.next_alarm_info
+        if self.display_content.has_next_alarm():
+            preview_start = next_alarm_info.next_run_time - datetime.timedelta(
+                hours=self.alarm_clock_context.config.alarm_preview_hours
+            )
+            if preview_start > now:
+                deadlines.append(preview_start)
+            if next_alarm_info.visual_effect is not None:
+                style_change = next_alarm_info.visual_effect.next_style_change(now)
+                if style_change is not None:
+                    deadlines.append(style_change)
+
+        return min(deadlines)
+
+    def _schedule_next(self, now: datetime.datetime):
+        render_at = self.next_render(now)
+        poll_at = now + self.room_brightness_poll_interval
+        self._schedule(min(render_at, poll_at), render_due=render_at)
@@ -3,7 +3,6 @@ import logging
 import threading
 import traceback
 from core.domain.events import (
-    ForcedDisplayUpdateEvent,
     PlaybackChangedEvent,
     PreAlarmTriggeredEvent,
     ShutdownSystemRequest,
@@ -20,11 +19,10 @@ from core.domain.events import (
 from core.domain.model import (
     AlarmClockContext,
     Mode,
-    RoomBrightness,
     SchedulerJobIds,
 )
-from core.infrastructure.brightness_sensor import IBrightnessSensor
 from core.infrastructure.event_bus import EventBus
+from core.infrastructure.handler_watchdog import HandlerLane, handler_lane
 from core.infrastructure.scheduler import SchedulerService, SchedulerStores
 from core.interface.display.display_content import DisplayContent
 from utils.geolocation import GeoLocation, SunEvent
@@ -52,7 +50,6 @@ def safe_action(
 
 
 class SystemService:
-    _previous_tac_time = GeoLocation().now()
 
     def __init__(
         self,
@@ -60,14 +57,12 @@ class SystemService:
         scheduler_service: SchedulerService,
         event_bus: EventBus,
         display_content: DisplayContent,
-        brightness_sensor: IBrightnessSensor,
         os_interaction: OSInteraction,
     ):
         self.alarm_clock_context = alarm_clock_context
         self.scheduler_service = scheduler_service
         self.event_bus = event_bus
         self.display_content = display_content
-        self.brightness_sensor = brightness_sensor
         self.os_interaction = os_interaction
 
         self.event_bus.on(WifiStatusChangedEvent)(self.handle_wifi_status_changed)
@@ -75,7 +70,6 @@ class SystemService:
         self.event_bus.on(AlarmStoppedEvent)(self.handle_alarm_stopped)
         self.event_bus.on(SpotifyStoppedEvent)(self.handle_spotify_stopped)
         self.event_bus.on(VolumeChangedEvent)(self._volume_changed)
-        self.event_bus.on(ForcedDisplayUpdateEvent)(self.handle_forced_display_update)
         self.event_bus.on(TerminateAppRequest)(self.handle_terminate_request)
         self.event_bus.on(ShutdownSystemRequest)(self.handle_shutdown_system_request)
         self.event_bus.on(PreAlarmTriggeredEvent)(self.handle_pre_alarm_triggered)
@@ -86,15 +80,6 @@ class SystemService:
         self.scheduler_service.log_active_jobs(SchedulerStores.default.value)
 
     def _add_scheduler_jobs(self):
-        self.scheduler_service.add_job(
-            self._emit_regular_display_update,
-            trigger="interval",
-            start_date=datetime.date.today(),
-            seconds=self.alarm_clock_context.config.refresh_timeout_in_secs,
-            job_id=SchedulerJobIds.regular_display_refresh.value,
-            jobstore=SchedulerStores.default.value,
-        )
-
         self.scheduler_service.add_job(
             self._update_wifi_status,
             trigger="interval",
@@ -127,6 +112,8 @@ class SystemService:
     def handle_alarm_triggered(self, _: AlarmTriggeredEvent):
         pass
 
+    # restarting the daemon takes seconds
+    @handler_lane(HandlerLane.BACKGROUND)
     def handle_spotify_stopped(self, _: SpotifyStoppedEvent):
         self.os_interaction.restart_spotify_daemon()
 
@@ -148,10 +135,6 @@ class SystemService:
         if event.is_online:
             self._update_weather_status()
 
-    def handle_forced_display_update(self, _: ForcedDisplayUpdateEvent):
-        self._previous_tac_time = GeoLocation().now()
-        pass
-
     def handle_startup_finished(self, _: StartupFinishedEvent):
         self._update_wifi_status()
 
@@ -193,7 +176,7 @@ class SystemService:
 
             logger.info("weather updating: %s", new_weather)
             self.alarm_clock_context.environment.current_weather = new_weather
-            self.event_bus.emit(WeatherUpdatedEvent(weather=new_weather))
+            self.event_bus.emit_async(WeatherUpdatedEvent(weather=new_weather))
 
         safe_action(do, "updating weather status", logger=logger)
 
@@ -205,41 +188,14 @@ class SystemService:
                 return
 
             logger.info("change wifi state, is online: %s", is_online)
-            self.event_bus.emit(WifiStatusChangedEvent(is_online))
+            self.event_bus.emit_async(WifiStatusChangedEvent(is_online))
 
         safe_action(do, "updating wifi status", logger=logger)
 
     def _sun_event_occured(self, event: SunEvent):
         def do():
-            self.event_bus.emit(SunEventOccurredEvent(event))
+            self.event_bus.emit_async(SunEventOccurredEvent(event))
             self.alarm_clock_context.environment.is_daytime = event == SunEvent.sunrise
             self.init_sun_event_scheduler(event)
 
         safe_action(do, "sun event %s" % event, logger=logger)
-
-    def _emit_regular_display_update(self):
-        def do():
-            tac_time = GeoLocation().now()
-            new_blink_state = self.display_content.show_blink_segment
-
-            if self._previous_tac_time.second != tac_time.second:
-                new_blink_state = not self.display_content.show_blink_segment
-                self._previous_tac_time = tac_time
-
-            if self.display_content.update_presentation_state(
-                show_blink_segment=new_blink_state,
-                room_brightness=RoomBrightness(self.get_room_brightness()),
-            ):
-                self.event_bus.emit(
-                    ForcedDisplayUpdateEvent(
-                        suppress_logging=True,
-                    )
-                )
-                self.display_content.refresh_duration_in_ms = int(
-                    (GeoLocation().now() - tac_time).total_seconds() * 1000
-                )
-
-        safe_action(do, debug_msg="regular display update", logger=logger)
-
-    def get_room_brightness(self):
-        return self.brightness_sensor.get_room_brightness()
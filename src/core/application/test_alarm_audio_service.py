@@ -0,0 +1,59 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from core.application.alarm_audio_service import AlarmAudioService
+from core.domain.model import AlarmClockContext, Config
+from core.infrastructure.alarm_journal import (
+    RECORD,
+    STOPPED,
+    TRIGGERED,
+    AlarmJournal,
+)
+
+
+class TestConsiderFailedAlarm(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "alarm_journal.bin")
+        self.config = Config()
+        self.journal: AlarmJournal = None
+
+    def tearDown(self):
+        if self.journal is not None:
+            self.journal.close()
+        self.directory.cleanup()
+
+    def service_after(self, kind: int, age_in_secs: float) -> AlarmAudioService:
+        with open(self.path, "wb") as f:
+            timestamp = int(time.time() - age_in_secs)
+            f.write(RECORD.pack(kind, 1, -1, 0.5, timestamp))
+        self.journal = AlarmJournal(self.path)
+        service = AlarmAudioService(
+            AlarmClockContext(self.config),
+            *[MagicMock() for _ in range(6)],
+            alarm_journal=self.journal,
+        )
+        service._ring_alarm = MagicMock()
+        service.consider_failed_alarm()
+        return service
+
+    def test_ringing_tail_is_resumed(self):
+        service = self.service_after(TRIGGERED, age_in_secs=60)
+        service._ring_alarm.assert_called_once()
+        self.assertEqual(service._ring_alarm.call_args.args[0].audio_effect.volume, 0.5)
+
+    def test_stale_tail_is_stopped(self):
+        age = (self.config.alarm_duration_in_mins + 1) * 60
+        service = self.service_after(TRIGGERED, age_in_secs=age)
+        service._ring_alarm.assert_not_called()
+        self.journal.close()
+        self.assertFalse(self.journal.last().is_ringing)
+        self.journal = None
+
+    def test_stop_tail_is_ignored(self):
+        service = self.service_after(STOPPED, age_in_secs=60)
+        service._ring_alarm.assert_not_called()
+        self.assertEqual(self.journal.last().kind, STOPPED)
@@ -0,0 +1,223 @@
+"""
+Versioned JSON codec of the persisted model: Config, AlarmDefinition,
+AudioStream/OfflineStream, StreamAudioEffect and VisualEffect.
+
+Fields are listed explicitly, so that encoding and decoding is plain dict
+work instead of jsonpickle's reflection. Files written by jsonpickle are
+recognized by their py/object tags and still decoded with jsonpickle.
+"""
+
+import json
+import logging
+import os
+from datetime import date
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Tuple
+
+from core.domain.model import (
+    AlarmDefinition,
+    AudioStream,
+    Config,
+    ConfigSnapshot,
+    OfflineStream,
+    StreamAudioEffect,
+    VisualEffect,
+)
+
+logger = logging.getLogger("tac.core.domain.config_codec")
+
+VERSION = 2
+
+Fields = Tuple[Tuple[str, Callable[[Any], Any]], ...]
+
+CONFIG_FIELDS: Fields = (
+    ("clock_format_string", str),
+    ("blink_segment", str),
+    ("local_alarm_file", str),
+    ("alarm_duration_in_mins", int),
+    ("powernap_duration_in_mins", int),
+    ("default_volume", float),
+    ("use_analog_clock", bool),
+    ("alarm_preview_hours", int),
+    ("pre_alarm_trigger_in_mins", int),
+    ("debug_level", int),
+)
+
+ALARM_FIELDS: Fields = (
+    ("id", int),
+    ("alarm_name", str),
+    ("hour", int),
+    ("min", int),
+    ("is_active", bool),
+)
+
+STREAM_FIELDS: Fields = (
+    ("id", int),
+    ("stream_name", str),
+    ("stream_url", str),
+)
+
+
+def _drop_refresh_timeout(data: dict) -> dict:
+    # the display is refreshed on content deadlines instead of polled
+    return {k: v for k, v in data.items() if k != "refresh_timeout_in_secs"}
+
+
+# data of version n is turned into data of version n + 1 by MIGRATIONS[n]
+MIGRATIONS: Dict[int, Callable[[dict], dict]] = {
+    1: _drop_refresh_timeout,
+}
+
+
+def _encode_fields(obj: Any, fields: Fields) -> dict:
+    return {name: getattr(obj, name, None) for name, _ in fields}
+
+
+def _decode_fields(obj: Any, data: dict, fields: Fields):
+    for name, convert in fields:
+        value = data.get(name)
+        if value is not None:
+            setattr(obj, name, convert(value))
+        elif not hasattr(obj, name):
+            setattr(obj, name, None)
+
+
+def encode_stream(stream: AudioStream) -> dict:
+    if stream is None:
+        return None
+    data = _encode_fields(stream, STREAM_FIELDS)
+    data["type"] = "offline" if isinstance(stream, OfflineStream) else "stream"
+    return data
+
+
+def decode_stream(data: dict) -> AudioStream:
+    if data is None:
+        return None
+    if data.get("type") == "offline":
+        stream = OfflineStream(os.path.basename(data["stream_url"]))
+        stream.id = int(data.get("id", -1))
+        return stream
+    stream = AudioStream(stream_name=None, stream_url=None)
+    _decode_fields(stream, data, STREAM_FIELDS)
+    return stream
+
+
+def encode_alarm_definition(alarm: AlarmDefinition) -> dict:
+    data = _encode_fields(alarm, ALARM_FIELDS)
+    data["recurring"] = alarm.recurring
+    data["onetime"] = alarm.onetime.isoformat() if alarm.onetime else None
+    data["visual_effect"] = {} if alarm.visual_effect is not None else None
+    audio_effect = alarm.audio_effect
+    data["audio_effect"] = (
+        {
+            "volume": audio_effect.volume,
+            "audio_stream": encode_stream(audio_effect.audio_stream),
+        }
+        if audio_effect is not None
+        else None
+    )
+    return data
+
+
+def decode_alarm_definition(
+    data: dict, streams: Dict[int, AudioStream] = None
+) -> AlarmDefinition:
+    """streams: the config's streams by id, alarms that play one of them share it."""
+    alarm = AlarmDefinition()
+    _decode_fields(alarm, data, ALARM_FIELDS)
+    recurring = data.get("recurring")
+    alarm.recurring = list(recurring) if recurring is not None else None
+    onetime = data.get("onetime")
+    alarm.onetime = date.fromisoformat(onetime) if onetime else None
+    alarm.visual_effect = (
+        VisualEffect() if data.get("visual_effect") is not None else None
+    )
+    audio_effect = data.get("audio_effect")
+    if audio_effect is None:
+        alarm.audio_effect = None
+    else:
+        stream = decode_stream(audio_effect.get("audio_stream"))
+        if stream is not None and streams:
+            known = streams.get(stream.id)
+            if known is not None and known == stream:
+                stream = known
+        volume = audio_effect.get("volume")
+        alarm.audio_effect = StreamAudioEffect(
+            audio_stream=stream, volume=float(volume) if volume is not None else None
+        )
+    return alarm
+
+
+def encode_config(config: Config | ConfigSnapshot) -> dict:
+    data = {"version": VERSION}
+    data.update(_encode_fields(config, CONFIG_FIELDS))
+    data["audio_streams"] = [encode_stream(s) for s in config.audio_streams]
+    data["alarm_definitions"] = [
+        encode_alarm_definition(a) for a in config.alarm_definitions
+    ]
+    return data
+
+
+def decode_config(data: dict, event_bus=None) -> Config:
+    data = _migrate(data)
+    config = Config(event_bus=event_bus)
+    _decode_fields(config, data, CONFIG_FIELDS)
+    config.audio_streams = [decode_stream(s) for s in data.get("audio_streams", ())]
+    streams = {stream.id: stream for stream in config.audio_streams}
+    config.alarm_definitions = [
+        decode_alarm_definition(a, streams) for a in data.get("alarm_definitions", ())
+    ]
+    return config
+
+
+def snapshot_config(config: Config, version: int) -> ConfigSnapshot:
+    """Copies what the config holds now, through the codec's field tables."""
+    data = encode_config(config)
+    streams = tuple(decode_stream(s) for s in data["audio_streams"])
+    streams_by_id = {stream.id: stream for stream in streams}
+    return ConfigSnapshot(
+        version=version,
+        alarm_definitions=tuple(
+            decode_alarm_definition(a, streams_by_id) for a in data["alarm_definitions"]
+        ),
+        audio_streams=streams,
+        settings=MappingProxyType({name: data[name] for name, _ in CONFIG_FIELDS}),
+    )
+
+
+def _migrate(data: dict) -> dict:
+    version = data.get("version", VERSION)
+    if not isinstance(version, int) or version > VERSION:
+        raise ValueError(f"config version {version!r} is not supported, {VERSION} is")
+    while version < VERSION:
+        migration = MIGRATIONS.get(version)
+        if migration is None:
+            raise ValueError(f"config version {version} cannot be migrated")
+        data = migration(data)
+        version += 1
+    return data
+
+
+def is_jsonpickle(data: Any) -> bool:
+    return isinstance(data, dict) and "py/object" in data
+
+
+def _jsonpickle_decode(text: str) -> Any:
+    # only needed to read files written before this codec
+    import jsonpickle
+
+    return jsonpickle.decode(text)
+
+
+def dumps_config(config: Config | ConfigSnapshot) -> str:
+    return json.dumps(encode_config(config), indent=2)
+
+
+def loads_config(text: str, event_bus=None) -> Tuple[Config, bool]:
+    """The config and whether it was read from the jsonpickle format."""
+    data = json.loads(text)
+    if is_jsonpickle(data):
+        config: Config = _jsonpickle_decode(text)
+        config.event_bus = event_bus
+        return config, True
+    return decode_config(data, event_bus), False
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 import json
 
-from core.infrastructure.event_bus import BaseEvent
+from core.infrastructure.event_bus import BaseEvent, CoalescePolicy, EventPriority
 
 from typing import TYPE_CHECKING
 
@@ -23,37 +23,54 @@ if TYPE_CHECKING:
 class WifiStatusChangedEvent(BaseEvent):
     is_online: bool
 
+    priority = EventPriority.LOW
+    supersedes = True
+
 
 @dataclass(frozen=True)
 class AlarmTriggeredEvent(BaseEvent):
     alarm_definition: AlarmDefinition
     use_offline_media: bool = False
 
+    priority = EventPriority.HIGH
+
 
 @dataclass(frozen=True)
 class PreAlarmTriggeredEvent(BaseEvent):
     alarm_definition: AlarmDefinition
 
+    priority = EventPriority.HIGH
+
 
 @dataclass(frozen=True)
 class AlarmStoppedEvent(BaseEvent):
     alarm_definition: AlarmDefinition = None
 
+    priority = EventPriority.HIGH
+
 
 @dataclass(frozen=True)
 class ConfigChangedEvent(BaseEvent):
     config: Config
 
+    # handlers read the live config, a newer event carries all earlier changes
+    supersedes = True
+
 
 @dataclass(frozen=True)
 class WeatherUpdatedEvent(BaseEvent):
     weather: Weather = None
 
+    priority = EventPriority.LOW
+    supersedes = True
+
 
 @dataclass(frozen=True)
 class SunEventOccurredEvent(BaseEvent):
     event: SunEvent
 
+    priority = EventPriority.LOW
+
 
 class SpotifyStoppedEvent(BaseEvent):
     pass
@@ -134,6 +151,9 @@ class PlaybackChangedEvent(VolumeChangeRequest):
 class VolumeChangedEvent(BaseEvent):
     new_volume: int = None
 
+    # handlers read the current volume, a fast rotary turn only needs the last event
+    coalesce = CoalescePolicy.latest_within(50)
+
 
 @dataclass(frozen=True)
 class ToggleAudioRequest(BaseEvent):
@@ -142,7 +162,9 @@ class ToggleAudioRequest(BaseEvent):
 
 @dataclass(frozen=True)
 class ForcedDisplayUpdateEvent(BaseEvent):
-    pass
+    # a render always shows the latest state, updates requested while one is
+    # in progress collapse into a single follow-up render
+    coalesce = CoalescePolicy.until_ready()
 
 
 @dataclass(frozen=True)
@@ -157,9 +179,11 @@ class StartupFinishedEvent(BaseEvent):
 
 @dataclass(frozen=True)
 class TerminateAppRequest(BaseEvent):
-    pass
+    priority = EventPriority.HIGH
 
 
 @dataclass(frozen=True)
 class ShutdownSystemRequest(BaseEvent):
     reboot: bool = False
+
+    priority = EventPriority.HIGH
@@ -7,9 +7,6 @@ from core.domain.alarm_definition_editor import (
     AlarmProperty,
     EditorAction,
 )
-from core.domain.events import (
-    ConfigChangedEvent,
-)
 from core.domain.model import (
     AlarmClockContext,
 )
@@ -153,8 +150,8 @@ class AlarmClockModeCoordinator:
         if not self._editing_service:
             return
 
-        self._editing_service.commit_changes()
-        self.event_bus.emit(ConfigChangedEvent(self.alarm_clock_context.config))
+        with self.alarm_clock_context.config.transaction():
+            self._editing_service.commit_changes()
         self._current_mode_name = ModeName.ALARM_VIEW
         logger.info("Alarm changes committed")
 
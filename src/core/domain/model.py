@@ -1,17 +1,19 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import time, timedelta, date
 import datetime
+from functools import cached_property
 import math
 import os
+import threading
 from PIL import Image
-from typing import List
+from typing import Any, Iterator, List, Mapping, Tuple
 from enum import Enum
 import logging
 
-import jsonpickle
-from utils.extensions import T, Value, respect_ranges
+from utils.extensions import T, Value, respect_ranges, write_atomically
 
 from utils.geolocation import GeoLocation, SunEvent, Weather
 from resources.resources import alarms_dir, default_volume
@@ -25,6 +27,7 @@ if TYPE_CHECKING:
 
 from core.domain.events import (
     AlarmStoppedEvent,
+    ConfigChangedEvent,
     PlaybackChangedEvent,
     SpotifyStoppedEvent,
     VolumeChangeRequest,
@@ -155,6 +158,8 @@ class EnvironmentContext:
 class VisualEffect:
 
     next_alarm_info: NextAlarmInfo = None
+    # minutes before the alarm at which is_active() and get_style() change
+    style_change_minutes = (8, 4, 2)
 
     def is_active(self) -> bool:
         if not self.next_alarm_info:
@@ -180,6 +185,15 @@ class VisualEffect:
             background_grayscale_16=0, foreground_grayscale_16=15, be_bold=True
         )
 
+    def next_style_change(self, now: datetime.datetime) -> datetime.datetime:
+        if not self.next_alarm_info or self.next_alarm_info.next_run_time is None:
+            return None
+        changes = [
+            self.next_alarm_info.next_run_time - timedelta(minutes=minutes)
+            for minutes in self.style_change_minutes
+        ]
+        return min((change for change in changes if change > now), default=None)
+
 
 @dataclass
 class AudioStream:
@@ -372,28 +386,49 @@ class AlarmDefinition:
             and self.onetime is None
         )
 
-    def serialize(self, alarm_definition_file: str):
-        with open(alarm_definition_file, "w") as file:
-            file.write(jsonpickle.encode(self, indent=2))
 
-    def deserialize(alarm_definition_file: str):
-        logger.debug(
-            "initializing AlarmDefinition from file: %s", alarm_definition_file
-        )
-        with open(alarm_definition_file, "r") as file:
-            file_contents = file.read()
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    The config as of one version. Alarm definitions and streams are copies
+    that nobody mutates, so readers may use a snapshot from any thread
+    without locking. The settings read like attributes of a Config.
+    """
+
+    version: int
+    alarm_definitions: Tuple[AlarmDefinition, ...]
+    audio_streams: Tuple[AudioStream, ...]
+    settings: Mapping[str, Any]
 
-        persisted_alarm_definition: AlarmDefinition = jsonpickle.decode(file_contents)
-        return persisted_alarm_definition
+    def __getattr__(self, name: str):
+        if name == "settings":
+            raise AttributeError(name)
+        try:
+            return self.settings[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def get_alarm_definition_by_id(self, id: int) -> AlarmDefinition:
+        return next((alarm for alarm in self.alarm_definitions if alarm.id == id), None)
+
+    @cached_property
+    def serialized(self) -> str:
+        from core.domain.config_codec import dumps_config
+
+        return dumps_config(self)
 
 
 class Config:
+    """
+    The live config, changed by writers inside transaction(). Each
+    transaction publishes a new ConfigSnapshot with the next version, readers
+    on other threads use snapshot() instead of the live lists.
+    """
 
     clock_format_string: str
     blink_segment: str
     local_alarm_file: str
     alarm_duration_in_mins: int
-    refresh_timeout_in_secs: float
     powernap_duration_in_mins: int
     default_volume: float = default_volume
     use_analog_clock: bool
@@ -405,6 +440,13 @@ class Config:
     alarm_definitions: List[AlarmDefinition]
     audio_streams: List[AudioStream]
 
+    # runtime state, not persisted; there is one live config per process
+    version = 0
+    _snapshot: ConfigSnapshot = None
+    _lock = threading.RLock()
+    _transaction_depth = 0
+    _notify_pending = False
+
     def __init__(self, event_bus: "EventBus" = None):
         logger.debug("initializing default config")
         self.alarm_definitions = []
@@ -413,6 +455,44 @@ class Config:
         self.ensure_valid_config()
         super().__init__()
 
+    @contextmanager
+    def transaction(self, notify: bool = True) -> Iterator["Config"]:
+        """
+        Serializes writers. The outermost transaction publishes the next
+        snapshot and, if any level asked to notify, emits a single
+        ConfigChangedEvent once the lock is released.
+        """
+        with self._lock:
+            self._transaction_depth += 1
+            self._notify_pending = self._notify_pending or notify
+            try:
+                yield self
+            finally:
+                self._transaction_depth -= 1
+                outermost = self._transaction_depth == 0
+                if outermost:
+                    self._publish()
+                    notify, self._notify_pending = self._notify_pending, False
+        if outermost and notify and self.event_bus is not None:
+            self.event_bus.emit(ConfigChangedEvent(self))
+
+    def _publish(self):
+        from core.domain.config_codec import snapshot_config
+
+        self.version += 1
+        self._snapshot = snapshot_config(self, self.version)
+
+    def snapshot(self) -> ConfigSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            from core.domain.config_codec import snapshot_config
+
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = snapshot_config(self, self.version)
+                snapshot = self._snapshot
+        return snapshot
+
     def update_alarm_definition(self, alarm_definition: AlarmDefinition):
         self.remove_alarm_definition(alarm_definition.id)
         self.add_alarm_definition(alarm_definition)
@@ -456,8 +536,8 @@ class Config:
 
     def _append_item_with_id(self, item_with_id, list) -> List[object]:
         self._assure_item_id(item_with_id, list)
-        list.append(item_with_id)
-        return sorted(list, key=lambda x: x.id)
+        # a new list, whoever iterates the current one is not disturbed
+        return sorted([*list, item_with_id], key=lambda x: x.id)
 
     def _assure_item_id(self, item_with_id, list):
         if (
@@ -506,7 +586,6 @@ class Config:
             ),
             dict(key="clock_format_string", value="%-H<blinkSegment>%M"),
             dict(key="blink_segment", value=":"),
-            dict(key="refresh_timeout_in_secs", value=0.25),
             dict(key="powernap_duration_in_mins", value=18),
             dict(key="default_volume", value=default_volume),
             dict(key="use_analog_clock", value=False),
@@ -523,24 +602,25 @@ class Config:
                 setattr(self, conf_prop["key"], conf_prop["value"])
 
     def serialize(self):
-        # Temporarily remove event_bus before serialization to avoid circular references
-        event_bus_backup = self.event_bus
-        self.event_bus = None
-        try:
-            serialized = jsonpickle.encode(self, indent=2)
-        finally:
-            self.event_bus = event_bus_backup
-        return serialized
+        from core.domain.config_codec import dumps_config
+
+        return dumps_config(self)
 
     @staticmethod
     def deserialize(config_file, event_bus: "EventBus" = None):
+        from core.domain.config_codec import loads_config
+
         logger.debug("initializing config from file: %s", config_file)
         with open(config_file, "r") as file:
             file_contents = file.read()
-            persisted_config: Config = jsonpickle.decode(file_contents)
-            persisted_config.event_bus = event_bus
-            persisted_config.ensure_valid_config()
-            return persisted_config
+        persisted_config, legacy = loads_config(file_contents, event_bus)
+        persisted_config.ensure_valid_config()
+        if legacy:
+            # once, keeping the jsonpickle file next to it
+            write_atomically(f"{config_file}.jsonpickle", file_contents.encode("utf-8"))
+            write_atomically(config_file, persisted_config.serialize().encode("utf-8"))
+            logger.info("migrated %s from jsonpickle", config_file)
+        return persisted_config
 
 
 class AlarmClockContext:
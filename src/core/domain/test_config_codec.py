@@ -0,0 +1,177 @@
+import datetime
+import json
+import os
+import tempfile
+import unittest
+
+from core.domain.config_codec import (
+    VERSION,
+    decode_config,
+    dumps_config,
+    encode_config,
+    loads_config,
+)
+from core.domain.model import (
+    AlarmDefinition,
+    AudioStream,
+    Config,
+    OfflineStream,
+    StreamAudioEffect,
+    VisualEffect,
+)
+
+# written by Config.serialize before the codec, i.e. jsonpickle
+LEGACY_CONFIG = """{
+  "py/object": "core.domain.model.Config",
+  "alarm_definitions": [
+    {
+      "py/object": "core.domain.model.AlarmDefinition",
+      "alarm_name": "work",
+      "hour": 6,
+      "min": 45,
+      "recurring": ["MONDAY", "FRIDAY"],
+      "onetime": null,
+      "is_active": true,
+      "visual_effect": {"py/object": "core.domain.model.VisualEffect"},
+      "audio_effect": {
+        "py/object": "core.domain.model.StreamAudioEffect",
+        "volume": 0.3,
+        "audio_stream": {
+          "py/object": "core.domain.model.AudioStream",
+          "stream_name": "fm4",
+          "stream_url": "https://orf-live.ors-shoutcast.at/fm4-q2a",
+          "id": 0
+        }
+      },
+      "id": 0
+    },
+    {
+      "py/object": "core.domain.model.AlarmDefinition",
+      "alarm_name": "once",
+      "hour": 7,
+      "min": 5,
+      "recurring": null,
+      "onetime": {
+        "py/object": "datetime.date",
+        "__reduce__": [{"py/type": "datetime.date"}, ["B+oKEg=="]]
+      },
+      "is_active": false,
+      "visual_effect": null,
+      "audio_effect": {
+        "py/object": "core.domain.model.StreamAudioEffect",
+        "volume": 0.0,
+        "audio_stream": {
+          "py/object": "core.domain.model.OfflineStream",
+          "stream_name": "Offline Audio",
+          "stream_url": "resources/media/sounds/alarms/Enchantment.ogg",
+          "id": -1
+        }
+      },
+      "id": 1
+    }
+  ],
+  "audio_streams": [{"py/id": 6}],
+  "event_bus": null,
+  "alarm_duration_in_mins": 60,
+  "local_alarm_file": "Enchantment.ogg",
+  "clock_format_string": "%-H<blinkSegment>%M",
+  "blink_segment": ":",
+  "refresh_timeout_in_secs": 0.25,
+  "powernap_duration_in_mins": 18,
+  "use_analog_clock": false,
+  "alarm_preview_hours": 12,
+  "debug_level": 0,
+  "default_volume": 0.4
+}"""
+
+
+def alarm(name: str, stream: AudioStream, volume: float) -> AlarmDefinition:
+    alarm_definition = AlarmDefinition()
+    alarm_definition.alarm_name = name
+    alarm_definition.hour = 6
+    alarm_definition.min = 45
+    alarm_definition.recurring = None
+    alarm_definition.onetime = None
+    alarm_definition.is_active = True
+    alarm_definition.visual_effect = None
+    alarm_definition.audio_effect = StreamAudioEffect(
+        audio_stream=stream, volume=volume
+    )
+    return alarm_definition
+
+
+class TestConfigCodec(unittest.TestCase):
+    def test_round_trip(self):
+        config = Config()
+        config.add_audio_stream(
+            AudioStream(stream_name="fm4", stream_url="https://example.org/fm4")
+        )
+        recurring = alarm("work", config.audio_streams[0], 0.3)
+        recurring.recurring = ["MONDAY", "FRIDAY"]
+        recurring.visual_effect = VisualEffect()
+        config.add_alarm_definition(recurring)
+        onetime = alarm("once", config.get_offline_stream(), 0.0)
+        onetime.onetime = datetime.date(2026, 10, 18)
+        onetime.is_active = False
+        config.add_alarm_definition(onetime)
+        config.default_volume = 0.4
+
+        text = dumps_config(config)
+        decoded, legacy = loads_config(text)
+
+        self.assertFalse(legacy)
+        self.assertEqual(json.loads(text)["version"], VERSION)
+        self.assertEqual(encode_config(decoded), encode_config(config))
+        once = decoded.get_alarm_definition_by_id(onetime.id)
+        self.assertEqual(once.onetime, datetime.date(2026, 10, 18))
+        self.assertEqual(once.audio_effect.volume, 0.0)
+        self.assertIsInstance(once.audio_effect.audio_stream, OfflineStream)
+        work = decoded.get_alarm_definition_by_id(recurring.id)
+        # alarms share the stream instance of the config
+        self.assertIs(work.audio_effect.audio_stream, decoded.audio_streams[0])
+
+    def test_legacy_jsonpickle_file_is_migrated(self):
+        with tempfile.TemporaryDirectory() as directory:
+            config_file = os.path.join(directory, "config.json")
+            with open(config_file, "w") as f:
+                f.write(LEGACY_CONFIG)
+
+            config = Config.deserialize(config_file)
+
+            self.assertEqual(
+                [a.alarm_name for a in config.alarm_definitions], ["work", "once"]
+            )
+            self.assertEqual(config.audio_streams[0].stream_name, "fm4")
+            self.assertEqual(
+                config.alarm_definitions[1].onetime, datetime.date(2026, 10, 18)
+            )
+            self.assertEqual(config.default_volume, 0.4)
+            with open(f"{config_file}.jsonpickle") as f:
+                self.assertEqual(f.read(), LEGACY_CONFIG)
+            with open(config_file) as f:
+                migrated = json.load(f)
+            self.assertEqual(migrated["version"], VERSION)
+            self.assertNotIn("refresh_timeout_in_secs", migrated)
+
+            with open(config_file) as f:
+                reread, legacy = loads_config(f.read())
+            self.assertFalse(legacy)
+            offline = reread.alarm_definitions[1].audio_effect.audio_stream
+            # offline streams are relocated to the alarms dir of this install
+            self.assertIsInstance(offline, OfflineStream)
+            self.assertEqual(offline.stream_url, config.get_offline_stream().stream_url)
+
+    def test_older_version_is_migrated(self):
+        data = encode_config(Config())
+        data["version"] = 1
+        data["refresh_timeout_in_secs"] = 0.25
+        config = decode_config(data)
+        self.assertFalse(hasattr(config, "refresh_timeout_in_secs"))
+
+    def test_unknown_versions_are_rejected(self):
+        for version in (VERSION + 1, 0, "2"):
+            data = encode_config(Config())
+            data["version"] = version
+            with self.subTest(version=version):
+                with self.assertRaises(ValueError):
+                    decode_config(data)
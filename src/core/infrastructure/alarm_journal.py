@@ -0,0 +1,147 @@
+import logging
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+
+from core.domain.model import AlarmDefinition
+from utils.metrics import MetricsRegistry
+
+logger = logging.getLogger("tac.core.infrastructure.alarm_journal")
+
+TRIGGERED = ord("T")
+STOPPED = ord("S")
+# volume of an alarm without one, 0 is a valid volume
+NO_VOLUME = -1.0
+# kind, alarm id, stream id, volume, wall clock seconds
+RECORD = struct.Struct("<BiifI")
+
+
+@dataclass(frozen=True)
+class AlarmState:
+    kind: int
+    alarm_id: int
+    stream_id: int
+    volume: float
+    timestamp: int
+
+    @property
+    def is_ringing(self) -> bool:
+        return self.kind == TRIGGERED
+
+
+class AlarmJournal:
+    """
+    Append-only log of alarm trigger and stop markers, so that an alarm that
+    was ringing when the app went down can be resumed at startup.
+
+    Records have a fixed size, the current state is the last record and is
+    read without scanning the file. append() only buffers: a writer thread
+    writes and fsyncs whatever was appended within batch_seconds at once, so
+    that the disk is never waited for while an alarm starts. The file is
+    truncated after a stop marker once it exceeds max_bytes.
+    """
+
+    def __init__(
+        self, path: str, batch_seconds: float = 0.2, max_bytes: int = 64 * 1024
+    ):
+        self.path = path
+        self.batch_seconds = batch_seconds
+        self.max_bytes = max_bytes
+        self._pending = bytearray()
+        self._closed = False
+        self._condition = threading.Condition()
+        self._fsync = MetricsRegistry().histogram(
+            "tac_alarm_journal_fsync_seconds",
+            "Time to write and fsync a batch of alarm journal records",
+        )
+        self._file = open(path, "ab")
+        # a record cut short by a crash would misalign everything after it
+        size = self._file.tell()
+        if size % RECORD.size:
+            self._file.truncate(size - size % RECORD.size)
+        self._thread = threading.Thread(
+            target=self._run, name="AlarmJournal", daemon=True
+        )
+        self._thread.start()
+
+    def triggered(self, alarm_definition: AlarmDefinition):
+        audio_effect = alarm_definition.audio_effect
+        stream = audio_effect.audio_stream if audio_effect else None
+        self.append(
+            TRIGGERED,
+            alarm_definition.id if alarm_definition.id is not None else -1,
+            stream.id if stream is not None and stream.id is not None else -1,
+            (
+                audio_effect.volume
+                if audio_effect and audio_effect.volume is not None
+                else NO_VOLUME
+            ),
+        )
+
+    def stopped(self):
+        self.append(STOPPED)
+
+    def append(
+        self,
+        kind: int,
+        alarm_id: int = -1,
+        stream_id: int = -1,
+        volume: float = NO_VOLUME,
+    ):
+        record = RECORD.pack(kind, alarm_id, stream_id, volume, int(time.time()))
+        with self._condition:
+            self._pending += record
+            self._condition.notify()
+
+    def last(self) -> AlarmState:
+        """The last record on disk, None for an empty journal."""
+        try:
+            with open(self.path, "rb") as f:
+                size = f.seek(0, os.SEEK_END)
+                size -= size % RECORD.size
+                if size == 0:
+                    return None
+                f.seek(size - RECORD.size)
+                return AlarmState(*RECORD.unpack(f.read(RECORD.size)))
+        except OSError:
+            logger.warning("alarm journal not readable: %s", self.path, exc_info=True)
+            return None
+
+    def close(self):
+        """Writes what is pending and stops the writer thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+        self._file.close()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                closed = self._closed
+                if not closed:
+                    # gives records appended right after this one a ride
+                    closed = self._condition.wait_for(
+                        lambda: self._closed, self.batch_seconds
+                    )
+                data, self._pending = bytes(self._pending), bytearray()
+            if data:
+                self._write(data)
+            if closed:
+                return
+
+    def _write(self, data: bytes):
+        start = time.perf_counter()
+        try:
+            self._file.write(data)
+            if data[-RECORD.size] == STOPPED and self._file.tell() > self.max_bytes:
+                self._file.truncate(0)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError:
+            logger.error("alarm journal not written: %s", self.path, exc_info=True)
+        self._fsync.observe(time.perf_counter() - start)
@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Type
+
+from core.infrastructure.event_bus import BaseEvent, EventBus
+from core.infrastructure.event_dispatcher import EventDispatcher
+from core.infrastructure.event_journal import EventJournal
+from core.infrastructure.handler_watchdog import HandlerWatchdog
+
+logger = logging.getLogger("tac.core.infrastructure.async_event_bus")
+
+
+class LoopHandler:
+    """Schedules an async def handler on the event loop of the bus, from any thread."""
+
+    def __init__(
+        self,
+        bus: "AsyncEventBus",
+        handler: Callable[[BaseEvent], Awaitable[None]],
+        name: str,
+    ):
+        self.bus = bus
+        self.handler = handler
+        self.name = name
+
+    def __call__(self, event: BaseEvent):
+        self.bus.call_soon(self.bus.create_task, self.run(event))
+
+    async def run(self, event: BaseEvent):
+        try:
+            await self.handler(event)
+        except Exception as e:
+            logger.error(
+                f"Error in handler {self.name} for {type(event).__name__}: {e}",
+                exc_info=True,
+            )
+
+
+class AsyncEventBus(EventBus):
+    """
+    EventBus that also accepts async def handlers, which run as tasks on the
+    asyncio loop of tornado's IOLoop, however and from whichever thread the
+    event is emitted. Sync handlers are called as before by emit.
+
+    Without a dispatcher, emit_async hops onto the loop with
+    call_soon_threadsafe instead of using threads of its own: async handlers
+    are awaited there and sync handlers run in the executor, so they never
+    block the loop. Events of one type are delivered in emit order, while
+    events of different types overlap.
+    """
+
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor = None,
+        dispatcher: EventDispatcher = None,
+        recorder: EventJournal = None,
+        watchdog: HandlerWatchdog = None,
+    ):
+        super().__init__(
+            executor=executor,
+            dispatcher=dispatcher,
+            recorder=recorder,
+            watchdog=watchdog,
+        )
+        self._loop: asyncio.AbstractEventLoop = None
+        # last delivery per event type, the next one waits for it
+        self._deliveries: Dict[Type[BaseEvent], asyncio.Future] = {}
+
+    def attach_loop(self, loop: asyncio.AbstractEventLoop):
+        """Loop to run on; events emitted before it runs are delivered once it does."""
+        self._loop = loop
+
+    def call_soon(self, callback: Callable, *args):
+        if self._loop is None:
+            raise RuntimeError("no event loop attached to the event bus")
+        self._loop.call_soon_threadsafe(callback, *args)
+
+    def create_task(self, coroutine: Awaitable) -> asyncio.Task:
+        return self._loop.create_task(coroutine)
+
+    def _dispatch_callable(
+        self, handler: Callable[[BaseEvent], None], name: str
+    ) -> Callable[[BaseEvent], None]:
+        if asyncio.iscoroutinefunction(handler):
+            return LoopHandler(self, handler, name)
+        return handler
+
+    def emit_async(self, event: BaseEvent):
+        if self._dispatcher is not None or self._loop is None:
+            super().emit_async(event)
+            return
+        if self.recorder is not None:
+            # delivered on the loop without passing through emit
+            self.recorder.record(
+                event, is_root=not self.recorder.nested(), is_async=True
+            )
+        self.call_soon(self._schedule_delivery, event)
+
+    def _schedule_delivery(self, event: BaseEvent):
+        event_type = type(event)
+        previous = self._deliveries.get(event_type)
+        delivery = self.create_task(self._deliver(event, previous))
+        self._deliveries[event_type] = delivery
+        delivery.add_done_callback(
+            lambda done: (
+                self._deliveries.pop(event_type, None)
+                if self._deliveries.get(event_type) is done
+                else None
+            )
+        )
+
+    async def _deliver(self, event: BaseEvent, previous: asyncio.Future):
+        if previous is not None:
+            await asyncio.wait([previous])
+
+        handlers = self._handlers.get(type(event))
+        if not handlers:
+            logger.warning(f"No handlers registered for {type(event).__name__}")
+            return
+
+        for dispatch, name, _, histogram in handlers:
+            start = time.perf_counter()
+            try:
+                if isinstance(dispatch, LoopHandler):
+                    await dispatch.run(event)
+                else:
+                    await self._loop.run_in_executor(self._executor, dispatch, event)
+            except Exception as e:
+                logger.error(
+                    f"Error in handler {name} for {type(event).__name__}: {e}",
+                    exc_info=True,
+                )
+            if histogram is not None:
+                histogram.observe(time.perf_counter() - start)
@@ -8,14 +8,18 @@ from concurrent.futures import ThreadPoolExecutor
 
 from core.domain.events import (
     PlaybackChangedEvent,
+    PreAlarmTriggeredEvent,
     SpeakerErrorEvent,
 )
 from core.domain.model import (
     AudioStream,
+    Mode,
+    OfflineStream,
     SpotifyStream,
 )
 from core.infrastructure.event_bus import EventBus
 from resources.resources import init_logging
+from utils.metrics import Histogram, MetricsRegistry
 
 logger = logging.getLogger("tac.core.infrastructure.audio")
 
@@ -30,6 +34,12 @@ class MediaPlayer:
     def stop(self):
         pass
 
+    def is_playing(self) -> bool:
+        return False
+
+    def set_muted(self, muted: bool):
+        pass
+
     def set_error_callback(self, callback: callable):
         self.error_callback = callback
 
@@ -40,10 +50,12 @@ class MediaListPlayer(MediaPlayer):
         audio_stream: AudioStream,
         instance: vlc.Instance,
         executor: ThreadPoolExecutor,
+        muted: bool = False,
     ):
         self.audio_stream = audio_stream
         self.instance = instance
         self.executor = executor
+        self.muted = muted
         self.list_player = None
         self.media = None
         self.media_list = None
@@ -55,6 +67,9 @@ class MediaListPlayer(MediaPlayer):
         while not self._stop_monitoring.is_set():
             try:
                 if self.list_player is not None:
+                    if self.muted:
+                        # vlc forgets the mute when its audio output is created
+                        self._apply_mute()
                     state = self.list_player.get_state()
                     if state == vlc.State.Error or state == vlc.State.Ended:
                         stream_name = (
@@ -99,10 +114,25 @@ class MediaListPlayer(MediaPlayer):
 
             logger.info("starting audio %s", stream_url)
             self.list_player.play()
+            if self.muted:
+                self._apply_mute()
         except Exception:
             logger.error("Error starting playback: %s", traceback.format_exc())
             self.stop()
 
+    def is_playing(self) -> bool:
+        list_player = self.list_player
+        return list_player is not None and bool(list_player.is_playing())
+
+    def set_muted(self, muted: bool):
+        self.muted = muted
+        self._apply_mute()
+
+    def _apply_mute(self):
+        list_player = self.list_player
+        if list_player is not None:
+            list_player.get_media_player().audio_set_mute(self.muted)
+
     def stop(self):
         if self._monitoring_future:
             self._stop_monitoring.set()
@@ -128,7 +158,20 @@ class MediaListPlayer(MediaPlayer):
 
 
 class Speaker:
+    """
+    Plays the stream of the current PlaybackChangedEvent.
+
+    On PreAlarmTriggeredEvent the alarm's stream is started muted, so that
+    it is connected and buffered by the time the alarm fires and only needs
+    to be unmuted. A stream that fails while warming up is not tried again
+    at alarm time, the alarm falls back to the offline stream right away.
+    How long an alarm takes until its player plays is recorded in
+    tac_alarm_first_sample_seconds; after first_sample_timeout without sound
+    the alarm falls back as well.
+    """
+
     media_player: MediaPlayer = None
+    warm_player: MediaPlayer = None
     fallback_player_proc: subprocess.Popen = None
 
     def __init__(
@@ -136,20 +179,148 @@ class Speaker:
         event_bus: EventBus,
         vlc_instance: vlc.Instance,
         executor: ThreadPoolExecutor,
+        first_sample_timeout: float = 10.0,
+        warm_timeout: float = 30 * 60,
     ) -> None:
         self.threadLock = threading.Lock()
         self.event_bus = event_bus
         self.event_bus.on(PlaybackChangedEvent)(self._playback_changed)
+        self.event_bus.on(PreAlarmTriggeredEvent)(self._pre_alarm_triggered)
         self.vlc_instance = vlc_instance
         self.executor = executor
+        self.first_sample_timeout = first_sample_timeout
+        # longest a warm player is kept when no alarm claims it
+        self.warm_timeout = warm_timeout
+        self._warm_expiry: threading.Timer = None
+        self._unhealthy_stream_url: str = None
 
     def _playback_changed(self, event: PlaybackChangedEvent):
         if isinstance(event.audio_stream, SpotifyStream):
             self.adjust_streaming(None)
             return
+        if event.playback_mode == Mode.Alarm and event.audio_stream is not None:
+            self.start_alarm_streaming(event.audio_stream)
+            return
 
         self.adjust_streaming(event.audio_stream)
 
+    def _pre_alarm_triggered(self, event: PreAlarmTriggeredEvent):
+        audio_effect = event.alarm_definition.audio_effect
+        audio_stream = audio_effect.audio_stream if audio_effect else None
+        if audio_stream is None or isinstance(
+            audio_stream, (OfflineStream, SpotifyStream)
+        ):
+            return
+
+        with self.threadLock:
+            self._discard_warm_player()
+            self._unhealthy_stream_url = None
+            player = MediaListPlayer(
+                audio_stream, self.vlc_instance, self.executor, muted=True
+            )
+            player.set_error_callback(self._warm_player_failed)
+            player.play()
+            self.warm_player = player
+            self._warm_expiry = threading.Timer(
+                self.warm_timeout, self._warm_player_expired, args=(player,)
+            )
+            self._warm_expiry.daemon = True
+            self._warm_expiry.start()
+        logger.info("warming up alarm stream %s", audio_stream.stream_name)
+
+    def _warm_player_failed(self, audio_stream: AudioStream, player_state, *_):
+        with self.threadLock:
+            player = self.warm_player
+            if player is None or player.audio_stream is not audio_stream:
+                return
+            self._discard_warm_player()
+            self._unhealthy_stream_url = audio_stream.stream_url
+        logger.warning(
+            "alarm stream %s failed while warming up: %s",
+            audio_stream.stream_name,
+            player_state,
+        )
+
+    def _warm_player_expired(self, player: MediaPlayer):
+        with self.threadLock:
+            if self.warm_player is not player:
+                return
+            self._discard_warm_player()
+        logger.info("warm alarm player expired unused")
+
+    def _discard_warm_player(self):
+        if self._warm_expiry is not None:
+            self._warm_expiry.cancel()
+            self._warm_expiry = None
+        if self.warm_player is not None:
+            self.warm_player.stop()
+            self.warm_player = None
+
+    def _take_warm_player(self, audio_stream: AudioStream) -> MediaPlayer:
+        player = self.warm_player
+        # still buffering it is ahead of a new player all the same
+        if (
+            player is not None
+            and player.audio_stream.stream_url == audio_stream.stream_url
+        ):
+            self.warm_player = None
+            self._discard_warm_player()
+            return player
+        self._discard_warm_player()
+        return None
+
+    def start_alarm_streaming(self, audio_stream: AudioStream):
+        requested = time.perf_counter()
+        with self.threadLock:
+            # the stream already failed minutes ago, no need to wait for it again
+            unhealthy = audio_stream.stream_url == self._unhealthy_stream_url
+            self._unhealthy_stream_url = None
+            player = self._take_warm_player(audio_stream)
+            if player is not None:
+                self.stop_streaming()
+                player.set_error_callback(self.handle_player_error)
+                player.set_muted(False)
+                self.media_player = player
+            elif unhealthy:
+                self.stop_streaming()
+            else:
+                self.start_streaming(audio_stream)
+            media_player = self.media_player
+
+        if media_player is None:
+            if unhealthy:
+                logger.warning("skipping alarm stream %s", audio_stream.stream_name)
+                self.handle_player_error(audio_stream)
+            return
+        kind = "warm" if player is not None else "cold"
+        self.executor.submit(self._watch_first_sample, media_player, requested, kind)
+
+    def _watch_first_sample(self, player: MediaPlayer, requested: float, kind: str):
+        deadline = requested + self.first_sample_timeout
+        while time.perf_counter() < deadline:
+            if player is not self.media_player:
+                return
+            if player.is_playing():
+                latency = time.perf_counter() - requested
+                self._first_sample_histogram(kind).observe(latency)
+                logger.info("alarm playing after %.2f s (%s player)", latency, kind)
+                return
+            time.sleep(0.05)
+        if player is self.media_player:
+            logger.warning(
+                "alarm not playing after %.1f s (%s player)",
+                self.first_sample_timeout,
+                kind,
+            )
+            self.handle_player_error(player.audio_stream)
+
+    def _first_sample_histogram(self, kind: str) -> Histogram:
+        return MetricsRegistry().histogram(
+            "tac_alarm_first_sample_seconds",
+            "Time from an alarm's playback request until its player plays",
+            player=kind,
+        )
+
     def adjust_streaming(self, audio_stream: AudioStream):
         self.threadLock.acquire(True)
 
@@ -168,7 +339,7 @@ class Speaker:
         return player
 
     def handle_player_error(
-        self, audio_stream: AudioStream, player_state: vlc.State, *_
+        self, audio_stream: AudioStream, player_state: vlc.State = None, *_
     ):
         self.event_bus.emit(SpeakerErrorEvent(audio_stream))
 
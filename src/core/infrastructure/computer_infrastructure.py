@@ -71,7 +71,7 @@ class ComputerInfrastructure(IBrightnessSensor):
 
         try:
             if key_code == ecodes.KEY_1:
-                self.event_bus.emit(
+                self.event_bus.emit_async(
                     HwRotaryEvent(
                         DeviceName.ROTARY_ENCODER,
                         RotaryDirection.COUNTERCLOCKWISE,
@@ -79,15 +79,15 @@ class ComputerInfrastructure(IBrightnessSensor):
                     )
                 )
             elif key_code == ecodes.KEY_2:
-                self.event_bus.emit(
+                self.event_bus.emit_async(
                     HwRotaryEvent(
                         DeviceName.ROTARY_ENCODER, RotaryDirection.CLOCKWISE, True
                     )
                 )
             elif key_code == ecodes.KEY_3:
-                self.event_bus.emit(HwButtonEvent(DeviceName.MODE_BUTTON))
+                self.event_bus.emit_async(HwButtonEvent(DeviceName.MODE_BUTTON))
             elif key_code == ecodes.KEY_4:
-                self.event_bus.emit(HwButtonEvent(DeviceName.INVOKE_BUTTON))
+                self.event_bus.emit_async(HwButtonEvent(DeviceName.INVOKE_BUTTON))
             elif key_code == ecodes.KEY_5:
                 brightness_examples = [0.0, 0.1, 0.3, 0.8, 1.0]
                 self.simulated_brightness = brightness_examples[
@@ -1,27 +1,193 @@
+from __future__ import annotations
+
 from datetime import datetime
+import itertools
 import logging
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
-from timeit import timeit
-from typing import Callable, Dict, List, Type
+from enum import IntEnum
+from typing import TYPE_CHECKING, Callable, ClassVar, Dict, List, Optional, Tuple, Type
 from dataclasses import dataclass
-from uuid import uuid4
 
+from core.infrastructure.handler_watchdog import BackgroundHandler, HandlerLane
+from utils.metrics import Histogram, MetricsRegistry
+
+if TYPE_CHECKING:
+    from core.infrastructure.event_dispatcher import EventDispatcher
+    from core.infrastructure.event_journal import EventJournal
+    from core.infrastructure.handler_watchdog import HandlerWatchdog
 
 logger = logging.getLogger("tac.core.infrastructure.event_bus")
 
 
+@dataclass(frozen=True)
+class CoalescePolicy:
+    """
+    How bursts of one event type reach each of its handlers.
+
+    latest_within_ms: the first event is delivered at once, further events
+    within the window collapse into one delivery of the latest at its end.
+    Otherwise events that arrive while the handler is still busy collapse
+    into one delivery of the latest as soon as it returns.
+    In both cases a handler never runs concurrently with itself and the
+    latest event is always delivered.
+    """
+
+    latest_within_ms: int = None
+
+    @staticmethod
+    def until_ready() -> "CoalescePolicy":
+        return CoalescePolicy()
+
+    @staticmethod
+    def latest_within(ms: int) -> "CoalescePolicy":
+        return CoalescePolicy(latest_within_ms=ms)
+
+
+class EventPriority(IntEnum):
+    """Queue of an event type when emitted asynchronously through an EventDispatcher."""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
 @dataclass(frozen=True, kw_only=True)
 class BaseEvent:
     suppress_logging: bool = False
+    # event types whose handlers only care about the latest state declare a policy
+    coalesce: ClassVar[Optional[CoalescePolicy]] = None
+    priority: ClassVar[EventPriority] = EventPriority.NORMAL
+    # a newer event makes older ones still queued for a background handler obsolete
+    supersedes: ClassVar[bool] = False
+
+
+def handler_name(handler: Callable) -> str:
+    return (
+        handler.__func__.__qualname__
+        if hasattr(handler, "__func__")
+        else getattr(handler, "__qualname__", repr(handler))
+    )
 
 
-class EventBus:
+class CoalescingHandler:
+    """Wraps a handler and delivers events to it according to a CoalescePolicy."""
+
+    def __init__(
+        self,
+        handler: Callable[[BaseEvent], None],
+        name: str,
+        policy: CoalescePolicy,
+        recorder: EventJournal = None,
+    ):
+        self.handler = handler
+        self.name = name
+        self.policy = policy
+        self.recorder = recorder
+        self._lock = threading.Lock()
+        self._busy = False
+        self._pending: BaseEvent = None
+        self._window_end = 0.0
+        self._timer: threading.Timer = None
+
+    def __call__(self, event: BaseEvent):
+        if self.policy.latest_within_ms:
+            self._throttle(event)
+        else:
+            self._deliver(event)
+
+    def _throttle(self, event: BaseEvent):
+        now = time.monotonic()
+        with self._lock:
+            if now < self._window_end or self._timer is not None:
+                self._pending = event
+                if self._timer is None:
+                    self._timer = threading.Timer(
+                        self._window_end - now, self._window_elapsed
+                    )
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+            self._window_end = now + self.policy.latest_within_ms / 1000
+        self._deliver(event)
+
+    def _window_elapsed(self):
+        with self._lock:
+            event, self._pending = self._pending, None
+            self._timer = None
+            self._window_end = time.monotonic() + self.policy.latest_within_ms / 1000
+        if event is None:
+            return
+        if self.recorder is None:
+            self._deliver(event)
+            return
+        with self.recorder.deferred():
+            self._deliver(event)
+
+    def _deliver(self, event: BaseEvent):
+        with self._lock:
+            if self._busy:
+                self._pending = event
+                return
+            self._busy = True
+
+        while event is not None:
+            try:
+                self.handler(event)
+            except Exception as e:
+                logger.error(
+                    f"Error in handler {self.name} for {type(event).__name__}: {e}",
+                    exc_info=True,
+                )
+            with self._lock:
+                if self._timer is None:
+                    event, self._pending = self._pending, None
+                else:
+                    # the pending event belongs to the open window
+                    event = None
+                self._busy = event is not None
+
 
-    def __init__(self, executor: ThreadPoolExecutor = None):
-        self._handlers: Dict[Type[BaseEvent], List[Callable[[BaseEvent], None]]] = {}
+class EventBus:
+    """
+    Synchronous publish/subscribe bus.
+
+    Handlers are kept per event type in immutable tuples that are rebuilt on
+    (un)registration, so emit only looks up and iterates a tuple and never
+    needs a lock. Handler timings are taken for every logged event and for
+    every timing_sample_interval-th suppressed one, which covers the high
+    rate events. They go to the tac_event_handler_seconds histograms, the
+    latest sample per handler is kept in handler_timings.
+
+    With a watchdog, handlers that are too slow for emit, or are declared
+    with handler_lane(HandlerLane.BACKGROUND), run on its background lane.
+    """
+
+    timing_sample_interval = 64
+
+    def __init__(
+        self,
+        executor: ThreadPoolExecutor = None,
+        dispatcher: EventDispatcher = None,
+        recorder: EventJournal = None,
+        watchdog: HandlerWatchdog = None,
+    ):
+        self._handlers: Dict[
+            Type[BaseEvent],
+            Tuple[Tuple[Callable[[BaseEvent], None], str, Callable, Histogram], ...],
+        ] = {}
+        self._lock = threading.Lock()
+        self._event_ids = itertools.count(1)
+        self.handler_timings: Dict[str, float] = {}
         self._executor = executor or ThreadPoolExecutor(
             max_workers=5, thread_name_prefix="EventBus"
         )
+        self._dispatcher = dispatcher
+        self.recorder = recorder
+        self.watchdog = watchdog
+        if dispatcher is not None:
+            dispatcher.start(self.emit)
 
     def on(self, event_type: Type[BaseEvent]) -> Callable:
 
@@ -34,54 +200,154 @@ class EventBus:
     def register(
         self, event_type: Type[BaseEvent], handler: Callable[[BaseEvent], None]
     ):
-        if event_type not in self._handlers:
-            self._handlers[event_type] = []
-        self._handlers[event_type].append(handler)
+        name = handler_name(handler)
+        dispatch = self._dispatch_callable(handler, name)
+        if event_type.coalesce is not None:
+            dispatch = CoalescingHandler(
+                dispatch, name, event_type.coalesce, self.recorder
+            )
+        histogram = MetricsRegistry().histogram(
+            "tac_event_handler_seconds",
+            "Run time of event handlers, all logged and every "
+            f"{self.timing_sample_interval}th suppressed event",
+            event=event_type.__name__,
+            handler=name,
+        )
+        lane = getattr(handler, "handler_lane", HandlerLane.AUTO)
+        if self.watchdog is not None and lane == HandlerLane.BACKGROUND:
+            # the background lane takes the timings, emit only hands over
+            dispatch = self.watchdog.background(
+                dispatch, name, histogram, self.recorder
+            )
+            histogram = None
+        with self._lock:
+            self._handlers[event_type] = self._handlers.get(event_type, ()) + (
+                (dispatch, name, handler, histogram),
+            )
         logger.debug(f"Registered handler {handler.__name__} for {event_type.__name__}")
 
+    def _dispatch_callable(
+        self, handler: Callable[[BaseEvent], None], name: str
+    ) -> Callable[[BaseEvent], None]:
+        """What emit calls for handler, subclasses may wrap it."""
+        return handler
+
     def emit(self, event: BaseEvent):
-        event_id = uuid4()
+        recorder = self.recorder
+        if recorder is None:
+            self._dispatch(event)
+            return
+        recorder.enter(event)
+        try:
+            self._dispatch(event)
+        finally:
+            recorder.leave()
+
+    def _dispatch(self, event: BaseEvent):
         event_type = type(event)
-        suppress_logging = getattr(event, "suppress_logging", False)
-        handlers = self._handlers.get(event_type, [])
+        handlers = self._handlers.get(event_type)
 
         if not handlers:
             logger.warning(f"No handlers registered for {event_type.__name__}")
             return
 
-        if not suppress_logging:
+        event_id = next(self._event_ids)
+        log_event = not event.suppress_logging
+        if log_event:
             logger.info(
                 f"Emitting {event_type.__name__}({event_id}) to {len(handlers)} handler(s)"
             )
-        handler_times = {}
-        for handler in handlers:
+
+        if not log_event and event_id % self.timing_sample_interval:
+            for dispatch, name, _, _ in handlers:
+                try:
+                    dispatch(event)
+                except Exception as e:
+                    logger.error(
+                        f"Error in handler {name} for {event_type.__name__}: {e}",
+                        exc_info=True,
+                    )
+            return
+
+        handler_times = []
+        for dispatch, name, handler, histogram in handlers:
+            start = time.perf_counter()
             try:
-                handler_name = (
-                    f"{handler.__func__.__qualname__}"
-                    if hasattr(handler, "__func__")
-                    else handler.__name__
-                )
-                handler_times[handler_name] = (
-                    timeit(lambda: handler(event), number=1) * 1000
-                )
+                dispatch(event)
             except Exception as e:
                 logger.error(
-                    f"Error in handler {handler_name} for {event_type.__name__}: {e}",
+                    f"Error in handler {name} for {event_type.__name__}: {e}",
                     exc_info=True,
                 )
-        if not suppress_logging:
+            elapsed = time.perf_counter() - start
+            if histogram is not None:
+                histogram.observe(elapsed)
+                if self.watchdog is not None and elapsed > self.watchdog.budget:
+                    self._over_budget(event_type, name, handler, elapsed)
+            exec_time = elapsed * 1000
+            self.handler_timings[name] = exec_time
+            handler_times.append((name, exec_time))
+
+        if log_event and logger.isEnabledFor(logging.DEBUG):
             msg = f"Emitted {event_type.__name__}({event_id}) to {len(handlers)} handler(s) with execution times:"
-            for handler, exec_time in handler_times.items():
-                msg += f"\n - {f"{handler}: {exec_time:.2f} ms"}"
+            for name, exec_time in handler_times:
+                msg += f"\n - {name}: {exec_time:.2f} ms"
             logger.debug(msg)
 
+    def _over_budget(
+        self,
+        event_type: Type[BaseEvent],
+        name: str,
+        handler: Callable[[BaseEvent], None],
+        elapsed: float,
+    ):
+        lane = getattr(handler, "handler_lane", HandlerLane.AUTO)
+        if not self.watchdog.over_budget(event_type, name, lane, elapsed):
+            return
+        with self._lock:
+            handlers = self._handlers.get(event_type, ())
+            index = next(
+                (
+                    i
+                    for i, (_, _, entry_handler, histogram) in enumerate(handlers)
+                    if entry_handler is handler and histogram is not None
+                ),
+                None,
+            )
+            if index is None:
+                return
+            # the AUTO handlers after it follow it onto one queue, so that they
+            # still get each event after it; INLINE ones stay inside emit
+            queue = self.watchdog.queue(self.recorder)
+            moved = list(handlers[:index])
+            for dispatch, entry_name, entry_handler, histogram in handlers[index:]:
+                entry_lane = getattr(entry_handler, "handler_lane", HandlerLane.AUTO)
+                if entry_lane != HandlerLane.AUTO:
+                    moved.append((dispatch, entry_name, entry_handler, histogram))
+                    continue
+                if isinstance(dispatch, BackgroundHandler):
+                    dispatch, histogram = dispatch.handler, dispatch.histogram
+                background = self.watchdog.background(
+                    dispatch, entry_name, histogram, queue=queue
+                )
+                moved.append((background, entry_name, entry_handler, None))
+            self._handlers[event_type] = tuple(moved)
+
     def emit_all(self, events: List[BaseEvent]):
         for event in events:
             self.emit(event)
 
     def emit_async(self, event: BaseEvent):
-        """Emit an event asynchronously using a thread pool."""
-        self._executor.submit(self.emit, event)
+        """
+        Emit an event asynchronously, through the dispatcher's priority queues
+        if there is one, otherwise using the thread pool.
+        """
+        if self.recorder is not None:
+            self.recorder.hand_off(event)
+        if self._dispatcher is not None:
+            self._dispatcher.submit(event)
+        else:
+            self._executor.submit(self.emit, event)
 
     def emit_all_async(self, events: List[BaseEvent]):
         """Emit multiple events asynchronously."""
@@ -89,25 +355,38 @@ class EventBus:
             self.emit_async(event)
 
     def shutdown(self, wait: bool = True):
-        """Shutdown the event bus thread pool."""
+        """Shutdown the event bus dispatcher and thread pool."""
+        if self._dispatcher is not None:
+            self._dispatcher.shutdown(wait=wait)
+        if self.watchdog is not None:
+            self.watchdog.log_report()
+            self.watchdog.shutdown(wait=wait)
         self._executor.shutdown(wait=wait)
 
     def unregister(
         self, event_type: Type[BaseEvent], handler: Callable[[BaseEvent], None]
     ):
-        if event_type in self._handlers:
-            try:
-                self._handlers[event_type].remove(handler)
-                logger.debug(
-                    f"Unregistered handler {handler.__name__} for {event_type.__name__}"
-                )
-            except ValueError:
-                logger.warning(
-                    f"Handler {handler.__name__} not found for {event_type.__name__}"
-                )
+        with self._lock:
+            handlers = self._handlers.get(event_type, ())
+            # like list.remove, only the first registration goes
+            index = next(
+                (i for i, entry in enumerate(handlers) if entry[2] == handler), None
+            )
+            found = index is not None
+            if found:
+                self._handlers[event_type] = handlers[:index] + handlers[index + 1 :]
+        if found:
+            logger.debug(
+                f"Unregistered handler {handler.__name__} for {event_type.__name__}"
+            )
+        elif event_type in self._handlers:
+            logger.warning(
+                f"Handler {handler.__name__} not found for {event_type.__name__}"
+            )
 
     def clear(self):
-        self._handlers.clear()
+        with self._lock:
+            self._handlers = {}
         logger.debug("Cleared all event handlers")
 
 
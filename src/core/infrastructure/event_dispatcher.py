@@ -0,0 +1,206 @@
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Dict
+
+from core.infrastructure.event_bus import BaseEvent, EventPriority
+from utils.metrics import MetricsRegistry
+
+logger = logging.getLogger("tac.core.infrastructure.event_dispatcher")
+
+
+class OverflowPolicy(Enum):
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    BLOCK = "block"
+
+
+class EventQueue:
+    """Bounded FIFO of events with depth metrics."""
+
+    def __init__(self, name: str, maxsize: int, overflow: OverflowPolicy):
+        self.name = name
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self._events: deque[BaseEvent] = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self.consumer: threading.Thread = None
+        self.high_water = 0
+        self.dropped = 0
+        self.delivered = 0
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def put(self, event: BaseEvent) -> bool:
+        with self._condition:
+            if self._closed:
+                return False
+            # the consumer itself must not wait for its own queue to drain
+            if (
+                len(self._events) >= self.maxsize
+                and threading.current_thread() is not self.consumer
+            ):
+                if self.overflow == OverflowPolicy.BLOCK:
+                    while len(self._events) >= self.maxsize and not self._closed:
+                        self._condition.wait()
+                    if self._closed:
+                        return False
+                elif self.overflow == OverflowPolicy.DROP_OLDEST:
+                    dropped = self._events.popleft()
+                    self._dropped(dropped)
+                else:
+                    self._dropped(event)
+                    return False
+
+            self._events.append(event)
+            self.high_water = max(self.high_water, len(self._events))
+            self._condition.notify_all()
+            return True
+
+    def _dropped(self, event: BaseEvent):
+        self.dropped += 1
+        # a flood would otherwise flood the log as well
+        if self.dropped == 1 or self.dropped % 100 == 0:
+            logger.warning(
+                "queue %s full (%s), dropped %s, %s dropped in total",
+                self.name,
+                self.maxsize,
+                type(event).__name__,
+                self.dropped,
+            )
+
+    def get(self) -> BaseEvent:
+        """Next event, None once the queue is closed and drained."""
+        with self._condition:
+            while not self._events and not self._closed:
+                self._condition.wait()
+            if not self._events:
+                return None
+            event = self._events.popleft()
+            self._condition.notify_all()
+            return event
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        return dict(
+            depth=len(self._events),
+            high_water=self.high_water,
+            dropped=self.dropped,
+            delivered=self.delivered,
+        )
+
+
+class EventDispatcher:
+    """
+    Delivers asynchronously emitted events from bounded queues, one per
+    EventPriority, each drained by its own threads. Events of one type always
+    go to the same queue and thread, so they are delivered in emit order, and
+    a backlog of low priority events never delays high priority ones.
+    """
+
+    queue_sizes = {
+        EventPriority.HIGH: 64,
+        EventPriority.NORMAL: 256,
+        EventPriority.LOW: 64,
+    }
+    # alarms and button presses must not be lost, UI noise may
+    overflow_policies = {
+        EventPriority.HIGH: OverflowPolicy.BLOCK,
+        EventPriority.NORMAL: OverflowPolicy.DROP_OLDEST,
+        EventPriority.LOW: OverflowPolicy.DROP_OLDEST,
+    }
+
+    def __init__(
+        self,
+        threads_per_priority: int = 1,
+        queue_sizes: Dict[EventPriority, int] = None,
+        overflow_policies: Dict[EventPriority, OverflowPolicy] = None,
+    ):
+        queue_sizes = {**self.queue_sizes, **(queue_sizes or {})}
+        overflow_policies = {**self.overflow_policies, **(overflow_policies or {})}
+        self._queues: Dict[EventPriority, list[EventQueue]] = {
+            priority: [
+                EventQueue(
+                    f"{priority.name.lower()}-{i}",
+                    queue_sizes[priority],
+                    overflow_policies[priority],
+                )
+                for i in range(threads_per_priority)
+            ]
+            for priority in EventPriority
+        }
+        self._threads: list[threading.Thread] = []
+        self._deliver: Callable[[BaseEvent], None] = None
+
+        metrics = MetricsRegistry()
+        for queues in self._queues.values():
+            for queue in queues:
+                metrics.gauge(
+                    "tac_event_queue_depth",
+                    "Events waiting in a dispatcher queue",
+                    queue.__len__,
+                    queue=queue.name,
+                )
+                metrics.gauge(
+                    "tac_event_queue_dropped_total",
+                    "Events dropped because a dispatcher queue was full",
+                    lambda queue=queue: queue.dropped,
+                    type="counter",
+                    queue=queue.name,
+                )
+
+    def start(self, deliver: Callable[[BaseEvent], None]):
+        self._deliver = deliver
+        for queues in self._queues.values():
+            for queue in queues:
+                thread = threading.Thread(
+                    target=self._run,
+                    args=(queue,),
+                    name=f"EventDispatcher-{queue.name}",
+                    daemon=True,
+                )
+                queue.consumer = thread
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, event: BaseEvent) -> bool:
+        event_type = type(event)
+        queues = self._queues[event_type.priority]
+        return queues[hash(event_type) % len(queues)].put(event)
+
+    def _run(self, queue: EventQueue):
+        while True:
+            event = queue.get()
+            if event is None:
+                return
+            try:
+                self._deliver(event)
+            except Exception:
+                logger.exception("failed to deliver %s", type(event).__name__)
+            queue.delivered += 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Depth, high water mark, dropped and delivered count per queue."""
+        return {
+            queue.name: queue.stats()
+            for queues in self._queues.values()
+            for queue in queues
+        }
+
+    def shutdown(self, wait: bool = True, timeout_in_secs: float = 2.0):
+        """Stops accepting events; with wait, pending ones are delivered first."""
+        for queues in self._queues.values():
+            for queue in queues:
+                queue.close()
+        if wait:
+            deadline = time.monotonic() + timeout_in_secs
+            for thread in self._threads:
+                thread.join(timeout=max(0.0, deadline - time.monotonic()))
@@ -0,0 +1,203 @@
+import io
+import logging
+import os
+import pickle
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator
+
+from core.infrastructure.event_bus import BaseEvent
+
+logger = logging.getLogger("tac.core.infrastructure.event_journal")
+
+MAGIC = b"TACJ1\n"
+# wall clock at the start of the file, for orientation only
+HEADER = struct.Struct("<d")
+# payload length, monotonic timestamp in ns, flags
+RECORD = struct.Struct("<IQB")
+ROOT_FLAG = 0x01
+# delivered through emit_async rather than emit
+ASYNC_FLAG = 0x02
+
+
+@dataclass(frozen=True)
+class JournalRecord:
+    timestamp_ns: int
+    # emitted from outside of any handler, i.e. input rather than a consequence
+    is_root: bool
+    event: BaseEvent
+    is_async: bool = False
+
+
+class _JournalPickler(pickle.Pickler):
+    """Stores shared objects like the config by name instead of by value."""
+
+    def __init__(self, file, shared: Dict[int, str]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.shared = shared
+
+    def persistent_id(self, obj: Any):
+        return self.shared.get(id(obj))
+
+
+class _JournalUnpickler(pickle.Unpickler):
+
+    def __init__(self, file, shared: Dict[str, Any]):
+        super().__init__(file)
+        self.shared = shared
+
+    def persistent_load(self, pid: str):
+        return self.shared.get(pid)
+
+
+class EventJournal:
+    """
+    Appends every emitted event to a length-prefixed binary log with monotonic
+    timestamps, rotating it like logging's RotatingFileHandler: path.1 is the
+    previous file, up to path.<backup_count>.
+
+    Events are pickled; objects registered with share(), such as the config,
+    are written as a reference and resolved again on reading.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 4 * 1024 * 1024, backup_count=3):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._shared: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._unpicklable: set[type] = set()
+        # ids of events emitted asynchronously, and whether from within a handler
+        self._handed_off: Dict[int, bool] = {}
+        self._file: io.BufferedWriter = None
+        self._open()
+
+    def share(self, name: str, obj: Any):
+        self._shared[id(obj)] = name
+
+    def _open(self):
+        exists = os.path.exists(self.path) and os.path.getsize(self.path) > 0
+        self._file = open(self.path, "ab")
+        if not exists:
+            self._file.write(MAGIC + HEADER.pack(time.time()))
+            self._file.flush()
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+    def nested(self) -> bool:
+        """Whether the current thread is dispatching an event."""
+        return getattr(self._local, "depth", 0) > 0
+
+    def hand_off(self, event: BaseEvent):
+        """Called by the bus before delivering event on another thread."""
+        nested = self.nested()
+        with self._lock:
+            self._handed_off[id(event)] = nested
+
+    def enter(self, event: BaseEvent):
+        """Called by the bus before dispatching event."""
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        is_root = depth == 0
+        is_async = False
+        if is_root and self._handed_off:
+            with self._lock:
+                nested = self._handed_off.pop(id(event), None)
+            if nested is not None:
+                is_root = not nested
+                is_async = True
+        self.record(event, is_root=is_root, is_async=is_async)
+
+    def leave(self):
+        self._local.depth -= 1
+
+    @contextmanager
+    def deferred(self):
+        """For delivering an already recorded event later, e.g. from a timer."""
+        self._local.depth = getattr(self._local, "depth", 0) + 1
+        try:
+            yield
+        finally:
+            self._local.depth -= 1
+
+    def record(self, event: BaseEvent, is_root: bool = True, is_async: bool = False):
+        timestamp_ns = time.monotonic_ns()
+        buffer = io.BytesIO()
+        try:
+            _JournalPickler(buffer, self._shared).dump(event)
+        except Exception:
+            event_type = type(event)
+            if event_type not in self._unpicklable:
+                self._unpicklable.add(event_type)
+                logger.warning("cannot journal %s", event_type.__name__, exc_info=True)
+            return
+        payload = buffer.getvalue()
+
+        with self._lock:
+            if self._file is None:
+                return
+            flags = (ROOT_FLAG if is_root else 0) | (ASYNC_FLAG if is_async else 0)
+            self._file.write(RECORD.pack(len(payload), timestamp_ns, flags))
+            self._file.write(payload)
+            self._file.flush()
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_journal(path: str, shared: Dict[str, Any] = None) -> Iterator[JournalRecord]:
+    """Records of one journal file; a record cut off by a crash ends it."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an event journal")
+        f.read(HEADER.size)
+        while True:
+            head = f.read(RECORD.size)
+            if len(head) < RECORD.size:
+                return
+            length, timestamp_ns, flags = RECORD.unpack(head)
+            payload = f.read(length)
+            if len(payload) < length:
+                return
+            try:
+                event = _JournalUnpickler(io.BytesIO(payload), shared or {}).load()
+            except Exception:
+                logger.warning("skipping unreadable record", exc_info=True)
+                continue
+            yield JournalRecord(
+                timestamp_ns,
+                bool(flags & ROOT_FLAG),
+                event,
+                bool(flags & ASYNC_FLAG),
+            )
+
+
+def journal_files(path: str) -> list[str]:
+    """path and its rotated predecessors, oldest first."""
+    files = []
+    i = 1
+    while os.path.exists(f"{path}.{i}"):
+        files.insert(0, f"{path}.{i}")
+        i += 1
+    if os.path.exists(path):
+        files.append(path)
+    return files
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from core.infrastructure.event_bus import BaseEvent
+from core.infrastructure.event_bus import BaseEvent, EventPriority
 
 from enum import Enum, auto
 
@@ -33,6 +33,8 @@ class RotaryDirection(Enum):
 class HwEvent(BaseEvent):
     device_name: DeviceName
 
+    priority = EventPriority.HIGH
+
 
 @dataclass(frozen=True)
 class HwButtonEvent(HwEvent):
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple
+
+from utils.metrics import Histogram, MetricsRegistry
+
+if TYPE_CHECKING:
+    from core.infrastructure.event_bus import BaseEvent
+    from core.infrastructure.event_journal import EventJournal
+
+logger = logging.getLogger("tac.core.infrastructure.handler_watchdog")
+
+
+class HandlerLane(Enum):
+    # inline until the watchdog finds the handler too slow
+    AUTO = "auto"
+    INLINE = "inline"
+    BACKGROUND = "background"
+
+
+def handler_lane(lane: HandlerLane) -> Callable:
+    """Overrides where the EventBus runs the decorated handler."""
+
+    def decorator(func: Callable) -> Callable:
+        func.handler_lane = lane
+        return func
+
+    return decorator
+
+
+class BackgroundQueue:
+    """
+    Deliveries to background handlers, run one after another on the lane in
+    the order they were queued. Handlers sharing a queue thus see each event
+    in the order emit called them, and none runs concurrently with itself.
+
+    A queued event of a type whose handlers only need the latest state (see
+    BaseEvent.supersedes) is replaced by the next one for the same handler.
+    Beyond maxlen, the oldest deliveries are dropped.
+    """
+
+    def __init__(
+        self, lane: ThreadPoolExecutor, recorder: EventJournal = None, maxlen: int = 256
+    ):
+        self.lane = lane
+        self.recorder = recorder
+        self._deliveries: deque[Tuple[BackgroundHandler, BaseEvent]] = deque(
+            maxlen=maxlen
+        )
+        self._lock = threading.Lock()
+        self._running = False
+        self.dropped = 0
+
+    def put(self, handler: BackgroundHandler, event: BaseEvent):
+        event_type = type(event)
+        with self._lock:
+            if event_type.supersedes or event_type.coalesce is not None:
+                for i, (queued_handler, queued) in enumerate(self._deliveries):
+                    if queued_handler is handler and type(queued) is event_type:
+                        del self._deliveries[i]
+                        break
+            if len(self._deliveries) == self._deliveries.maxlen:
+                self.dropped += 1
+                if self.dropped == 1 or self.dropped % 100 == 0:
+                    logger.warning(
+                        "background lane of %s is backed up, %s events dropped",
+                        handler.name,
+                        self.dropped,
+                    )
+            self._deliveries.append((handler, event))
+            if self._running:
+                return
+            self._running = True
+        self.lane.submit(self._drain)
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                if not self._deliveries:
+                    self._running = False
+                    return
+                handler, event = self._deliveries.popleft()
+            # what the handler emits derives from the recorded event
+            with self.recorder.deferred() if self.recorder else nullcontext():
+                handler.run(event)
+
+
+class BackgroundHandler:
+    """Runs a handler on the background lane instead of inside emit."""
+
+    def __init__(
+        self,
+        handler: Callable[[BaseEvent], None],
+        name: str,
+        histogram: Histogram,
+        queue: BackgroundQueue,
+    ):
+        self.handler = handler
+        self.name = name
+        self.histogram = histogram
+        self.queue = queue
+
+    def __call__(self, event: BaseEvent):
+        self.queue.put(self, event)
+
+    def run(self, event: BaseEvent):
+        start = time.perf_counter()
+        try:
+            self.handler(event)
+        except Exception as e:
+            logger.error(
+                f"Error in handler {self.name} for {type(event).__name__}: {e}",
+                exc_info=True,
+            )
+        self.histogram.observe(time.perf_counter() - start)
+
+
+@dataclass
+class Offender:
+    handler: str
+    event: str
+    over_budget: int = 0
+    max_ms: float = 0.0
+    last_ms: float = 0.0
+    offloaded: bool = False
+
+    def __str__(self) -> str:
+        return (
+            f"handler={self.handler} event={self.event} "
+            f"over_budget={self.over_budget} max_ms={self.max_ms:.1f} "
+            f"last_ms={self.last_ms:.1f} offloaded={self.offloaded}"
+        )
+
+
+class HandlerWatchdog:
+    """
+    Watches the run times the EventBus measures for its handlers. A handler
+    of lane AUTO that takes longer than budget_ms in strikes measurements is
+    moved to the background lane, so that it no longer stalls whoever emits
+    the event. The AUTO handlers registered after it for the same event type
+    move along to keep their order. Handlers declared INLINE are reported but
+    never moved.
+    """
+
+    def __init__(self, budget_ms: float = 100, strikes: int = 3, lane_workers: int = 4):
+        self.budget = budget_ms / 1000
+        self.strikes = strikes
+        self.lane_workers = lane_workers
+        self._lane: ThreadPoolExecutor = None
+        self._offenders: Dict[Tuple[str, str], Offender] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def lane(self) -> ThreadPoolExecutor:
+        if self._lane is None:
+            with self._lock:
+                if self._lane is None:
+                    self._lane = ThreadPoolExecutor(
+                        max_workers=self.lane_workers,
+                        thread_name_prefix="SlowHandlers",
+                    )
+        return self._lane
+
+    def queue(self, recorder: EventJournal = None) -> BackgroundQueue:
+        return BackgroundQueue(self.lane, recorder)
+
+    def background(
+        self,
+        handler: Callable[[BaseEvent], None],
+        name: str,
+        histogram: Histogram,
+        recorder: EventJournal = None,
+        queue: BackgroundQueue = None,
+    ) -> BackgroundHandler:
+        """queue: shared with the handlers that must stay in order with this one."""
+        return BackgroundHandler(
+            handler, name, histogram, queue or self.queue(recorder)
+        )
+
+    def over_budget(
+        self, event_type: type, name: str, lane: HandlerLane, elapsed: float
+    ) -> bool:
+        """Records a slow run, True if the handler is to be moved to the background lane."""
+        key = (event_type.__name__, name)
+        with self._lock:
+            offender = self._offenders.get(key)
+            if offender is None:
+                offender = self._offenders[key] = Offender(name, event_type.__name__)
+                MetricsRegistry().gauge(
+                    "tac_event_handler_over_budget_total",
+                    "Measured handler runs that exceeded the watchdog budget",
+                    lambda offender=offender: offender.over_budget,
+                    type="counter",
+                    event=offender.event,
+                    handler=name,
+                )
+            offender.over_budget += 1
+            offender.last_ms = elapsed * 1000
+            offender.max_ms = max(offender.max_ms, offender.last_ms)
+            offload = (
+                lane == HandlerLane.AUTO
+                and not offender.offloaded
+                and offender.over_budget >= self.strikes
+            )
+            if offload:
+                offender.offloaded = True
+
+        if offload:
+            logger.warning("slow handler moved to background lane: %s", offender)
+        elif offender.over_budget == 1 or offender.over_budget % 100 == 0:
+            logger.warning("slow handler: %s", offender)
+        return offload
+
+    def report(self) -> List[Offender]:
+        """Offenders, slowest first."""
+        with self._lock:
+            offenders = list(self._offenders.values())
+        return sorted(offenders, key=lambda o: o.max_ms, reverse=True)
+
+    def log_report(self):
+        offenders = self.report()
+        if offenders:
+            logger.info(
+                "slow handlers (budget %.0f ms):\n%s",
+                self.budget * 1000,
+                "\n".join(f" - {offender}" for offender in offenders),
+            )
+
+    def shutdown(self, wait: bool = True):
+        if self._lane is not None:
+            self._lane.shutdown(wait=wait)
@@ -0,0 +1,99 @@
+import logging
+
+import numpy as np
+from PIL import Image
+from luma.core.framebuffer import full_frame
+from luma.oled.device import ssd1322
+
+logger = logging.getLogger("tac.core.infrastructure.oled")
+
+
+class NumpySSD1322(ssd1322):
+    """
+    Drop-in SSD1322 that diffs and packs frames with NumPy.
+
+    Frames are reduced to 4-bit levels and compared to the previous frame. The
+    changed rows are split into bands, the changed columns of each band into
+    runs, and each run is sent as its own tight column/row address window. A
+    blinking separator thus costs a few hundred bytes over SPI instead of a
+    quarter of the 8 KiB frame.
+    Accepts "RGB" (luma's default) or "L" images, the closest PIL mode to the
+    controller's native 4 bits per pixel.
+    """
+
+    # unchanged rows between two bands up to which the bands are merged,
+    # saving the address commands for a few extra bytes
+    band_merge_gap = 2
+    # same for unchanged pixel columns between two runs within a band
+    column_merge_gap = 16
+
+    def __init__(
+        self, serial_interface=None, width=256, height=64, mode="RGB", **kwargs
+    ):
+        kwargs.pop("framebuffer", None)
+        self._previous_levels: np.ndarray = None
+        self.bytes_sent = 0
+        super().__init__(
+            serial_interface=serial_interface,
+            width=width,
+            height=height,
+            mode="RGB",
+            framebuffer=full_frame(),
+            **kwargs,
+        )
+        self.mode = mode
+
+    def to_levels(self, image: Image.Image) -> np.ndarray:
+        pixels = np.asarray(image, dtype=np.uint32)
+        if pixels.ndim == 2:
+            return (pixels >> 4).astype(np.uint8)
+        # same luma weights as luma.oled's greyscale_device
+        return (
+            (pixels[..., 0] * 306 + pixels[..., 1] * 601 + pixels[..., 2] * 117) >> 14
+        ).astype(np.uint8)
+
+    @staticmethod
+    def pack(levels: np.ndarray) -> np.ndarray:
+        return (levels[:, 0::2] << 4) | levels[:, 1::2]
+
+    def dirty_windows(self, levels: np.ndarray) -> list[tuple[int, int, int, int]]:
+        """(left, top, right, bottom) windows covering every changed pixel.
+
+        Columns are aligned to 4, the controller addresses 4 pixels per column.
+        """
+        height, width = levels.shape
+        if self._previous_levels is None or self._previous_levels.shape != levels.shape:
+            return [(0, 0, width, height)]
+
+        changed = levels != self._previous_levels
+        rows = np.flatnonzero(changed.any(axis=1))
+        if rows.size == 0:
+            return []
+
+        band_breaks = np.flatnonzero(np.diff(rows) > self.band_merge_gap + 1)
+        band_starts = np.concatenate(([rows[0]], rows[band_breaks + 1]))
+        band_ends = np.concatenate((rows[band_breaks], [rows[-1]])) + 1
+
+        windows = []
+        for top, bottom in zip(band_starts, band_ends):
+            columns = np.flatnonzero(changed[top:bottom].any(axis=0))
+            run_breaks = np.flatnonzero(np.diff(columns) > self.column_merge_gap + 1)
+            run_starts = np.concatenate(([columns[0]], columns[run_breaks + 1]))
+            run_ends = np.concatenate((columns[run_breaks], [columns[-1]]))
+            for first, last in zip(run_starts, run_ends):
+                left = int(first) & ~3
+                right = (int(last) + 4) & ~3
+                windows.append((left, int(top), min(right, width), int(bottom)))
+        return windows
+
+    def display(self, image: Image.Image):
+        assert image.mode == self.mode
+        assert image.size == self.size
+
+        levels = self.to_levels(self.preprocess(image))
+        for left, top, right, bottom in self.dirty_windows(levels):
+            packed = self.pack(levels[top:bottom, left:right])
+            self._set_position(top, right, bottom, left)
+            self.data(packed.ravel().tolist())
+            self.bytes_sent += packed.size
+        self._previous_levels = levels
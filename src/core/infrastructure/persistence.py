@@ -1,4 +1,5 @@
-import os
+import hashlib
+import logging
 import threading
 from concurrent.futures import ThreadPoolExecutor
 from core.domain.events import (
@@ -6,49 +7,111 @@ from core.domain.events import (
     AlarmTriggeredEvent,
     ConfigChangedEvent,
 )
-from core.domain.model import (
-    AlarmDefinition,
-    Config,
-)
+from core.domain.model import Config
+from core.infrastructure.alarm_journal import AlarmJournal
 from core.infrastructure.event_bus import EventBus
-from resources.resources import active_alarm_definition_file
+from utils.extensions import write_atomically
+from utils.metrics import MetricsRegistry
+
+logger = logging.getLogger("tac.core.infrastructure.persistence")
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
 
 
 class Persistence:
+    """
+    Stores the config on ConfigChangedEvent. Bursts of changes within
+    debounce_seconds are written once, with the latest config, and a write is
+    skipped when the serialized config equals what is on disk already.
+
+    Alarm triggers and stops go to the alarm journal.
+    """
+
     config_file: str
 
     def __init__(
-        self, config_file: str, event_bus: EventBus, executor: ThreadPoolExecutor
+        self,
+        config_file: str,
+        event_bus: EventBus,
+        executor: ThreadPoolExecutor,
+        alarm_journal: AlarmJournal,
+        debounce_seconds: float = 2.0,
     ):
         self.config_file = config_file
+        self.alarm_journal = alarm_journal
         self.event_bus = event_bus
         self.executor = executor
+        self.debounce_seconds = debounce_seconds
         self.event_bus.on(AlarmTriggeredEvent)(self._alarm_triggered_event)
         self.event_bus.on(AlarmStoppedEvent)(self._alarm_stopped_event)
         self.event_bus.on(ConfigChangedEvent)(self._config_changed)
         self.threadLock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending: Config = None
+        self._timer: threading.Timer = None
+        self._stored_digest: bytes = self._file_digest()
+        self.writes = 0
+        self.skipped_writes = 0
+
+        metrics = MetricsRegistry()
+        metrics.gauge(
+            "tac_config_writes_total",
+            "Config changes written to disk",
+            lambda: self.writes,
+            type="counter",
+        )
+        metrics.gauge(
+            "tac_config_writes_skipped_total",
+            "Config stores skipped because the file was up to date",
+            lambda: self.skipped_writes,
+            type="counter",
+        )
+
+    def _file_digest(self) -> bytes:
+        try:
+            with open(self.config_file, "rb") as f:
+                return _digest(f.read())
+        except OSError:
+            return None
 
     def _config_changed(self, configChangedEvent: ConfigChangedEvent):
-        self.executor.submit(self.store_config, configChangedEvent.config)
+        with self.threadLock:
+            self._pending = configChangedEvent.config
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(
+                self.debounce_seconds, lambda: self.executor.submit(self.flush)
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Writes a pending config change right away, e.g. before shutdown."""
+        with self.threadLock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            config, self._pending = self._pending, None
+        if config is not None:
+            self.store_config(config)
 
     def _alarm_triggered_event(self, event: AlarmTriggeredEvent):
-        self.store_alarm(event.alarm_definition)
+        self.alarm_journal.triggered(event.alarm_definition)
 
     def _alarm_stopped_event(self, _: AlarmStoppedEvent):
-        self.store_alarm(None)
+        self.alarm_journal.stopped()
 
     def store_config(self, config: Config):
-        self.threadLock.acquire(True)
-
-        with open(self.config_file, "w") as f:
-            f.write(config.serialize())
-
-        self.threadLock.release()
-
-    def store_alarm(self, alarm_definition: AlarmDefinition):
-        if alarm_definition is None:
-            if os.path.exists(active_alarm_definition_file):
-                os.remove(active_alarm_definition_file)
-            return
-
-        alarm_definition.serialize(active_alarm_definition_file)
+        with self._write_lock:
+            data = config.snapshot().serialized.encode("utf-8")
+            digest = _digest(data)
+            if digest == self._stored_digest:
+                self.skipped_writes += 1
+                logger.debug("config unchanged, not written")
+                return
+            write_atomically(self.config_file, data)
+            self._stored_digest = digest
+            self.writes += 1
+        logger.debug("config written, %s bytes", len(data))
@@ -120,7 +120,7 @@ class GPIOInputManager:
                 f"Rotary clockwise detected, {'1st tick' if channel_a_value == 1 else 'later tick'}"
             )
 
-            self.event_bus.emit(
+            self.event_bus.emit_async(
                 HwRotaryEvent(
                     DeviceName.ROTARY_ENCODER,
                     RotaryDirection.CLOCKWISE,
@@ -131,7 +131,7 @@ class GPIOInputManager:
             logger.debug(
                 f"Rotary counter-clockwise detected, {'1st tick' if channel_a_value == 0 else 'later tick'}"
             )
-            self.event_bus.emit(
+            self.event_bus.emit_async(
                 HwRotaryEvent(
                     DeviceName.ROTARY_ENCODER,
                     RotaryDirection.COUNTERCLOCKWISE,
@@ -144,7 +144,7 @@ class GPIOInputManager:
 
     def _mode_button_callback(self, pin_value: bool, _=None):
         logger.debug("Mode button state changed")
-        self.event_bus.emit(
+        self.event_bus.emit_async(
             HwButtonEvent(
                 device_name=DeviceName.MODE_BUTTON,
                 direction=ButtonDirection.DOWN if not pin_value else ButtonDirection.UP,
@@ -153,7 +153,7 @@ class GPIOInputManager:
 
     def _invoke_button_callback(self, pin_value: bool, _=None):
         logger.debug("Invoke button state changed")
-        self.event_bus.emit(
+        self.event_bus.emit_async(
             HwButtonEvent(
                 device_name=DeviceName.INVOKE_BUTTON,
                 direction=ButtonDirection.DOWN if not pin_value else ButtonDirection.UP,
@@ -1,18 +1,31 @@
 from enum import Enum
+import heapq
 import logging
+import threading
 from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, Optional, List
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, List, Tuple
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.date import DateTrigger
 from apscheduler.job import Job
 from apscheduler.schedulers.base import STATE_STOPPED
+from apscheduler.events import (
+    EVENT_ALL_JOBS_REMOVED,
+    EVENT_JOB_ADDED,
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MODIFIED,
+    EVENT_JOB_REMOVED,
+    EVENT_JOB_SUBMITTED,
+    JobEvent,
+    JobSubmissionEvent,
+    SchedulerEvent,
+)
 
 from core.domain.model import AlarmDefinition, Config, NextAlarmInfo
-from core.domain.events import ConfigChangedEvent
 from utils.extensions import get_job_arg
 from utils.geolocation import GeoLocation
+from utils.metrics import MetricsRegistry
 
 logger = logging.getLogger("tac.core.infrastructure.scheduler")
 
@@ -22,13 +35,107 @@ class SchedulerStores(Enum):
     default = "default"
 
 
+def alarm_fingerprint(alarm_definition: AlarmDefinition) -> Hashable:
+    """Everything the cron trigger of an alarm job is built from."""
+    return tuple(sorted(alarm_definition.get_cron_args().items()))
+
+
+class NextAlarmIndex:
+    """
+    Min-heap of (next run time, job id) of the alarm jobs. Updating a job
+    pushes a new entry, outdated entries are dropped when they reach the top
+    and the heap is rebuilt once they make up more than half of it.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, str]] = []
+        self._times: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+
+    def update(self, job_id: str, next_run_time: Optional[datetime]):
+        if next_run_time is None:
+            self.remove(job_id)
+            return
+        with self._lock:
+            if self._times.get(job_id) == next_run_time:
+                return
+            self._times[job_id] = next_run_time
+            heapq.heappush(self._heap, (next_run_time, job_id))
+            if len(self._heap) > 2 * len(self._times) + 16:
+                self._heap = [(t, j) for j, t in self._times.items()]
+                heapq.heapify(self._heap)
+
+    def remove(self, job_id: str):
+        with self._lock:
+            self._times.pop(job_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._times.clear()
+            self._heap.clear()
+
+    def peek(self) -> Optional[Tuple[datetime, str]]:
+        with self._lock:
+            heap = self._heap
+            while heap and self._times.get(heap[0][1]) != heap[0][0]:
+                heapq.heappop(heap)
+            return heap[0] if heap else None
+
+    def next_run_times(self) -> Dict[str, datetime]:
+        with self._lock:
+            return dict(self._times)
+
+
 class SchedulerService:
     def __init__(self, event_bus):
         self.event_bus = event_bus
         jobstores = {"alarm": {"type": "memory"}, "default": {"type": "memory"}}
         self.scheduler = BackgroundScheduler(jobstores=jobstores)
+        self.scheduler.add_listener(self._job_submitted, EVENT_JOB_SUBMITTED)
+        self.next_alarms = NextAlarmIndex()
+        self.scheduler.add_listener(
+            self._alarm_job_changed,
+            EVENT_JOB_ADDED
+            | EVENT_JOB_MODIFIED
+            | EVENT_JOB_REMOVED
+            | EVENT_JOB_SUBMITTED
+            | EVENT_JOB_MAX_INSTANCES
+            | EVENT_ALL_JOBS_REMOVED,
+        )
+        # alarm job id -> definition the job rings and the fingerprint of its trigger
+        self._alarm_definitions: Dict[str, AlarmDefinition] = {}
+        self._alarm_fingerprints: Dict[str, Hashable] = {}
         self.scheduler.start()
 
+    def _job_submitted(self, event: JobSubmissionEvent):
+        scheduled = max(event.scheduled_run_times)
+        lag = (datetime.now(scheduled.tzinfo) - scheduled).total_seconds()
+        # alarm job ids are alarm definition ids, keep the label set small
+        job = "alarm" if event.jobstore == SchedulerStores.alarm.value else event.job_id
+        MetricsRegistry().histogram(
+            "tac_scheduler_job_lag_seconds",
+            "Delay between the scheduled run time of a job and its submission",
+            job=job,
+        ).observe(max(lag, 0.0))
+
+    def _alarm_job_changed(self, event: SchedulerEvent):
+        alarm_store = SchedulerStores.alarm.value
+        if event.code == EVENT_ALL_JOBS_REMOVED:
+            if event.alias in (None, alarm_store):
+                self.next_alarms.clear()
+            return
+        event: JobEvent
+        if event.jobstore != alarm_store:
+            return
+        if event.code == EVENT_JOB_REMOVED:
+            self.next_alarms.remove(event.job_id)
+            return
+        # submitted jobs are already advanced to their next run time
+        job = self.get_job(job_id=event.job_id, jobstore=alarm_store)
+        self.next_alarms.update(
+            event.job_id, getattr(job, "next_run_time", None) if job else None
+        )
+
     def shutdown(self):
         if self.scheduler.state == STATE_STOPPED:
             return
@@ -174,12 +281,75 @@ class SchedulerService:
                 job_id=job_id, run_date=run_date, func=func, jobstore=jobstore
             )
 
+    def sync_alarm_jobs(
+        self, alarm_definitions: Iterable[AlarmDefinition], func: Callable
+    ) -> bool:
+        """
+        Schedules func for every active alarm definition, touching only the
+        jobs whose definition was added, removed or replaced since the last
+        call. Returns whether any job changed, its trigger or the definition
+        it rings.
+
+        Config writers replace a changed definition instead of changing it in
+        place, so an unchanged definition is the very object its job rings.
+        """
+        jobstore = SchedulerStores.alarm.value
+        wanted = {f"{a.id}": a for a in alarm_definitions if a.is_active}
+        changed = False
+
+        for job_id in [j for j in self._alarm_definitions if j not in wanted]:
+            logger.info("removing job for alarm %s", job_id)
+            self.remove_job(job_id=job_id, jobstore=jobstore)
+            del self._alarm_definitions[job_id]
+            del self._alarm_fingerprints[job_id]
+            changed = True
+
+        for job_id, alarm_definition in wanted.items():
+            job = self.get_job(job_id=job_id, jobstore=jobstore)
+            if (
+                job is not None
+                and self._alarm_definitions.get(job_id) is alarm_definition
+            ):
+                continue
+
+            fingerprint = alarm_fingerprint(alarm_definition)
+            if job is not None and self._alarm_fingerprints.get(job_id) == fingerprint:
+                # same trigger, but the job has to ring the new definition
+                job.modify(args=(alarm_definition,))
+                self._alarm_definitions[job_id] = alarm_definition
+                changed = True
+                continue
+
+            if job is None:
+                logger.info("adding job for '%s'", alarm_definition.alarm_name)
+                self.add_cron_job(
+                    func=func,
+                    args=(alarm_definition,),
+                    job_id=job_id,
+                    jobstore=jobstore,
+                    **alarm_definition.get_cron_args(),
+                )
+            else:
+                logger.info("rescheduling job for '%s'", alarm_definition.alarm_name)
+                job.modify(args=(alarm_definition,))
+                self.reschedule_job(
+                    job_id=job_id,
+                    jobstore=jobstore,
+                    trigger=CronTrigger(**alarm_definition.get_cron_args()),
+                )
+            self._alarm_definitions[job_id] = alarm_definition
+            self._alarm_fingerprints[job_id] = fingerprint
+            changed = True
+
+        return changed
+
     def get_next_alarm_info(self) -> NextAlarmInfo:
-        jobs = sorted(
-            self.get_jobs(jobstore=SchedulerStores.alarm.value),
-            key=lambda job: job.next_run_time,
+        next_alarm = self.next_alarms.peek()
+        next_job: Job = (
+            self.get_job(job_id=next_alarm[1], jobstore=SchedulerStores.alarm.value)
+            if next_alarm is not None
+            else None
         )
-        next_job: Job = jobs[0] if len(jobs) > 0 else None
 
         alarm_def = get_job_arg(next_job, AlarmDefinition)
         if next_job is None or alarm_def is None:
@@ -200,12 +370,13 @@ class SchedulerService:
                 )
 
     def cleanup_alarms(self, config: Config):
-        job: Job
-        config_changed = False
-        for job in self.get_jobs(jobstore=SchedulerStores.alarm.value):
-            if job.next_run_time is None:
-                config.remove_alarm_definition(int(job.id))
-                config_changed = True
-        if config_changed:
-            self.event_bus.emit(ConfigChangedEvent(config))
+        expired = [
+            int(job.id)
+            for job in self.get_jobs(jobstore=SchedulerStores.alarm.value)
+            if job.next_run_time is None
+        ]
+        if expired:
+            with config.transaction():
+                for id in expired:
+                    config.remove_alarm_definition(id)
         self.log_active_jobs(SchedulerStores.alarm.value)
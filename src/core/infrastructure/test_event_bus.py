@@ -0,0 +1,202 @@
+import threading
+import time
+import unittest
+from dataclasses import dataclass
+
+from core.infrastructure.event_bus import (
+    BaseEvent,
+    CoalescePolicy,
+    CoalescingHandler,
+    EventBus,
+)
+from core.infrastructure.handler_watchdog import (
+    BackgroundHandler,
+    BackgroundQueue,
+    HandlerWatchdog,
+)
+from utils.metrics import Histogram
+
+
+@dataclass(frozen=True)
+class CoalescedTestEvent(BaseEvent):
+    coalesce = CoalescePolicy.until_ready()
+
+
+@dataclass(frozen=True)
+class CountedTestEvent(BaseEvent):
+    n: int = 0
+
+
+@dataclass(frozen=True)
+class SupersedingTestEvent(BaseEvent):
+    n: int = 0
+
+    supersedes = True
+
+
+class TestEventBus(unittest.TestCase):
+    def test_slow_coalesced_handler_is_moved_to_background_lane(self):
+        watchdog = HandlerWatchdog(budget_ms=10, strikes=2)
+        bus = EventBus(watchdog=watchdog)
+        calls = threading.Semaphore(0)
+
+        def slow_handler(_: CoalescedTestEvent):
+            time.sleep(0.03)
+            calls.release()
+
+        bus.register(CoalescedTestEvent, slow_handler)
+        for _ in range(2):
+            bus.emit(CoalescedTestEvent())
+        dispatch, _, handler, histogram = bus._handlers[CoalescedTestEvent][0]
+        self.assertIsInstance(dispatch, BackgroundHandler)
+        self.assertIs(handler, slow_handler)
+        self.assertIsNone(histogram)
+
+        start = time.perf_counter()
+        bus.emit(CoalescedTestEvent())
+        self.assertLess(time.perf_counter() - start, 0.02)
+        self.assertTrue(calls.acquire(timeout=1))
+        self.assertEqual([o.over_budget for o in watchdog.report()], [2])
+        watchdog.shutdown()
+
+    def test_demoted_handler_keeps_order_with_later_handlers(self):
+        watchdog = HandlerWatchdog(budget_ms=10, strikes=1)
+        bus = EventBus(watchdog=watchdog)
+        seen = []
+        done = threading.Semaphore(0)
+
+        def slow_handler(event: CountedTestEvent):
+            time.sleep(0.02)
+            seen.append(("slow", event.n))
+
+        def fast_handler(event: CountedTestEvent):
+            seen.append(("fast", event.n))
+            done.release()
+
+        bus.register(CountedTestEvent, slow_handler)
+        bus.register(CountedTestEvent, fast_handler)
+        bus.emit(CountedTestEvent(0))
+        self.assertTrue(
+            all(
+                isinstance(dispatch, BackgroundHandler)
+                for dispatch, _, _, _ in bus._handlers[CountedTestEvent]
+            )
+        )
+
+        for n in range(1, 4):
+            bus.emit(CountedTestEvent(n))
+        for _ in range(4):
+            self.assertTrue(done.acquire(timeout=1))
+        expected = [(name, n) for n in range(4) for name in ("slow", "fast")]
+        self.assertEqual(seen, expected)
+        watchdog.shutdown()
+
+
+class TestCoalescingHandler(unittest.TestCase):
+    def setUp(self):
+        self.seen = []
+        self.delivered = threading.Event()
+
+    def handler(self, event: CountedTestEvent):
+        self.seen.append(event.n)
+        self.delivered.set()
+
+    def test_latest_within_delivers_the_first_at_once_and_the_latest_trailing(self):
+        coalescing = CoalescingHandler(
+            self.handler, "handler", CoalescePolicy.latest_within(50)
+        )
+        coalescing(CountedTestEvent(0))
+        self.assertEqual(self.seen, [0])
+
+        self.delivered.clear()
+        for n in range(1, 4):
+            coalescing(CountedTestEvent(n))
+        self.assertEqual(self.seen, [0])
+        self.assertTrue(self.delivered.wait(timeout=1))
+        self.assertEqual(self.seen, [0, 3])
+
+        # the trailing delivery opens the next window
+        self.delivered.clear()
+        coalescing(CountedTestEvent(4))
+        self.assertEqual(self.seen, [0, 3])
+        self.assertTrue(self.delivered.wait(timeout=1))
+        self.assertEqual(self.seen, [0, 3, 4])
+
+    def test_until_ready_suppresses_events_while_busy(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_handler(event: CountedTestEvent):
+            if event.n == 0:
+                started.set()
+                release.wait(timeout=1)
+            self.handler(event)
+
+        coalescing = CoalescingHandler(
+            slow_handler, "handler", CoalescePolicy.until_ready()
+        )
+        busy = threading.Thread(target=coalescing, args=(CountedTestEvent(0),))
+        busy.start()
+        self.assertTrue(started.wait(timeout=1))
+        for n in range(1, 4):
+            # returns at once, the busy thread delivers the latest when done
+            coalescing(CountedTestEvent(n))
+        self.assertEqual(self.seen, [])
+
+        release.set()
+        busy.join(timeout=1)
+        self.assertEqual(self.seen, [0, 3])
+
+        coalescing(CountedTestEvent(4))
+        self.assertEqual(self.seen, [0, 3, 4])
+
+
+class TestBackgroundQueue(unittest.TestCase):
+    def setUp(self):
+        self.watchdog = HandlerWatchdog()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.seen = []
+        self.done = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.watchdog.shutdown()
+
+    def background(self, queue: BackgroundQueue, last: int) -> BackgroundHandler:
+        def handler(event: BaseEvent):
+            # holds the lane, so that everything emitted meanwhile is queued
+            self.started.set()
+            self.release.wait(timeout=1)
+            self.seen.append(event.n)
+            if event.n == last:
+                self.done.set()
+
+        histogram = Histogram((), (1.0,))
+        return self.watchdog.background(handler, "handler", histogram, queue=queue)
+
+    def emit(self, handler: BackgroundHandler, events: list):
+        handler(events[0])
+        self.assertTrue(self.started.wait(timeout=1))
+        for event in events[1:]:
+            handler(event)
+        self.release.set()
+
+    def test_superseded_events_are_coalesced_to_the_latest(self):
+        queue = self.watchdog.queue()
+        handler = self.background(queue, last=299)
+        self.emit(handler, [SupersedingTestEvent(n) for n in range(300)])
+
+        self.assertTrue(self.done.wait(timeout=1))
+        self.assertEqual(self.seen, [0, 299])
+        self.assertEqual(queue.dropped, 0)
+
+    def test_oldest_events_are_dropped_beyond_maxlen(self):
+        queue = BackgroundQueue(self.watchdog.lane, maxlen=4)
+        handler = self.background(queue, last=9)
+        self.emit(handler, [CountedTestEvent(n) for n in range(10)])
+
+        self.assertTrue(self.done.wait(timeout=1))
+        # 0 was already running when the queue filled up
+        self.assertEqual(self.seen, [0, 6, 7, 8, 9])
+        self.assertEqual(queue.dropped, 5)
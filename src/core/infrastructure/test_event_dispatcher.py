@@ -0,0 +1,107 @@
+import threading
+import unittest
+from dataclasses import dataclass
+
+from core.infrastructure.event_bus import BaseEvent, EventPriority
+from core.infrastructure.event_dispatcher import EventDispatcher, OverflowPolicy
+
+
+@dataclass(frozen=True)
+class HighTestEvent(BaseEvent):
+    n: int = 0
+
+    priority = EventPriority.HIGH
+
+
+@dataclass(frozen=True)
+class NormalTestEvent(BaseEvent):
+    n: int = 0
+
+
+@dataclass(frozen=True)
+class LowTestEvent(BaseEvent):
+    n: int = 0
+
+    priority = EventPriority.LOW
+
+
+EVENT_TYPES = {
+    EventPriority.HIGH: HighTestEvent,
+    EventPriority.NORMAL: NormalTestEvent,
+    EventPriority.LOW: LowTestEvent,
+}
+
+
+class TestEventDispatcher(unittest.TestCase):
+    queue_size = 2
+
+    def setUp(self):
+        self.start()
+
+    def tearDown(self):
+        self.release.set()
+        self.dispatcher.shutdown()
+
+    def start(self):
+        self.dispatcher = EventDispatcher(
+            queue_sizes={priority: self.queue_size for priority in EventPriority}
+        )
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.delivered = []
+        self.dispatcher.start(self.deliver)
+
+    def deliver(self, event: BaseEvent):
+        # holds the consumer, so that everything submitted meanwhile is queued
+        self.started.set()
+        self.release.wait(timeout=1)
+        self.delivered.append(event.n)
+
+    def fill(self, event_type: type, count: int):
+        """Submits count events beyond the one the consumer is busy with."""
+        self.dispatcher.submit(event_type(n=0))
+        self.assertTrue(self.started.wait(timeout=1))
+        for n in range(1, count + 1):
+            self.dispatcher.submit(event_type(n=n))
+
+    def test_default_overflow_policies(self):
+        self.assertEqual(
+            EventDispatcher.overflow_policies,
+            {
+                EventPriority.HIGH: OverflowPolicy.BLOCK,
+                EventPriority.NORMAL: OverflowPolicy.DROP_OLDEST,
+                EventPriority.LOW: OverflowPolicy.DROP_OLDEST,
+            },
+        )
+
+    def test_high_priority_blocks_when_full(self):
+        self.fill(HighTestEvent, self.queue_size)
+        blocked = threading.Thread(
+            target=self.dispatcher.submit, args=(HighTestEvent(n=3),), daemon=True
+        )
+        blocked.start()
+        blocked.join(timeout=0.05)
+        self.assertTrue(blocked.is_alive())
+
+        self.release.set()
+        blocked.join(timeout=1)
+        self.assertFalse(blocked.is_alive())
+        self.dispatcher.shutdown()
+        self.assertEqual(self.delivered, [0, 1, 2, 3])
+        self.assertEqual(self.stats(EventPriority.HIGH)["dropped"], 0)
+
+    def test_lower_priorities_drop_the_oldest_when_full(self):
+        for priority in (EventPriority.NORMAL, EventPriority.LOW):
+            with self.subTest(priority=priority.name):
+                self.fill(EVENT_TYPES[priority], self.queue_size + 2)
+                self.release.set()
+                self.dispatcher.shutdown()
+
+                self.assertEqual(self.delivered, [0, 3, 4])
+                stats = self.stats(priority)
+                self.assertEqual(stats["dropped"], 2)
+                self.assertEqual(stats["high_water"], self.queue_size)
+            self.start()
+
+    def stats(self, priority: EventPriority) -> dict:
+        return self.dispatcher.stats()[f"{priority.name.lower()}-0"]
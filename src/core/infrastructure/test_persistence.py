@@ -0,0 +1,82 @@
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from core.domain.events import ConfigChangedEvent
+from core.domain.model import Config
+from core.infrastructure.event_bus import EventBus
+from core.infrastructure.persistence import Persistence
+
+
+def config(default_volume: float) -> Config:
+    config = Config()
+    config.default_volume = default_volume
+    return config
+
+
+class TestPersistence(unittest.TestCase):
+    debounce_seconds = 0.05
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.directory.name, "config.json")
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.event_bus = EventBus()
+        self.persistence = self.persistence_for(self.config_file)
+
+    def tearDown(self):
+        self.executor.shutdown(wait=True)
+        self.directory.cleanup()
+
+    def persistence_for(self, config_file: str) -> Persistence:
+        return Persistence(
+            config_file,
+            self.event_bus,
+            self.executor,
+            MagicMock(),
+            debounce_seconds=self.debounce_seconds,
+        )
+
+    def read(self) -> str:
+        with open(self.config_file) as f:
+            return f.read()
+
+    def test_burst_of_changes_is_written_once(self):
+        configs = [config(volume / 10) for volume in range(5)]
+        for c in configs:
+            self.event_bus.emit(ConfigChangedEvent(c))
+
+        deadline = time.monotonic() + 1
+        while self.persistence.writes == 0:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+        time.sleep(2 * self.debounce_seconds)
+
+        self.assertEqual(self.persistence.writes, 1)
+        self.assertEqual(self.read(), configs[-1].snapshot().serialized)
+
+    def test_identical_content_is_not_written(self):
+        self.persistence.store_config(config(0.4))
+        modified = os.stat(self.config_file).st_mtime_ns
+
+        self.persistence.store_config(config(0.4))
+        self.assertEqual(self.persistence.writes, 1)
+        self.assertEqual(self.persistence.skipped_writes, 1)
+
+        # the digest of the file on disk is taken at startup
+        restarted = self.persistence_for(self.config_file)
+        restarted.store_config(config(0.4))
+        self.assertEqual(restarted.writes, 0)
+        self.assertEqual(restarted.skipped_writes, 1)
+        self.assertEqual(os.stat(self.config_file).st_mtime_ns, modified)
+
+    def test_flush_writes_pending_change_right_away(self):
+        latest = config(0.7)
+        self.event_bus.emit(ConfigChangedEvent(latest))
+        self.persistence.flush()
+
+        self.assertEqual(self.persistence.writes, 1)
+        self.assertEqual(self.read(), latest.snapshot().serialized)
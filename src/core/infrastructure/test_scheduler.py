@@ -0,0 +1,173 @@
+import threading
+import time
+import unittest
+from copy import deepcopy
+
+from core.domain.model import AlarmDefinition
+from core.infrastructure.scheduler import SchedulerService, SchedulerStores
+
+ALARM_STORE = SchedulerStores.alarm.value
+
+
+def alarm(id: int, hour: int, min: int = 0) -> AlarmDefinition:
+    alarm_definition = AlarmDefinition()
+    alarm_definition.id = id
+    alarm_definition.alarm_name = f"alarm {id}"
+    alarm_definition.hour = hour
+    alarm_definition.min = min
+    alarm_definition.recurring = ["MONDAY", "WEDNESDAY", "FRIDAY"]
+    alarm_definition.onetime = None
+    alarm_definition.is_active = True
+    alarm_definition.audio_effect = None
+    alarm_definition.visual_effect = None
+    return alarm_definition
+
+
+def ring(_: AlarmDefinition):
+    pass
+
+
+class TestSyncAlarmJobs(unittest.TestCase):
+    def setUp(self):
+        self.scheduler_service = SchedulerService(event_bus=None)
+
+    def tearDown(self):
+        self.scheduler_service.shutdown()
+
+    def job(self, alarm_definition: AlarmDefinition):
+        return self.scheduler_service.get_job(f"{alarm_definition.id}", ALARM_STORE)
+
+    def sync(self, *alarm_definitions: AlarmDefinition) -> bool:
+        return self.scheduler_service.sync_alarm_jobs(alarm_definitions, ring)
+
+    def test_add(self):
+        first, second = alarm(1, 6), alarm(2, 7)
+        self.assertTrue(self.sync(first, second))
+        self.assertIs(self.job(first).args[0], first)
+        self.assertEqual(self.job(second).next_run_time.hour, 7)
+
+    def test_unchanged_definitions_are_a_no_op(self):
+        first, second = alarm(1, 6), alarm(2, 7)
+        self.sync(first, second)
+        self.assertFalse(self.sync(first, second))
+        self.assertFalse(self.sync(second, first))
+
+    def test_remove(self):
+        first, second = alarm(1, 6), alarm(2, 7)
+        self.sync(first, second)
+
+        inactive = deepcopy(second)
+        inactive.is_active = False
+        self.assertTrue(self.sync(first, inactive))
+        self.assertIsNone(self.job(second))
+
+        self.assertTrue(self.sync())
+        self.assertEqual(self.scheduler_service.get_jobs(ALARM_STORE), [])
+        self.assertFalse(self.sync())
+
+    def test_modified_time_reschedules(self):
+        first = alarm(1, 6)
+        self.sync(first)
+
+        later = deepcopy(first)
+        later.hour = 8
+        self.assertTrue(self.sync(later))
+        job = self.job(later)
+        self.assertIs(job.args[0], later)
+        self.assertEqual(job.next_run_time.hour, 8)
+        self.assertFalse(self.sync(later))
+
+    def test_modified_definition_keeps_the_trigger(self):
+        first = alarm(1, 6, 30)
+        self.sync(first)
+        next_run_time = self.job(first).next_run_time
+
+        renamed = deepcopy(first)
+        renamed.alarm_name = "renamed"
+        self.assertTrue(self.sync(renamed))
+        job = self.job(renamed)
+        self.assertIs(job.args[0], renamed)
+        self.assertEqual(job.next_run_time, next_run_time)
+
+
+class TestNextAlarmIndex(unittest.TestCase):
+    def setUp(self):
+        self.scheduler_service = SchedulerService(event_bus=None)
+
+    def tearDown(self):
+        self.scheduler_service.shutdown()
+
+    def assertIndexMatchesJobs(self):
+        expected = {
+            job.id: job.next_run_time
+            for job in self.scheduler_service.get_jobs(ALARM_STORE)
+            if job.next_run_time is not None
+        }
+        index = self.scheduler_service.next_alarms
+        self.assertEqual(index.next_run_times(), expected)
+        self.assertEqual(
+            index.peek(),
+            min(((t, j) for j, t in expected.items()), default=None),
+        )
+
+    def add(self, alarm_definition: AlarmDefinition):
+        self.scheduler_service.add_cron_job(
+            func=ring,
+            args=(alarm_definition,),
+            job_id=f"{alarm_definition.id}",
+            jobstore=ALARM_STORE,
+            **alarm_definition.get_cron_args(),
+        )
+
+    def test_add(self):
+        for id, hour in ((1, 9), (2, 6), (3, 7)):
+            self.add(alarm(id, hour))
+        self.assertIndexMatchesJobs()
+        self.assertEqual(self.scheduler_service.next_alarms.peek()[1], "2")
+
+    def test_modify(self):
+        self.add(alarm(1, 6))
+        self.add(alarm(2, 7))
+        self.scheduler_service.reschedule_job(
+            job_id="1",
+            jobstore=ALARM_STORE,
+            trigger="cron",
+            **alarm(1, 8).get_cron_args(),
+        )
+        self.assertIndexMatchesJobs()
+        self.assertEqual(self.scheduler_service.next_alarms.peek()[1], "2")
+
+        self.scheduler_service.get_job("2", ALARM_STORE).pause()
+        self.assertIndexMatchesJobs()
+        self.assertEqual(self.scheduler_service.next_alarms.peek()[1], "1")
+
+    def test_remove(self):
+        self.add(alarm(1, 6))
+        self.add(alarm(2, 7))
+        self.scheduler_service.remove_job(job_id="1", jobstore=ALARM_STORE)
+        self.assertIndexMatchesJobs()
+
+        self.scheduler_service.remove_all_jobs(jobstore=ALARM_STORE)
+        self.assertIndexMatchesJobs()
+        self.assertIsNone(self.scheduler_service.next_alarms.peek())
+
+    def test_executed(self):
+        self.add(alarm(1, 6))
+        executed = threading.Event()
+        self.scheduler_service.add_job(
+            func=executed.set,
+            job_id="2",
+            jobstore=ALARM_STORE,
+            trigger="interval",
+            seconds=1,
+        )
+        first_run_time = self.scheduler_service.get_job("2", ALARM_STORE).next_run_time
+        self.assertTrue(executed.wait(timeout=5))
+
+        # the index follows the submission event, which is sent after the job started
+        deadline = time.monotonic() + 2
+        index = self.scheduler_service.next_alarms
+        while index.next_run_times()["2"] == first_run_time:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+        self.assertIndexMatchesJobs()
@@ -0,0 +1,84 @@
+import datetime
+import threading
+import time
+import unittest
+
+from core.infrastructure.tick_service import TickService
+
+START = datetime.datetime(2026, 10, 16, 8, 29, 59, 400000)
+
+
+class FakeClock:
+    """Wall clock that only moves when the test sets it."""
+
+    def __init__(self, now: datetime.datetime):
+        self.now = now
+        self._lock = threading.Lock()
+
+    def __call__(self) -> datetime.datetime:
+        with self._lock:
+            return self.now
+
+    def set(self, now: datetime.datetime):
+        with self._lock:
+            self.now = now
+
+
+class TestTickService(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock(START)
+        self.tick_service = TickService("test", now=self.clock)
+        # recheck the wall clock often, the fake one does not advance on its own
+        self.tick_service.max_sleep = 0.005
+        self.ticks = []
+        self.ticked = threading.Event()
+        self.tick_service.start(self.tick)
+
+    def tearDown(self):
+        self.tick_service.shutdown()
+
+    def tick(self, deadline: datetime.datetime):
+        self.ticks.append((deadline, self.clock()))
+        self.ticked.set()
+
+    def test_ticks_once_the_wall_clock_passes_the_boundary(self):
+        boundary = START.replace(microsecond=0) + datetime.timedelta(seconds=1)
+        self.tick_service.wake_at(boundary)
+
+        # more monotonic time passes than the 0.6 s to the boundary would take
+        self.assertFalse(self.ticked.wait(timeout=0.05))
+        self.clock.set(boundary - datetime.timedelta(microseconds=1))
+        self.assertFalse(self.ticked.wait(timeout=0.05))
+
+        self.clock.set(boundary)
+        self.assertTrue(self.ticked.wait(timeout=1))
+        self.assertEqual(self.ticks, [(boundary, boundary)])
+
+    def test_clock_step_back_delays_the_tick(self):
+        boundary = START + datetime.timedelta(seconds=1)
+        self.tick_service.wake_at(boundary)
+        self.clock.set(START - datetime.timedelta(minutes=5))
+        self.assertFalse(self.ticked.wait(timeout=0.05))
+
+        late = boundary + datetime.timedelta(milliseconds=30)
+        self.clock.set(late)
+        self.assertTrue(self.ticked.wait(timeout=1))
+        # the callback gets the boundary, not the time it ran at
+        self.assertEqual(self.ticks, [(boundary, late)])
+
+    def test_wake_at_replaces_the_pending_deadline(self):
+        later = START + datetime.timedelta(minutes=1)
+        earlier = START + datetime.timedelta(seconds=1)
+        self.tick_service.wake_at(later)
+        self.tick_service.wake_at(earlier)
+        self.clock.set(later)
+        self.assertTrue(self.ticked.wait(timeout=1))
+
+        time.sleep(0.05)
+        self.assertEqual([deadline for deadline, _ in self.ticks], [earlier])
+
+    def test_cancel(self):
+        self.tick_service.wake_at(START + datetime.timedelta(seconds=1))
+        self.tick_service.cancel()
+        self.clock.set(START + datetime.timedelta(minutes=1))
+        self.assertFalse(self.ticked.wait(timeout=0.05))
@@ -0,0 +1,82 @@
+import datetime
+import logging
+import threading
+from typing import Callable
+
+from utils.geolocation import GeoLocation
+from utils.metrics import MetricsRegistry
+
+logger = logging.getLogger("tac.core.infrastructure.tick_service")
+
+
+class TickService:
+    """
+    Calls back at wall clock deadlines, e.g. second and minute boundaries,
+    from a thread of its own.
+
+    The thread sleeps on the monotonic clock, but wakes at least every
+    max_sleep to measure the remaining time against the wall clock again, so
+    that NTP slewing or a clock step does not shift the edge. The callback
+    only runs once now() has passed the deadline, how late is recorded in
+    tac_tick_lateness_seconds.
+    """
+
+    max_sleep = 5.0
+
+    def __init__(self, name: str, now: Callable[[], datetime.datetime] = None):
+        self.name = name
+        self.now = now or GeoLocation().now
+        self._callback: Callable[[datetime.datetime], None] = None
+        self._deadline: datetime.datetime = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread: threading.Thread = None
+        self._lateness = MetricsRegistry().histogram(
+            "tac_tick_lateness_seconds",
+            "Delay between a tick deadline and the call of its callback",
+            tick=name,
+        )
+
+    def start(self, callback: Callable[[datetime.datetime], None]):
+        self._callback = callback
+        self._thread = threading.Thread(
+            target=self._run, name=f"Tick-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def wake_at(self, deadline: datetime.datetime):
+        """Replaces the pending deadline."""
+        with self._condition:
+            self._deadline = deadline
+            self._condition.notify()
+
+    def cancel(self):
+        with self._condition:
+            self._deadline = None
+            self._condition.notify()
+
+    def shutdown(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+                deadline = self._deadline
+                if deadline is None:
+                    self._condition.wait()
+                    continue
+                remaining = (deadline - self.now()).total_seconds()
+                if remaining > 0:
+                    self._condition.wait(min(remaining, self.max_sleep))
+                    continue
+                self._deadline = None
+
+            self._lateness.observe(-remaining)
+            try:
+                self._callback(deadline)
+            except Exception:
+                logger.exception("tick %s failed", self.name)
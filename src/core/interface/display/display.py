@@ -1,7 +1,9 @@
+from __future__ import annotations
 import logging
 import traceback
 import time
-import threading
+from datetime import datetime
+from typing import TYPE_CHECKING
 from luma.core.device import device as luma_device
 from luma.core.device import dummy as luma_dummy
 from luma.core.render import canvas
@@ -22,6 +24,7 @@ from core.domain.events import (
 )
 from core.domain.model import (
     AlarmClockContext,
+    AudioEffect,
     Config,
     DisplayContentProvider,
     PlaybackContent,
@@ -31,11 +34,26 @@ from core.domain.mode_coordinator import ModeName
 from core.interface.display.display_content import DisplayContent
 from core.infrastructure.event_bus import EventBus
 from core.interface.display.format import ColorType, DisplayFormatter
+from core.interface.display.frame_cache import FrameCache
+from core.interface.display.widgets import (
+    AlarmEditScene,
+    AlarmViewScene,
+    DayPickerScene,
+    DefaultDimmedScene,
+    DefaultNormalScene,
+    Group,
+    PropertyEditScene,
+)
 
+from utils.drawing import PresentationFont
 from utils.geolocation import GeoLocation
+from utils.metrics import MetricsRegistry
 
 from resources.resources import display_shot_file
 
+if TYPE_CHECKING:
+    from core.interface.display.render_worker import RenderWorker
+
 logger = logging.getLogger("tac.core.interface.display.display")
 
 
@@ -62,9 +80,6 @@ class Display(DisplayContentProvider):
     device: luma_device
     display_content: DisplayContent
 
-    _last_playback_title: str = None
-    _playback_title_scroll_start_time: float = 0
-
     def __init__(
         self,
         device: luma_device,
@@ -73,6 +88,8 @@ class Display(DisplayContentProvider):
         display_formatter: DisplayFormatter,
         alarm_clock_context: AlarmClockContext,
         event_bus: EventBus = None,
+        frame_cache: FrameCache = None,
+        render_worker: "RenderWorker" = None,
     ) -> None:
         self.device = device
         logger.info("device mode: %s", self.device.mode)
@@ -82,154 +99,94 @@ class Display(DisplayContentProvider):
         self.event_bus = event_bus
         self.formatter = display_formatter
         self.initialize_qt_app()
+        self.formatter.prewarm_fonts()
 
+        # "L" devices take 8-bit grayscale frames, matching the SSD1322's 16 gray
+        # levels without intermediate RGB buffers and conversions
+        self.native_grayscale = self.device.mode == "L"
         self.buffer_image = QtGui.QImage(
-            self.device.width, self.device.height, QtGui.QImage.Format.Format_RGB888
+            self.device.width,
+            self.device.height,
+            (
+                QtGui.QImage.Format.Format_Grayscale8
+                if self.native_grayscale
+                else QtGui.QImage.Format.Format_RGB888
+            ),
         )
 
         self.current_layout_type = None
-        self._refresh_lock = threading.Lock()
+        self._scenes: dict[str, Group] = {}
+        self.frame_cache = frame_cache if frame_cache is not None else FrameCache()
+        self.render_worker = render_worker
+        self._phase_histograms = {
+            phase: MetricsRegistry().histogram(
+                "tac_display_refresh_phase_seconds",
+                "Duration of the phases of a display refresh",
+                phase=phase,
+            )
+            for phase in ("fingerprint", "worker", "paint", "postprocess", "device")
+        }
 
-        self.event_bus.on(StartupFinishedEvent)(self.on_startup_finished)
-        self.event_bus.on(TerminateAppRequest)(lambda _: self.device.hide())
+        if self.event_bus is not None:
+            self.event_bus.on(StartupFinishedEvent)(self.on_startup_finished)
+            self.event_bus.on(TerminateAppRequest)(self.on_terminate)
 
     def on_startup_finished(self, _: StartupFinishedEvent):
         self.event_bus.on(ForcedDisplayUpdateEvent)(self.safe_refresh_display)
 
+    def on_terminate(self, _: TerminateAppRequest):
+        self.device.hide()
+        if self.render_worker is not None:
+            self.render_worker.close()
+
+    def now(self) -> datetime:
+        return GeoLocation().now()
+
+    def current_mode_name(self) -> ModeName:
+        return (
+            self.alarm_clock_context.mode_coordinator.current_mode_name
+            if self.alarm_clock_context.mode_coordinator
+            else ModeName.DEFAULT
+        )
+
     def safe_refresh_display(self, _=None):
-        if not self._refresh_lock.acquire(blocking=False):
-            return
+        # ForcedDisplayUpdateEvent is coalesced by the event bus, refreshes never overlap
         try:
             self.refresh()
         except Exception as e:
             logger.error("%s", traceback.format_exc())
             with canvas(self.device) as draw:
                 draw.text((20, 20), f"exception!\n({e})", fill="white")
-        finally:
-            self._refresh_lock.release()
-
-    def _draw_clock(
-        self,
-        painter,
-        rect,
-        hour_str,
-        min_str,
-        blink_char,
-        show_blink,
-        fg_color,
-        font_obj,
-    ):
-        painter.save()
-        painter.setFont(font_obj)
-        fm = QtGui.QFontMetrics(font_obj)
-
-        overlap = 12
-        vertical_shift = 2
-
-        # Calculate total width
-        total_width = 0
-        for i, char in enumerate(hour_str):
-            total_width += fm.width(char) - (overlap if i < len(hour_str) - 1 else 0)
-        total_width += -15 + fm.width(blink_char) - 10
-        for i, char in enumerate(min_str):
-            total_width += fm.width(char) - (overlap if i < len(min_str) - 1 else 0)
-
-        # Center in rect
-        x = rect.left() + (rect.width() - total_width) // 2
-        base_y = rect.top() + (rect.height() + fm.ascent() - fm.descent()) // 2
-
-        h, s, v, a = fg_color.getHsv()
-        white_color = fg_color
-        gray_color = QtGui.QColor.fromHsv(h, s, max(17, v - 18), a)
-
-        # Draw Hours
-        for i, char in enumerate(hour_str):
-            painter.setPen(white_color if i == 0 else gray_color)
-            y = base_y + (-vertical_shift if i == 0 else vertical_shift)
-            painter.drawText(int(x), int(y), char)
-            x += fm.width(char) - (overlap if i < len(hour_str) - 1 else 0)
-
-        x += -15
-        # Draw Separator
-        if show_blink:
-            painter.setPen(white_color)
-            painter.drawText(int(x), int(base_y), blink_char)
-        x += fm.width(blink_char) - 10
-
-        # Draw Minutes
-        for i, char in enumerate(min_str):
-            painter.setPen(white_color if i == 0 else gray_color)
-            y = base_y + (-vertical_shift if i == 0 else vertical_shift)
-            painter.drawText(int(x), int(y), char)
-            x += fm.width(char) - (overlap if i < len(min_str) - 1 else 0)
-
-        painter.restore()
-
-    def _draw_scrolling_text(
-        self, painter, rect, text, font_obj, color, start_time, speed=30
-    ):
-        painter.save()
-        painter.setFont(font_obj)
-        painter.setPen(color)
-        fm = QtGui.QFontMetrics(font_obj)
-        text_width = fm.width(text)
-        widget_width = rect.width()
-
-        if text_width <= widget_width:
-            painter.drawText(
-                rect,
-                QtCore.Qt.AlignmentFlag.AlignLeft
-                | QtCore.Qt.AlignmentFlag.AlignVCenter,
-                text,
-            )
-        else:
-            self.display_content.is_scrolling = True
-            elapsed = time.time() - start_time
-            pause_duration = 2.0
-            offset = (
-                0 if elapsed < pause_duration else (elapsed - pause_duration) * speed
-            )
-            gap = 30
-            total_cycle_width = text_width + gap
-            current_offset = offset % total_cycle_width
-
-            y = rect.top() + (rect.height() + fm.ascent() - fm.descent()) // 2
-
-            painter.setClipRect(rect)
-
-            x1 = rect.left() - current_offset
-            if x1 + text_width > rect.left():
-                painter.drawText(int(x1), int(y), text)
 
-            x2 = x1 + total_cycle_width
-            if x2 < rect.right():
-                painter.drawText(int(x2), int(y), text)
-
-        painter.restore()
+    def _scene(self, name: str, factory) -> Group:
+        if name not in self._scenes:
+            self._scenes[name] = factory()
+        return self._scenes[name]
 
     def paint(self, painter):
-        mode = (
-            self.alarm_clock_context.mode_coordinator.current_mode_name
-            if self.alarm_clock_context.mode_coordinator
-            else ModeName.DEFAULT
-        )
+        mode = self.current_mode_name()
 
+        scene: Group = None
         if mode == ModeName.DEFAULT:
             if self.formatter.be_gloomy():
-                self._paint_default_dimmed(painter)
+                scene = self._paint_default_dimmed()
             else:
-                self._paint_default_normal(painter)
+                scene = self._paint_default_normal()
         elif mode == ModeName.ALARM_VIEW:
-            self._paint_alarm_view(painter)
+            scene = self._paint_alarm_view()
         elif mode == ModeName.ALARM_EDIT:
-            self._paint_alarm_edit_view(painter)
+            scene = self._paint_alarm_edit_view()
         elif mode == ModeName.PROPERTY_EDIT:
-            self._paint_property_edit_view(painter)
+            scene = self._paint_property_edit_view()
         elif mode == ModeName.DAY_PICKER:
-            self._paint_day_picker_view(painter)
+            scene = self._paint_day_picker_view()
+
+        if scene is not None:
+            scene.paint(painter)
 
-    def _paint_default_dimmed(self, painter):
-        now = GeoLocation().now()
+    def _paint_default_dimmed(self) -> Group:
+        scene: DefaultDimmedScene = self._scene("default_dimmed", DefaultDimmedScene)
+        now = self.now()
         day = now.day
         # Screensaver-like movement to prevent burn-in
         x_offset = (day % 15) * 6 + 10
@@ -238,58 +195,50 @@ class Display(DisplayContentProvider):
         fg_color = QtGui.QColor(
             self.formatter.foreground_color(color_type=ColorType.INHEX)
         )
-        painter.setPen(fg_color)
 
         # Clock
         clock_string = self.formatter.format_dseg7_clock_string(
             now, self.display_content.show_blink_segment
         )
-        font = self.formatter.clock_font(size=18, weight=QtGui.QFont.Weight.Light)
-        painter.setFont(font)
-        painter.drawText(
+        scene.clock.update(
             QtCore.QRect(x_offset, y_offset, 120, 25),
-            QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter,
             clock_string,
+            self.formatter.clock_font(size=18, weight=QtGui.QFont.Weight.Light),
+            fg_color,
         )
 
         # Next Alarm
-        if (
-            self.display_content.has_next_alarm()
-            and self.display_content.next_alarm_info.minutes_until_alarm()
-            <= self.display_content.alarm_clock_context.config.alarm_preview_hours * 60
-        ):
-            alarm_time = self.display_content.get_next_alarm()
-            alarm_text = self.formatter.format_clock_string(alarm_time)
-            alarm_font = self.formatter.info_font(
-                size=12, weight=QtGui.QFont.Weight.Thin
-            )
-            painter.setFont(alarm_font)
-            fm = QtGui.QFontMetrics(alarm_font)
-            icon_w = fm.width("\uf49a") + 10
-            painter.drawText(
-                QtCore.QRect(x_offset + 95, y_offset, icon_w, 25),
-                QtCore.Qt.AlignmentFlag.AlignLeft
-                | QtCore.Qt.AlignmentFlag.AlignVCenter,
-                "\uf49a",
-            )
-            painter.drawText(
-                QtCore.QRect(x_offset + 95 + icon_w, y_offset, 80, 25),
-                QtCore.Qt.AlignmentFlag.AlignLeft
-                | QtCore.Qt.AlignmentFlag.AlignVCenter,
-                alarm_text,
+        alarm_text = None
+        if self.display_content.show_alarm_preview():
+            alarm_text = self.formatter.format_clock_string(
+                self.display_content.get_next_alarm()
             )
+        alarm_font = self.formatter.info_font(size=12, weight=QtGui.QFont.Weight.Thin)
+        icon_w = PresentationFont.get_font_metrics(alarm_font).width("\uf49a") + 10
+        scene.alarm_icon.update(
+            QtCore.QRect(x_offset + 95, y_offset, icon_w, 25),
+            "\uf49a" if alarm_text else None,
+            alarm_font,
+            fg_color,
+        )
+        scene.alarm_time.update(
+            QtCore.QRect(x_offset + 95 + icon_w, y_offset, 80, 25),
+            alarm_text,
+            alarm_font,
+            fg_color,
+        )
 
         # WiFi
-        if not self.display_content.get_is_online():
-            painter.setFont(self.formatter.info_font(size=14))
-            painter.drawText(
-                QtCore.QRect(x_offset + 95, y_offset + 20, 50, 25),
-                QtCore.Qt.AlignmentFlag.AlignLeft
-                | QtCore.Qt.AlignmentFlag.AlignVCenter,
-                "\U000f05aa",
-            )
+        scene.offline_icon.update(
+            QtCore.QRect(x_offset + 95, y_offset + 20, 50, 25),
+            "\U000f05aa" if not self.display_content.get_is_online() else None,
+            self.formatter.info_font(size=14),
+            fg_color,
+        )
+        return scene
 
-    def _paint_default_normal(self, painter):
+    def _paint_default_normal(self) -> Group:
+        scene: DefaultNormalScene = self._scene("default_normal", DefaultNormalScene)
         fg_color = QtGui.QColor(
             self.formatter.foreground_color(color_type=ColorType.INHEX)
         )
@@ -298,10 +247,9 @@ class Display(DisplayContentProvider):
         fmt = self.alarm_clock_context.config.clock_format_string
         parts = fmt.split("<blinkSegment>")
         hour_fmt, min_fmt = (parts[0], parts[1]) if len(parts) == 2 else ("%H", "%M")
-        now = GeoLocation().now()
+        now = self.now()
 
-        self._draw_clock(
-            painter,
+        scene.clock.update(
             QtCore.QRect(0, 0, 155, self.device.height),
             now.strftime(hour_fmt),
             now.strftime(min_fmt),
@@ -312,12 +260,14 @@ class Display(DisplayContentProvider):
         )
 
         # Vertical Line
-        painter.setPen(QtGui.QPen(fg_color, 1))
-        painter.drawLine(160, 0, 160, self.device.height - 0)
+        scene.separator_line.update(
+            QtCore.QRect(160, 0, 1, self.device.height), fg_color
+        )
 
         # Info Stack
         x_info = 170
         item_height = 22
+        info_font = self.formatter.info_font(size=12)
 
         # Gather items to display
         items = []
@@ -329,11 +279,7 @@ class Display(DisplayContentProvider):
         if playback_title:
             items.append(("playback", playback_title))
 
-        if (
-            self.display_content.has_next_alarm()
-            and self.display_content.next_alarm_info.minutes_until_alarm()
-            <= self.display_content.alarm_clock_context.config.alarm_preview_hours * 60
-        ):
+        if self.display_content.show_alarm_preview():
             items.append(("alarm", self.display_content.get_next_alarm()))
 
         if self.display_content.show_volume_meter:
@@ -342,118 +288,82 @@ class Display(DisplayContentProvider):
         if len(items) > 3:
             items = items[1:]
 
-        if items:
-            total_stack_height = len(items) * item_height
-            start_y = (self.device.height - total_stack_height) // 2
+        scene.info_stack.children.clear()
+        total_stack_height = len(items) * item_height
+        start_y = (self.device.height - total_stack_height) // 2
 
-            for i, (item_type, data) in enumerate(items):
-                rect = QtCore.QRect(
-                    x_info,
-                    start_y + i * item_height,
-                    self.device.width - x_info,
-                    item_height,
+        for i, (item_type, data) in enumerate(items):
+            rect = QtCore.QRect(
+                x_info,
+                start_y + i * item_height,
+                self.device.width - x_info,
+                item_height,
+            )
+
+            if item_type == "weather":
+                row = scene.weather_row.update(
+                    rect,
+                    data.code.to_character() if data.code else None,
+                    self.formatter.weather_font(size=13),
+                    f"{data.temperature:.1f}°C",
+                    info_font,
+                    fg_color,
                 )
 
-                if item_type == "weather":
-                    symbol = data.code.to_character() if data.code else None
-                    if symbol:
-                        painter.setFont(self.formatter.weather_font(size=13))
-                        painter.drawText(
-                            rect,
-                            QtCore.Qt.AlignmentFlag.AlignLeft
-                            | QtCore.Qt.AlignmentFlag.AlignVCenter,
-                            symbol,
-                        )
-                        temp_rect = rect.adjusted(22, 0, 0, 0)
-                    else:
-                        temp_rect = rect
-
-                    painter.setFont(self.formatter.info_font(size=12))
-                    painter.drawText(
-                        temp_rect,
-                        QtCore.Qt.AlignmentFlag.AlignLeft
-                        | QtCore.Qt.AlignmentFlag.AlignVCenter,
-                        f"{data.temperature:.1f}°C",
-                    )
-
-                elif item_type == "playback":
-                    if data != self._last_playback_title:
-                        self._last_playback_title = data
-                        self._playback_title_scroll_start_time = time.time()
-
-                    painter.setFont(self.formatter.info_font(size=12))
-                    painter.drawText(
-                        rect,
-                        QtCore.Qt.AlignmentFlag.AlignLeft
-                        | QtCore.Qt.AlignmentFlag.AlignVCenter,
-                        "\uf2eb",
-                    )
-
-                    self._draw_scrolling_text(
-                        painter,
-                        rect.adjusted(20, 0, -5, 0),
-                        data,
-                        self.formatter.info_font(size=12),
-                        fg_color,
-                        self._playback_title_scroll_start_time,
-                    )
-
-                elif item_type == "alarm":
-                    painter.setFont(self.formatter.info_font(size=12))
-                    painter.drawText(
-                        rect,
-                        QtCore.Qt.AlignmentFlag.AlignLeft
-                        | QtCore.Qt.AlignmentFlag.AlignVCenter,
-                        f"\uf49a {data.strftime('%H:%M')}",
-                    )
-
-                elif item_type == "volume":
-                    painter.setFont(self.formatter.info_font(size=12))
-                    painter.drawText(
-                        rect,
-                        QtCore.Qt.AlignmentFlag.AlignLeft
-                        | QtCore.Qt.AlignmentFlag.AlignVCenter,
-                        f"Vol: {int(data * 100)}%",
-                    )
-
-    def _paint_alarm_view(self, painter):
+            elif item_type == "playback":
+                row = scene.playback_row.update(rect, data, info_font, fg_color)
+                self.display_content.is_scrolling = row.title.is_moving
+                self.display_content.scroll_resumes_at = row.title.moves_at
+
+            elif item_type == "alarm":
+                row = scene.alarm_row.update(
+                    rect, f"\uf49a {data.strftime('%H:%M')}", info_font, fg_color
+                )
+
+            elif item_type == "volume":
+                row = scene.volume_row.update(
+                    rect, f"Vol: {int(data * 100)}%", info_font, fg_color
+                )
+
+            scene.info_stack.add(row)
+        return scene
+
+    def _paint_alarm_view(self) -> Group:
         coordinator = self.alarm_clock_context.mode_coordinator
         service = coordinator.editing_service
         if not service:
-            return
+            return None
 
+        scene: AlarmViewScene = self._scene("alarm_view", AlarmViewScene)
         alarm = service.current_alarm
         fg_color = QtGui.QColor(
             self.formatter.foreground_color(color_type=ColorType.INHEX)
         )
-        painter.setPen(fg_color)
 
         # Header
         index = service.current_alarm_index + 1
         total = len(self.alarm_clock_context.config.alarm_definitions) + 1
-        painter.setFont(self.formatter.info_font(size=10))
-        painter.drawText(
+        scene.header.update(
             QtCore.QRect(10, 5, self.device.width - 20, 15),
-            QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter,
             f"ALARM {index}/{total}",
+            self.formatter.info_font(size=10),
+            fg_color,
         )
 
         # Time
-        time_str = f"{alarm.hour:02d}:{alarm.min:02d}"
-        painter.setFont(self.formatter.info_font(size=32))
-        painter.drawText(
+        scene.time.update(
             QtCore.QRect(10, 20, 150, 40),
-            QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter,
-            time_str,
+            f"{alarm.hour:02d}:{alarm.min:02d}",
+            self.formatter.info_font(size=32),
+            fg_color,
         )
 
         # Status
-        status_icon = "\uf205" if alarm.is_active else "\uf204"
-        painter.setFont(self.formatter.info_font(size=15))
-        painter.drawText(
+        scene.status.update(
             QtCore.QRect(self.device.width - 60, 15, 40, 30),
-            QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter,
-            status_icon,
+            "\uf205" if alarm.is_active else "\uf204",
+            self.formatter.info_font(size=15),
+            fg_color,
         )
 
         # Days
@@ -465,24 +375,25 @@ class Display(DisplayContentProvider):
                     days_str = days_str[:12] + "..."
             except:
                 days_str = "Invalid"
-        painter.setFont(self.formatter.info_font(size=12))
-        painter.drawText(
+        scene.days.update(
             QtCore.QRect(self.device.width - 110, 45, 100, 20),
-            QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignBottom,
             days_str,
+            self.formatter.info_font(size=12),
+            fg_color,
         )
+        return scene
 
-    def _paint_alarm_edit_view(self, painter):
+    def _paint_alarm_edit_view(self) -> Group:
         coordinator = self.alarm_clock_context.mode_coordinator
         service = coordinator.editing_service
         if not service or not service.editing_session:
-            return
+            return None
 
+        scene: AlarmEditScene = self._scene("alarm_edit", AlarmEditScene)
         current_prop = service.property_to_edit
         fg_color = QtGui.QColor(
             self.formatter.foreground_color(color_type=ColorType.INHEX)
         )
-        painter.setPen(fg_color)
 
         # Property Name
         prop_font_size = 18
@@ -495,14 +406,15 @@ class Display(DisplayContentProvider):
         if len(prop_name) > 15:
             prop_font_size = 15
 
-        painter.setFont(self.formatter.info_font(size=prop_font_size))
-        painter.drawText(
+        scene.property_name.update(
             QtCore.QRect(0, 10, self.device.width, 25),
-            QtCore.Qt.AlignmentFlag.AlignCenter,
             prop_name,
+            self.formatter.info_font(size=prop_font_size),
+            fg_color,
         )
 
         # Current Value Preview
+        val_str = None
         if isinstance(current_prop, AlarmProperty):
             val = service.editing_session.get_current_value()
             val_str = str(val)
@@ -517,25 +429,26 @@ class Display(DisplayContentProvider):
             elif current_prop == AlarmProperty.VISUAL_EFFECT:
                 val_str = "yes" if val else "no"
 
-            painter.setFont(self.formatter.info_font(size=12))
-            painter.drawText(
-                QtCore.QRect(0, 35, self.device.width, 20),
-                QtCore.Qt.AlignmentFlag.AlignCenter,
-                val_str,
-            )
+        scene.value.update(
+            QtCore.QRect(0, 35, self.device.width, 20),
+            val_str,
+            self.formatter.info_font(size=12),
+            fg_color,
+        )
+        return scene
 
-    def _paint_property_edit_view(self, painter):
+    def _paint_property_edit_view(self) -> Group:
         coordinator = self.alarm_clock_context.mode_coordinator
         service = coordinator.editing_service
         if not service or not service.editing_session:
-            return
+            return None
 
+        scene: PropertyEditScene = self._scene("property_edit", PropertyEditScene)
         current_prop = service.property_to_edit
         current_val = service.editing_session.get_current_value()
         fg_color = QtGui.QColor(
             self.formatter.foreground_color(color_type=ColorType.INHEX)
         )
-        painter.setPen(fg_color)
 
         # Property Name
         prop_name = (
@@ -543,11 +456,11 @@ class Display(DisplayContentProvider):
             if isinstance(current_prop, AlarmProperty)
             else ""
         )
-        painter.setFont(self.formatter.info_font(size=10))
-        painter.drawText(
+        scene.header.update(
             QtCore.QRect(0, 5, self.device.width, 15),
-            QtCore.Qt.AlignmentFlag.AlignCenter,
             f"SET {prop_name}",
+            self.formatter.info_font(size=10),
+            fg_color,
         )
 
         # Value with arrows
@@ -570,114 +483,73 @@ class Display(DisplayContentProvider):
         elif current_prop == AlarmProperty.VISUAL_EFFECT:
             val_str = "yes" if current_val else "no"
 
-        painter.setFont(self.formatter.info_font(size=16))
-        painter.drawText(
-            QtCore.QRect(10, 25, 30, 35),
-            QtCore.Qt.AlignmentFlag.AlignCenter,
-            "\uf053",
-        )  # Left
-        painter.drawText(
-            QtCore.QRect(self.device.width - 40, 25, 30, 35),
-            QtCore.Qt.AlignmentFlag.AlignCenter,
-            "\uf054",
-        )  # Right
-
-        painter.setFont(self.formatter.info_font(size=val_font_size))
-        painter.drawText(
-            QtCore.QRect(40, 25, self.device.width - 80, 35),
-            QtCore.Qt.AlignmentFlag.AlignCenter,
+        scene.picker.update(
+            QtCore.QRect(10, 25, self.device.width - 20, 35),
             val_str,
+            self.formatter.info_font(size=16),
+            self.formatter.info_font(size=val_font_size),
+            fg_color,
         )
+        return scene
 
-    def _paint_day_picker_view(self, painter):
+    def _paint_day_picker_view(self) -> Group:
         coordinator = self.alarm_clock_context.mode_coordinator
         service = coordinator.editing_service
         if not service or not service.editing_session:
-            return
+            return None
 
         day_picker = service.editing_session.day_picker_session
         if not day_picker:
-            return
+            return None
+
+        # Day cells + OK: 8 items across the display width
+        items = [d.name[:2] for d in DayPickerSession.DAYS] + ["OK"]
+        scene: DayPickerScene = self._scene(
+            "day_picker", lambda: DayPickerScene(len(items))
+        )
 
         fg_color = QtGui.QColor(
             self.formatter.foreground_color(color_type=ColorType.INHEX)
         )
-        painter.setPen(fg_color)
+        bg_color = QtGui.QColor(
+            self.formatter.background_color(color_type=ColorType.INHEX)
+        )
 
         # Header
-        painter.setFont(self.formatter.info_font(size=10))
-        painter.drawText(
+        scene.header.update(
             QtCore.QRect(0, 2, self.device.width, 14),
-            QtCore.Qt.AlignmentFlag.AlignCenter,
             "SELECT DAYS",
+            self.formatter.info_font(size=10),
+            fg_color,
         )
 
-        # Day cells + OK: 8 items across the display width
-        items = [d.name[:2] for d in DayPickerSession.DAYS] + ["OK"]
         cell_width = self.device.width // len(items)
         cell_top = 16
         cell_height = self.device.height - cell_top
 
         for i, label in enumerate(items):
-            x = i * cell_width
-            cell_rect = QtCore.QRect(x, cell_top, cell_width, cell_height)
-
-            is_cursor = day_picker.cursor == i
             is_ok = i == DayPickerSession.OK_INDEX
-            is_active = (
-                not is_ok and DayPickerSession.DAYS[i].name in day_picker.active_days
-            )
-
-            # Highlight cursor position
-            if is_cursor:
-                painter.fillRect(
-                    cell_rect,
-                    QtGui.QColor(
-                        self.formatter.foreground_color(color_type=ColorType.INHEX)
-                    ),
-                )
-                text_color = QtGui.QColor(
-                    self.formatter.background_color(color_type=ColorType.INHEX)
-                )
-            else:
-                text_color = fg_color
-
-            painter.setPen(text_color)
-
-            # Active indicator: toggle icon (fa-toggle-on/off) rotated 90° → vertical
-            if not is_ok:
-                toggle_char = "\uf204" if is_active else "\uf205"
-                painter.save()
-                painter.setFont(self.formatter.info_font(size=14))
-                painter.setPen(text_color)
-                cx = x + cell_width // 2
-                cy = cell_top + 13
-                painter.translate(cx, cy)
-                painter.rotate(90)
-                painter.drawText(
-                    QtCore.QRect(-13, -14, 26, 26),
-                    QtCore.Qt.AlignmentFlag.AlignCenter,
-                    toggle_char,
-                )
-                painter.restore()
-
-            # Day abbreviation (below the symbol)
-            painter.setPen(text_color)
-            painter.setFont(self.formatter.info_font(size=10))
-            painter.drawText(
-                QtCore.QRect(x, cell_top + 32, cell_width, 14),
-                QtCore.Qt.AlignmentFlag.AlignCenter,
+            scene.cells[i].update(
+                QtCore.QRect(i * cell_width, cell_top, cell_width, cell_height),
                 label,
+                is_cursor=day_picker.cursor == i,
+                is_active=(
+                    not is_ok
+                    and DayPickerSession.DAYS[i].name in day_picker.active_days
+                ),
+                is_ok=is_ok,
+                colors=(fg_color, bg_color),
+                icon_font=self.formatter.info_font(size=14),
+                label_font=self.formatter.info_font(size=10),
             )
-
-            painter.setPen(fg_color)
+        return scene
 
     def _format_date(self, d) -> str:
         from datetime import timedelta
 
         if d is None:
             return "None"
-        today = GeoLocation().now().date()
+        today = self.now().date()
         if d == today:
             return "today"
         if d == today + timedelta(days=1):
@@ -695,11 +567,130 @@ class Display(DisplayContentProvider):
         stride = self.buffer_image.bytesPerLine()
         ptr = self.buffer_image.bits()
         ptr.setsize(self.buffer_image.byteCount())
-        return Image.frombytes("RGB", (width, height), ptr, "raw", "RGB", stride, 1)
+        mode = "L" if self.native_grayscale else "RGB"
+        return Image.frombytes(mode, (width, height), ptr, "raw", mode, stride, 1)
+
+    def _value_fingerprint(self, value):
+        if value is None or isinstance(value, (int, float, str)):
+            return value
+        if isinstance(value, list):
+            return tuple(value)
+        if isinstance(value, AudioEffect):
+            return value.title()
+        return str(value)
+
+    def _editor_fingerprint(self, mode: ModeName) -> tuple:
+        if mode == ModeName.DEFAULT:
+            return None
+        service = self.alarm_clock_context.mode_coordinator.editing_service
+        if not service:
+            return None
+
+        alarm = service.current_alarm
+        alarm_state = (
+            service.current_alarm_index,
+            len(self.alarm_clock_context.config.alarm_definitions),
+            alarm.id,
+            alarm.hour,
+            alarm.min,
+            alarm.is_active,
+            tuple(alarm.recurring) if alarm.recurring else None,
+            alarm.onetime,
+        )
+        session = service.editing_session
+        if not session:
+            return (alarm_state,)
+
+        day_picker = session.day_picker_session
+        return (
+            alarm_state,
+            service.property_to_edit,
+            self._value_fingerprint(session.get_current_value()),
+            (
+                (day_picker.cursor, frozenset(day_picker.active_days))
+                if day_picker
+                else None
+            ),
+        )
+
+    def frame_fingerprint(self) -> tuple:
+        """
+        Canonical key of everything a refresh reads. Two refreshes with equal
+        fingerprints produce byte-identical frames.
+        """
+        mode = self.current_mode_name()
+        weather = self.display_content.current_weather
+        next_alarm = (
+            self.display_content.get_next_alarm()
+            if self.display_content.show_alarm_preview()
+            else None
+        )
+        config = self.alarm_clock_context.config
+        return (
+            mode,
+            # every config transaction bumps the version, the clock format is
+            # also set directly, e.g. by the render worker
+            config.version,
+            config.clock_format_string,
+            config.blink_segment,
+            self.formatter.be_gloomy(),
+            self.now().strftime("%Y-%m-%d %H:%M"),
+            self.display_content.show_blink_segment,
+            self.formatter.foreground_color(color_type=ColorType.IN16),
+            self.formatter.background_color(color_type=ColorType.IN16),
+            (
+                (weather.code.code if weather.code else None, weather.temperature)
+                if weather
+                else None
+            ),
+            self.display_content.current_playback_title(),
+            next_alarm,
+            (
+                self.display_content.current_volume()
+                if self.display_content.show_volume_meter
+                else None
+            ),
+            self.display_content.get_is_online(),
+            self._editor_fingerprint(mode),
+        )
 
     def refresh(self):
         self.formatter.update_formatter()
+        was_scrolling = self.display_content.scroll_due()
+
+        fingerprint = None
+        if not was_scrolling:
+            start = time.perf_counter()
+            fingerprint = self.frame_fingerprint()
+            cached_frame = self.frame_cache.get(fingerprint)
+            self._phase_histograms["fingerprint"].observe(time.perf_counter() - start)
+            if cached_frame is not None:
+                self.current_display_image = cached_frame
+                self._show_current_display_image()
+                return
+
+        frame = None
+        if (
+            self.render_worker is not None
+            and self.current_mode_name() == ModeName.DEFAULT
+        ):
+            start = time.perf_counter()
+            frame = self.render_worker.render(self)
+            if frame is not None:
+                self._phase_histograms["worker"].observe(time.perf_counter() - start)
+        if frame is None:
+            frame = self.render_frame()
+
+        self.current_display_image = frame
+        if fingerprint is not None and not self.display_content.is_scrolling:
+            self.frame_cache.put(fingerprint, self.current_display_image)
+
+        self._show_current_display_image()
+
+    def render_frame(self) -> Image.Image:
         self.display_content.is_scrolling = False
+        self.display_content.scroll_resumes_at = None
+        start = time.perf_counter()
 
         bg_color = QtGui.QColor(
             self.formatter.background_color(color_type=ColorType.INHEX)
@@ -712,10 +703,15 @@ class Display(DisplayContentProvider):
 
         self.paint(painter)
         painter.end()
+        painted = time.perf_counter()
+        self._phase_histograms["paint"].observe(painted - start)
 
-        self.current_display_image = self.formatter.postprocess_image(
-            self.grab_widget_image()
-        )
+        frame = self.formatter.postprocess_image(self.grab_widget_image())
+        self._phase_histograms["postprocess"].observe(time.perf_counter() - painted)
+        return frame
+
+    def _show_current_display_image(self):
+        start = time.perf_counter()
         try:
             self.device.display(self.current_display_image)
             if isinstance(self.device, luma_dummy):
@@ -725,6 +721,7 @@ class Display(DisplayContentProvider):
                 )
         except AssertionError:
             pass
+        self._phase_histograms["device"].observe(time.perf_counter() - start)
 
 
 if __name__ == "__main__":
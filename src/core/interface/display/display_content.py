@@ -1,5 +1,6 @@
 from __future__ import annotations
 from datetime import datetime
+import time
 from typing import TYPE_CHECKING
 
 
@@ -34,7 +35,10 @@ class DisplayContent:
     next_alarm_info: NextAlarmInfo = None
     show_blink_segment: bool = True
     room_brightness: RoomBrightness = None
+    # text moves, frames differ at the frame rate
     is_scrolling: bool = False
+    # monotonic time at which paused scrolling text moves again
+    scroll_resumes_at: float = None
     refresh_duration_in_ms: int = None
     current_weather: Weather = None
 
@@ -102,11 +106,18 @@ class DisplayContent:
                     self.room_brightness = room_brightness
                     changed = True
 
-            if self.is_scrolling:
+            if self.scroll_due():
                 changed = True
 
         return changed
 
+    def scroll_due(self) -> bool:
+        """Whether scrolling text moves, or is about to, so every frame differs."""
+        return self.is_scrolling or (
+            self.scroll_resumes_at is not None
+            and time.monotonic() >= self.scroll_resumes_at
+        )
+
     # ========== Alarm Information (Domain Delegation) ==========
 
     def has_next_alarm(self) -> bool:
@@ -30,6 +30,18 @@ class DisplayFormatter:
 
     _visual_effect_active: bool = False
 
+    # (size, weight) of every clock and info font the display layouts use
+    layout_font_sizes = [
+        (42, QtGui.QFont.Weight.Bold),
+        (18, QtGui.QFont.Weight.Light),
+        (12, QtGui.QFont.Weight.Thin),
+        *(
+            (size, QtGui.QFont.Weight.Normal)
+            for size in (8, 10, 12, 14, 15, 16, 18, 32)
+        ),
+    ]
+    weather_font_sizes = [(13, QtGui.QFont.Weight.Normal)]
+
     def __init__(self, content: DisplayContent, alarm_clock_context: AlarmClockContext):
         self.display_content = content
         self.alarm_clock_context = alarm_clock_context
@@ -55,6 +67,25 @@ class DisplayFormatter:
             PresentationFont.weather_font, size, weight
         )
 
+    def prewarm_fonts(self):
+        """Loads all layout fonts with their metrics, for the normal and the gloomy look."""
+        fonts = [
+            (font_path, size, weight)
+            for font_path in (
+                PresentationFont.roboto_font,
+                PresentationFont.light_clock_font,
+            )
+            for size, weight in self.layout_font_sizes
+        ] + [
+            (PresentationFont.weather_font, size, weight)
+            for size, weight in self.weather_font_sizes
+        ]
+        for font_path, size, weight in fonts:
+            PresentationFont.get_font_metrics(
+                PresentationFont.get_font_family(font_path, size, weight)
+            )
+        logger.info("prewarmed %s fonts", len(fonts))
+
     def be_gloomy(self):
         is_visual_effect_active = (
             True
@@ -0,0 +1,50 @@
+import threading
+from collections import OrderedDict
+from typing import Hashable
+
+from PIL import Image
+
+
+class FrameCache:
+    """Bounded LRU of final, post-processed frames keyed by a display state fingerprint."""
+
+    def __init__(self, max_size: int = 32):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._frames: OrderedDict[Hashable, Image.Image] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: Hashable) -> Image.Image:
+        with self._lock:
+            frame = self._frames.get(fingerprint)
+            if frame is None:
+                self.misses += 1
+                return None
+            self._frames.move_to_end(fingerprint)
+            self.hits += 1
+            return frame
+
+    def put(self, fingerprint: Hashable, frame: Image.Image):
+        with self._lock:
+            self._frames[fingerprint] = frame
+            self._frames.move_to_end(fingerprint)
+            while len(self._frames) > self.max_size:
+                self._frames.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    def stats(self) -> dict:
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            hit_ratio=round(self.hit_ratio(), 3),
+            size=len(self._frames),
+            max_size=self.max_size,
+        )
@@ -0,0 +1,199 @@
+import logging
+import threading
+from typing import Dict, Tuple
+
+from PyQt5 import QtCore, QtGui
+
+from utils.drawing import PresentationFont
+from utils.singleton import singleton
+
+logger = logging.getLogger("tac.core.interface.display.glyph_atlas")
+
+
+def gray_level(color: QtGui.QColor) -> int:
+    """Quantizes a color to the 16 gray levels the SSD1322 can show."""
+    return max(0, min(15, round(QtGui.qGray(color.rgb()) / 17)))
+
+
+class Glyph:
+    """Atlas slot of a rasterized glyph, positioned relative to the pen on the baseline."""
+
+    __slots__ = ("source", "offset_x", "offset_y", "advance")
+
+    def __init__(
+        self, source: QtCore.QRect, offset_x: int, offset_y: int, advance: int
+    ):
+        self.source = source
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.advance = advance
+
+
+@singleton
+class GlyphAtlas:
+    """
+    Shared glyph cache: each glyph is rasterized once per (font, gray level)
+    into a single atlas image, packed in shelves. Advance widths and font
+    metrics are computed once alongside.
+    """
+
+    padding = 1
+    width = 512
+    max_height = 2048
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._glyphs: Dict[Tuple[str, int, str], Glyph] = {}
+        self.image = self._new_image(128)
+        self._shelf_x = 0
+        self._shelf_y = 0
+        self._shelf_height = 0
+
+    def _new_image(self, height: int) -> QtGui.QImage:
+        image = QtGui.QImage(
+            self.width, height, QtGui.QImage.Format.Format_ARGB32_Premultiplied
+        )
+        image.fill(QtCore.Qt.GlobalColor.transparent)
+        return image
+
+    def metrics(self, font: QtGui.QFont) -> QtGui.QFontMetrics:
+        return PresentationFont.get_font_metrics(font)
+
+    def glyph(self, font: QtGui.QFont, level: int, char: str) -> Glyph:
+        key = (font.key(), level, char)
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            with self._lock:
+                glyph = self._glyphs.get(key)
+                if glyph is None:
+                    glyph = self._rasterize(font, level, char)
+                    self._glyphs[key] = glyph
+        return glyph
+
+    def text_width(self, font: QtGui.QFont, text: str) -> int:
+        fm = self.metrics(font)
+        return sum(fm.width(char) for char in text)
+
+    def _allocate(self, w: int, h: int) -> QtCore.QPoint:
+        if self._shelf_x + w > self.width:
+            self._shelf_y += self._shelf_height
+            self._shelf_x = 0
+            self._shelf_height = 0
+
+        if self._shelf_y + h > self.image.height():
+            new_height = self.image.height() * 2
+            while self._shelf_y + h > new_height:
+                new_height *= 2
+            if new_height > self.max_height:
+                logger.warning("glyph atlas full, starting over")
+                self._glyphs.clear()
+                self.image = self._new_image(self.image.height())
+                self._shelf_x = self._shelf_y = self._shelf_height = 0
+                return self._allocate(w, h)
+            grown = self._new_image(new_height)
+            painter = QtGui.QPainter(grown)
+            painter.drawImage(0, 0, self.image)
+            painter.end()
+            self.image = grown
+            logger.debug("glyph atlas grown to %sx%s", self.width, new_height)
+
+        position = QtCore.QPoint(self._shelf_x, self._shelf_y)
+        self._shelf_x += w
+        self._shelf_height = max(self._shelf_height, h)
+        return position
+
+    def _rasterize(self, font: QtGui.QFont, level: int, char: str) -> Glyph:
+        fm = self.metrics(font)
+        bounds = fm.boundingRect(char)
+        pad = self.padding
+        w = max(1, bounds.width() + 2 * pad)
+        h = max(1, bounds.height() + 2 * pad)
+        position = self._allocate(w, h)
+
+        gray = round(level * 17)
+        painter = QtGui.QPainter(self.image)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setRenderHint(QtGui.QPainter.TextAntialiasing)
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+        painter.fillRect(
+            QtCore.QRect(position, QtCore.QSize(w, h)),
+            QtCore.Qt.GlobalColor.transparent,
+        )
+        painter.setCompositionMode(QtGui.QPainter.CompositionMode_SourceOver)
+        painter.setFont(font)
+        painter.setPen(QtGui.QColor(gray, gray, gray))
+        painter.drawText(
+            position.x() - bounds.left() + pad,
+            position.y() - bounds.top() + pad,
+            char,
+        )
+        painter.end()
+
+        return Glyph(
+            QtCore.QRect(position, QtCore.QSize(w, h)),
+            bounds.left() - pad,
+            bounds.top() - pad,
+            fm.width(char),
+        )
+
+
+class GlyphBlitter:
+    """Lays out strings from the glyph atlas and blits them, glyph by glyph."""
+
+    def __init__(self, atlas: GlyphAtlas = None):
+        self._atlas = atlas
+
+    @property
+    def atlas(self) -> GlyphAtlas:
+        # resolved lazily, the atlas must not be created before the Qt application
+        if self._atlas is None:
+            self._atlas = GlyphAtlas()
+        return self._atlas
+
+    def draw_text(
+        self,
+        painter: QtGui.QPainter,
+        x: int,
+        baseline: int,
+        text: str,
+        font: QtGui.QFont,
+        color: QtGui.QColor,
+    ) -> int:
+        """Draws text with its pen starting at (x, baseline); returns the pen x after it."""
+        level = gray_level(color)
+        atlas = self.atlas
+        for char in text:
+            glyph = atlas.glyph(font, level, char)
+            painter.drawImage(
+                QtCore.QPoint(int(x) + glyph.offset_x, int(baseline) + glyph.offset_y),
+                atlas.image,
+                glyph.source,
+            )
+            x += glyph.advance
+        return x
+
+    def draw_text_in_rect(
+        self,
+        painter: QtGui.QPainter,
+        rect: QtCore.QRect,
+        alignment,
+        text: str,
+        font: QtGui.QFont,
+        color: QtGui.QColor,
+    ):
+        fm = self.atlas.metrics(font)
+        width = self.atlas.text_width(font, text)
+
+        x = rect.left()
+        if alignment & QtCore.Qt.AlignmentFlag.AlignRight:
+            x = rect.left() + rect.width() - width
+        elif alignment & QtCore.Qt.AlignmentFlag.AlignHCenter:
+            x = rect.left() + (rect.width() - width) // 2
+
+        baseline = rect.top() + fm.ascent()
+        if alignment & QtCore.Qt.AlignmentFlag.AlignBottom:
+            baseline = rect.top() + rect.height() - fm.descent()
+        elif alignment & QtCore.Qt.AlignmentFlag.AlignVCenter:
+            baseline = rect.top() + (rect.height() + fm.ascent() - fm.descent()) // 2
+
+        self.draw_text(painter, x, baseline, text, font, color)
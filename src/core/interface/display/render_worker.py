@@ -0,0 +1,280 @@
+import logging
+import multiprocessing
+import threading
+import traceback
+from dataclasses import dataclass
+from datetime import datetime
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+
+from luma.core.device import dummy
+from PIL import Image
+
+from core.domain.model import Config
+from core.interface.display.display import Display
+from core.interface.display.format import ColorType, DisplayFormatter
+from utils.geolocation import Weather
+
+logger = logging.getLogger("tac.core.interface.display.render_worker")
+
+
+@dataclass(frozen=True)
+class DisplaySnapshot:
+    """Everything the default screens read, in a form that pickles cheaply."""
+
+    now: datetime
+    be_gloomy: bool
+    foreground_grayscale_16: int
+    background_grayscale_16: int
+    show_blink_segment: bool
+    clock_format_string: str
+    blink_segment: str
+    weather_code: int
+    weather_temperature: float
+    playback_title: str
+    next_alarm: datetime
+    volume: float
+    is_online: bool
+
+    @staticmethod
+    def capture(display: Display) -> "DisplaySnapshot":
+        content = display.display_content
+        formatter = display.formatter
+        config = display.alarm_clock_context.config
+        weather = content.current_weather
+        return DisplaySnapshot(
+            now=display.now(),
+            be_gloomy=formatter.be_gloomy(),
+            foreground_grayscale_16=formatter.foreground_color(
+                color_type=ColorType.IN16
+            ),
+            background_grayscale_16=formatter.background_color(
+                color_type=ColorType.IN16
+            ),
+            show_blink_segment=content.show_blink_segment,
+            clock_format_string=config.clock_format_string,
+            blink_segment=config.blink_segment,
+            weather_code=weather.code.code if weather and weather.code else None,
+            weather_temperature=weather.temperature if weather else None,
+            playback_title=content.current_playback_title(),
+            next_alarm=(
+                content.get_next_alarm() if content.show_alarm_preview() else None
+            ),
+            volume=content.current_volume() if content.show_volume_meter else None,
+            is_online=content.get_is_online(),
+        )
+
+
+class SnapshotDisplayContent:
+    """Read-only stand-in for DisplayContent, answering from a snapshot."""
+
+    def __init__(self, alarm_clock_context: "SnapshotContext"):
+        self.alarm_clock_context = alarm_clock_context
+        self.snapshot: DisplaySnapshot = None
+        self.is_scrolling = False
+        self.scroll_resumes_at: float = None
+
+    @property
+    def show_blink_segment(self) -> bool:
+        return self.snapshot.show_blink_segment
+
+    @property
+    def show_volume_meter(self) -> bool:
+        return self.snapshot.volume is not None
+
+    @property
+    def current_weather(self) -> Weather:
+        if self.snapshot.weather_temperature is None:
+            return None
+        return Weather(self.snapshot.weather_code, self.snapshot.weather_temperature)
+
+    def has_next_alarm(self) -> bool:
+        return self.snapshot.next_alarm is not None
+
+    def show_alarm_preview(self) -> bool:
+        return self.snapshot.next_alarm is not None
+
+    def get_next_alarm(self) -> datetime:
+        return self.snapshot.next_alarm
+
+    def get_is_online(self) -> bool:
+        return self.snapshot.is_online
+
+    def current_playback_title(self) -> str:
+        return self.snapshot.playback_title
+
+    def current_volume(self) -> float:
+        return self.snapshot.volume
+
+
+class SnapshotFormatter(DisplayFormatter):
+
+    def apply(self, snapshot: DisplaySnapshot):
+        self._foreground_grayscale_16 = snapshot.foreground_grayscale_16
+        self._background_grayscale_16 = snapshot.background_grayscale_16
+
+    def be_gloomy(self):
+        return self.display_content.snapshot.be_gloomy
+
+
+class SnapshotContext:
+    mode_coordinator = None
+
+    def __init__(self):
+        self.config = Config()
+
+
+class SnapshotDisplay(Display):
+    """Display of the render worker: paints snapshots, owns no device and no events."""
+
+    def __init__(self, width: int, height: int, mode: str):
+        context = SnapshotContext()
+        content = SnapshotDisplayContent(context)
+        super().__init__(
+            device=dummy(width=width, height=height, mode=mode),
+            display_content=content,
+            playback_content=None,
+            display_formatter=SnapshotFormatter(content, context),
+            alarm_clock_context=context,
+        )
+
+    def now(self) -> datetime:
+        return self.display_content.snapshot.now
+
+    def render_snapshot(self, snapshot: DisplaySnapshot) -> Image.Image:
+        self.display_content.snapshot = snapshot
+        self.alarm_clock_context.config.clock_format_string = (
+            snapshot.clock_format_string
+        )
+        self.alarm_clock_context.config.blink_segment = snapshot.blink_segment
+        self.formatter.apply(snapshot)
+        return self.render_frame()
+
+
+def _render_worker_main(
+    connection: Connection, shm_name: str, width: int, height: int, mode: str
+):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    display = SnapshotDisplay(width, height, mode)
+    frame_size = width * height * len(mode)
+    index = 0
+    connection.send("ready")
+    try:
+        while True:
+            try:
+                snapshot: DisplaySnapshot = connection.recv()
+            except EOFError:
+                break
+            if snapshot is None:
+                break
+
+            try:
+                frame = display.render_snapshot(snapshot)
+            except Exception:
+                logger.error("%s", traceback.format_exc())
+                connection.send((None, False, None))
+                continue
+
+            # alternate buffers, the previous frame stays intact while this one is written
+            index ^= 1
+            shm.buf[index * frame_size : (index + 1) * frame_size] = frame.tobytes()
+            content = display.display_content
+            # the monotonic clock is shared by the processes of the machine
+            connection.send((index, content.is_scrolling, content.scroll_resumes_at))
+    finally:
+        shm.close()
+
+
+class RenderWorker:
+    """
+    Paints the default screens in a separate process, so that Qt painting and
+    image conversion do not hold the GIL of the input, alarm and API threads.
+
+    The main process sends a DisplaySnapshot per frame; the worker paints it
+    with the regular Display logic into one half of a shared memory double
+    buffer and answers with the index of that half. If the worker fails or
+    does not answer in time, it is shut down and rendering falls back to the
+    main process.
+    """
+
+    timeout_in_secs = 2.0
+
+    def __init__(self, width: int, height: int, mode: str):
+        self.size = (width, height)
+        self.mode = mode
+        self.frame_size = width * height * len(mode)
+        self.available = True
+        self._ready = False
+        self._lock = threading.Lock()
+
+        context = multiprocessing.get_context("spawn")
+        self._shm = shared_memory.SharedMemory(create=True, size=2 * self.frame_size)
+        self._connection, worker_connection = context.Pipe()
+        self._process = context.Process(
+            target=_render_worker_main,
+            args=(worker_connection, self._shm.name, width, height, mode),
+            name="RenderWorker",
+            daemon=True,
+        )
+        self._process.start()
+        worker_connection.close()
+        logger.info("render worker started, pid %s", self._process.pid)
+
+    def render(self, display: Display) -> Image.Image:
+        """Renders the current state of display; None if the caller has to render itself."""
+        with self._lock:
+            if not self.available:
+                return None
+            try:
+                if not self._ready:
+                    # Qt and fonts take a while to load, render in process until then
+                    if not self._connection.poll(0):
+                        return None
+                    self._connection.recv()
+                    self._ready = True
+                    logger.info("render worker ready")
+
+                self._connection.send(DisplaySnapshot.capture(display))
+                if not self._connection.poll(self.timeout_in_secs):
+                    raise TimeoutError("render worker did not answer in time")
+                index, is_scrolling, scroll_resumes_at = self._connection.recv()
+            except (OSError, EOFError, TimeoutError):
+                logger.warning(
+                    "render worker failed, rendering in process: %s",
+                    traceback.format_exc(),
+                )
+                self._shutdown()
+                return None
+
+            if index is None:
+                return None
+
+            offset = index * self.frame_size
+            frame = Image.frombytes(
+                self.mode,
+                self.size,
+                bytes(self._shm.buf[offset : offset + self.frame_size]),
+            )
+            display.display_content.is_scrolling = is_scrolling
+            display.display_content.scroll_resumes_at = scroll_resumes_at
+            return frame
+
+    def close(self):
+        with self._lock:
+            self._shutdown()
+
+    def _shutdown(self):
+        if not self.available:
+            return
+        self.available = False
+        try:
+            self._connection.send(None)
+        except OSError:
+            pass
+        self._process.join(timeout=self.timeout_in_secs)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._connection.close()
+        self._shm.close()
+        self._shm.unlink()
+        logger.info("render worker stopped")
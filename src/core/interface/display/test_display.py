@@ -0,0 +1,169 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import datetime
+import unittest
+
+from luma.core.device import device
+from luma.core.interface.serial import noop
+
+from core.domain.mode_coordinator import AlarmClockModeCoordinator
+from core.domain.model import (
+    AlarmClockContext,
+    AlarmDefinition,
+    Config,
+    Mode,
+    NextAlarmInfo,
+    PlaybackContent,
+    RoomBrightness,
+    SpotifyStream,
+    StreamAudioEffect,
+)
+from core.infrastructure.event_bus import EventBus
+from core.interface.display.display import Display
+from core.interface.display.display_content import DisplayContent
+from core.interface.display.format import DisplayFormatter
+from utils.geolocation import GeoLocation, Weather
+from utils.sound_device import SoundDevice
+
+NOW = datetime.datetime(2026, 10, 16, 8, 30, 15)
+
+
+class NullDevice(device):
+    def __init__(self):
+        super().__init__(serial_interface=noop())
+        self.capabilities(256, 64, 0, "RGB")
+
+    def display(self, image):
+        pass
+
+
+class FixedVolumeSoundDevice(SoundDevice):
+    def get_system_volume(self) -> float:
+        return 0.5
+
+    def set_system_volume(self, volume: float):
+        pass
+
+
+class TestFrameFingerprint(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # one display per process, it owns the QGuiApplication
+        cls.event_bus = EventBus()
+        cls.config = Config(cls.event_bus)
+        cls.alarm = AlarmDefinition()
+        cls.alarm.alarm_name = "morning"
+        cls.alarm.hour = 6
+        cls.alarm.min = 45
+        cls.alarm.recurring = ["MONDAY"]
+        cls.alarm.onetime = None
+        cls.alarm.is_active = True
+        cls.alarm.visual_effect = None
+        cls.alarm.audio_effect = StreamAudioEffect(
+            audio_stream=cls.config.get_offline_stream(), volume=0.3
+        )
+        cls.config.add_alarm_definition(cls.alarm)
+
+        cls.context = AlarmClockContext(cls.config, is_online=True)
+        cls.playback_content = PlaybackContent(
+            cls.context, FixedVolumeSoundDevice(), cls.event_bus
+        )
+        cls.display_content = DisplayContent(
+            cls.context, cls.playback_content, cls.event_bus
+        )
+        cls.coordinator = AlarmClockModeCoordinator(cls.event_bus, cls.context)
+        cls.context.mode_coordinator = cls.coordinator
+        cls.display = Display(
+            NullDevice(),
+            cls.display_content,
+            cls.playback_content,
+            DisplayFormatter(cls.display_content, cls.context),
+            cls.context,
+            cls.event_bus,
+        )
+
+    def setUp(self):
+        self.coordinator.return_to_default_mode()
+        self.display.now = lambda: NOW
+        self.display_content.room_brightness = RoomBrightness(1.0)
+        self.display_content.current_weather = Weather(61, 12.5)
+        self.display_content.show_blink_segment = True
+        self.display_content.show_volume_meter = False
+        # beyond the preview hours, the formatter expects a next alarm
+        self.next_alarm_in(datetime.timedelta(days=2))
+        self.playback_content.playback_mode = Mode.Idle
+        self.playback_content.audio_stream = None
+        self.config.clock_format_string = "%-H<blinkSegment>%M"
+        self.config.blink_segment = ":"
+        self.context.environment.is_online = True
+
+    def play(self):
+        self.playback_content.playback_mode = Mode.Spotify
+        self.playback_content.audio_stream = SpotifyStream(
+            {"name": "Track", "artists": ["Artist"]}
+        )
+
+    def change_config(self):
+        with self.config.transaction(notify=False):
+            self.config.default_volume = 0.5
+
+    def later(self):
+        self.display.now = lambda: NOW + datetime.timedelta(minutes=1)
+
+    def next_alarm_in(self, delta: datetime.timedelta):
+        self.display_content.update_next_alarm(
+            NextAlarmInfo(GeoLocation().now() + delta, self.alarm)
+        )
+
+    def test_every_input_misses_the_cache(self):
+        content = self.display_content
+        changes = {
+            "mode": self.coordinator.handle_mode_button,
+            "config version": self.change_config,
+            "clock format": lambda: setattr(
+                self.config, "clock_format_string", "%H:%M"
+            ),
+            "blink segment": lambda: setattr(self.config, "blink_segment", "."),
+            "gloomy": lambda: setattr(content, "room_brightness", RoomBrightness(0.0)),
+            "minute": self.later,
+            "blink": lambda: setattr(content, "show_blink_segment", False),
+            "weather": lambda: setattr(content, "current_weather", Weather(3, 20.0)),
+            "playback title": self.play,
+            "next alarm": lambda: self.next_alarm_in(datetime.timedelta(hours=3)),
+            "volume meter": lambda: setattr(content, "show_volume_meter", True),
+            "online": lambda: setattr(self.context.environment, "is_online", False),
+        }
+        for name, change in changes.items():
+            with self.subTest(input=name):
+                self.setUp()
+                self.display.refresh()
+                fingerprint = self.display.frame_fingerprint()
+                self.assertIsNotNone(self.display.frame_cache.get(fingerprint))
+
+                change()
+                changed = self.display.frame_fingerprint()
+                self.assertNotEqual(changed, fingerprint)
+                self.assertIsNone(self.display.frame_cache.get(changed))
+
+    def test_editor_inputs_miss_the_cache(self):
+        self.coordinator.handle_mode_button()
+        self.coordinator.handle_invoke_button()
+        self.display.refresh()
+        fingerprints = [self.display.frame_fingerprint()]
+
+        self.coordinator.navigate_properties(1)
+        fingerprints.append(self.display.frame_fingerprint())
+        self.coordinator.handle_invoke_button()
+        fingerprints.append(self.display.frame_fingerprint())
+
+        self.assertEqual(len(set(fingerprints)), 3)
+        for fingerprint in fingerprints[1:]:
+            self.assertIsNone(self.display.frame_cache.get(fingerprint))
+
+    def test_unchanged_inputs_hit_the_cache(self):
+        self.display.refresh()
+        self.assertIsNotNone(
+            self.display.frame_cache.get(self.display.frame_fingerprint())
+        )
@@ -0,0 +1,665 @@
+import logging
+import time
+from typing import Hashable, List, Tuple
+
+import numpy as np
+from PyQt5 import QtCore, QtGui
+
+from core.interface.display.glyph_atlas import GlyphBlitter, GlyphAtlas
+from utils.drawing import PresentationFont, Scroller, Synchroniser
+
+logger = logging.getLogger("tac.core.interface.display.widgets")
+
+ALIGN_LEFT = QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter
+ALIGN_RIGHT = QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter
+ALIGN_CENTER = QtCore.Qt.AlignmentFlag.AlignCenter
+
+
+def font_key(font: QtGui.QFont) -> str:
+    return font.key() if font is not None else None
+
+
+def color_key(color: QtGui.QColor) -> int:
+    return color.rgba() if color is not None else None
+
+
+def painted_rect(image: QtGui.QImage) -> QtCore.QRect:
+    """Bounding rect of the pixels of an ARGB32 image that are not transparent."""
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    alpha = np.frombuffer(bits, np.uint8).reshape(
+        image.height(), image.bytesPerLine() // 4, 4
+    )[:, : image.width(), 3]
+    rows = np.flatnonzero(alpha.any(axis=1))
+    cols = np.flatnonzero(alpha.any(axis=0))
+    if not rows.size:
+        return QtCore.QRect()
+    return QtCore.QRect(
+        int(cols[0]),
+        int(rows[0]),
+        int(cols[-1] - cols[0]) + 1,
+        int(rows[-1] - rows[0]) + 1,
+    )
+
+
+class Widget:
+    """
+    Node of the retained display scene graph.
+
+    A widget owns a rectangle in display coordinates. `inputs()` returns a
+    hashable snapshot of everything `draw()` depends on; the rasterized image
+    is kept and only redrawn when that snapshot (or the size) changes.
+    Images are QImages, not QPixmaps, since refreshes run outside the Qt GUI
+    thread.
+    """
+
+    def __init__(self, rect: QtCore.QRect = None):
+        self.rect = rect if rect is not None else QtCore.QRect()
+        self.visible = True
+        self.render_count = 0
+        self._cache_key = None
+        self._cache_image: QtGui.QImage = None
+        # position of the cached image relative to rect
+        self._cache_offset = QtCore.QPoint()
+
+    def inputs(self) -> Hashable:
+        """Hashable render inputs; None means the widget is drawn every frame."""
+        return None
+
+    def draw(self, painter: QtGui.QPainter, rect: QtCore.QRect):
+        raise NotImplementedError()
+
+    def bounds(self, rect: QtCore.QRect) -> QtCore.QRect:
+        """Area draw() may paint when given rect, if it can spill over rect."""
+        return rect
+
+    def invalidate(self):
+        self._cache_key = None
+        self._cache_image = None
+
+    def paint(self, painter: QtGui.QPainter):
+        if not self.visible or self.rect.isEmpty():
+            return
+
+        key = self.inputs()
+        if key is None:
+            self.draw(painter, self.rect)
+            return
+
+        key = (key, self.rect.width(), self.rect.height())
+        if key != self._cache_key or self._cache_image is None:
+            self._cache_offset, self._cache_image = self._rasterize()
+            self._cache_key = key
+            self.render_count += 1
+        painter.drawImage(self.rect.topLeft() + self._cache_offset, self._cache_image)
+
+    def _rasterize(self) -> Tuple[QtCore.QPoint, QtGui.QImage]:
+        rect = QtCore.QRect(0, 0, self.rect.width(), self.rect.height())
+        bounds = self.bounds(rect)
+        image = QtGui.QImage(
+            bounds.size(), QtGui.QImage.Format.Format_ARGB32_Premultiplied
+        )
+        image.fill(QtCore.Qt.GlobalColor.transparent)
+        painter = QtGui.QPainter(image)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setRenderHint(QtGui.QPainter.TextAntialiasing)
+        painter.translate(-bounds.topLeft())
+        self.draw(painter, rect)
+        painter.end()
+        if bounds != rect:
+            # keep what was painted, the margin is not composited every frame
+            painted = painted_rect(image).translated(bounds.topLeft()).united(rect)
+            image = image.copy(painted.translated(-bounds.topLeft()))
+            bounds = painted
+        return bounds.topLeft(), image
+
+
+class Group(Widget):
+    """Container node. Paints its visible children in order and is never cached."""
+
+    def __init__(self, children: List[Widget] = None):
+        super().__init__()
+        self.children: List[Widget] = list(children or [])
+
+    def add(self, child: Widget) -> Widget:
+        self.children.append(child)
+        return child
+
+    def paint(self, painter: QtGui.QPainter):
+        if not self.visible:
+            return
+        for child in self.children:
+            child.paint(painter)
+
+    def invalidate(self):
+        for child in self.children:
+            child.invalidate()
+
+
+class TextWidget(Widget):
+
+    def __init__(self, alignment=ALIGN_LEFT):
+        super().__init__()
+        self.alignment = alignment
+        self.text: str = None
+        self.font: QtGui.QFont = None
+        self.color: QtGui.QColor = None
+
+    def update(
+        self,
+        rect: QtCore.QRect,
+        text: str,
+        font: QtGui.QFont,
+        color: QtGui.QColor,
+    ) -> "TextWidget":
+        self.rect = rect
+        self.text = text
+        self.font = font
+        self.color = color
+        self.visible = bool(text)
+        return self
+
+    def inputs(self) -> Hashable:
+        return (self.text, font_key(self.font), color_key(self.color))
+
+    def bounds(self, rect: QtCore.QRect) -> QtCore.QRect:
+        # drawText does not clip the ink of glyphs wider than their advance,
+        # like the icons, nor a line taller than rect
+        margin = PresentationFont.get_font_metrics(self.font).height()
+        return rect.adjusted(-margin, -margin, margin, margin)
+
+    def draw(self, painter: QtGui.QPainter, rect: QtCore.QRect):
+        painter.setFont(self.font)
+        painter.setPen(self.color)
+        painter.drawText(rect, self.alignment, self.text)
+
+
+class GlyphTextWidget(TextWidget):
+    """Text widget for short, frequently redrawn strings; blitted from the glyph atlas."""
+
+    blitter = GlyphBlitter()
+
+    def draw(self, painter: QtGui.QPainter, rect: QtCore.QRect):
+        self.blitter.draw_text_in_rect(
+            painter, rect, self.alignment, self.text, self.font, self.color
+        )
+
+
+class LineWidget(Widget):
+
+    color: QtGui.QColor = None
+
+    def update(self, rect: QtCore.QRect, color: QtGui.QColor) -> "LineWidget":
+        self.rect = rect
+        self.color = color
+        return self
+
+    def inputs(self) -> Hashable:
+        return color_key(self.color)
+
+    def draw(self, painter: QtGui.QPainter, rect: QtCore.QRect):
+        painter.setPen(QtGui.QPen(self.color, 1))
+        painter.drawLine(rect.left(), rect.top(), rect.left(), rect.bottom())
+
+
+class DigitRunWidget(Widget):
+    """Clock digits: leading digit raised in the foreground color, the rest lowered and grayed."""
+
+    overlap = 12
+    vertical_shift = 2
+
+    def __init__(self):
+        super().__init__()
+        self.text: str = None
+        self.font: QtGui.QFont = None
+        self.colors: tuple[QtGui.QColor, QtGui.QColor] = None
+        self.baseline: int = 0
+        self.metrics: QtGui.QFontMetrics = None
+
+    @staticmethod
+    def run_width(metrics: QtGui.QFontMetrics, text: str) -> int:
+        width = 0
+        for i, char in enumerate(text):
+            width += metrics.width(char) - (
+                DigitRunWidget.overlap if i < len(text) - 1 else 0
+            )
+        return width
+
+    def update(self, rect, text, font, metrics, colors, baseline) -> "DigitRunWidget":
+        self.rect = rect
+        self.text = text
+        self.font = font
+        self.metrics = metrics
+        self.colors = colors
+        self.baseline = baseline
+        return self
+
+    def inputs(self) -> Hashable:
+        return (
+            self.text,
+            font_key(self.font),
+            color_key(self.colors[0]),
+            color_key(self.colors[1]),
+            self.baseline,
+        )
+
+    def draw(self, painter: QtGui.QPainter, rect: QtCore.QRect):
+        x = rect.left()
+        for i, char in enumerate(self.text):
+            y = rect.top() + self.baseline
+            y += -self.vertical_shift if i == 0 else self.vertical_shift
+            GlyphTextWidget.blitter.draw_text(
+                painter,
+                x,
+                y,
+                char,
+                self.font,
+                self.colors[0] if i == 0 else self.colors[1],
+            )
+            x += self.metrics.width(char) - (
+                self.overlap if i < len(self.text) - 1 else 0
+            )
+
+
+class ClockWidget(Group):
+    """
+    Hours, blink separator and minutes as separate cached children, so the
+    blinking separator never forces the digits to be re-rasterized.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.hours: DigitRunWidget = self.add(DigitRunWidget())
+        self.separator: DigitRunWidget = self.add(DigitRunWidget())
+        self.minutes: DigitRunWidget = self.add(DigitRunWidget())
+
+    def update(
+        self,
+        rect: QtCore.QRect,
+        hour_str: str,
+        min_str: str,
+        blink_char: str,
+        show_blink: bool,
+        fg_color: QtGui.QColor,
+        font: QtGui.QFont,
+    ) -> "ClockWidget":
+        fm = GlyphAtlas().metrics(font)
+
+        hours_width = DigitRunWidget.run_width(fm, hour_str)
+        blink_width = fm.width(blink_char)
+        minutes_width = DigitRunWidget.run_width(fm, min_str)
+        total_width = hours_width - 15 + blink_width - 10 + minutes_width
+
+        x = rect.left() + (rect.width() - total_width) // 2
+        baseline = (rect.height() + fm.ascent() - fm.descent()) // 2
+
+        h, s, v, a = fg_color.getHsv()
+        gray_color = QtGui.QColor.fromHsv(h, s, max(17, v - 18), a)
+
+        self.hours.update(
+            QtCore.QRect(x, rect.top(), hours_width, rect.height()),
+            hour_str,
+            font,
+            fm,
+            (fg_color, gray_color),
+            baseline,
+        )
+        x += hours_width - 15
+
+        self.separator.update(
+            QtCore.QRect(x, rect.top(), blink_width, rect.height()),
+            blink_char,
+            font,
+            fm,
+            (fg_color, fg_color),
+            baseline + DigitRunWidget.vertical_shift,
+        )
+        self.separator.visible = show_blink
+        x += blink_width - 10
+
+        self.minutes.update(
+            QtCore.QRect(x, rect.top(), minutes_width, rect.height()),
+            min_str,
+            font,
+            fm,
+            (fg_color, gray_color),
+            baseline,
+        )
+        return self
+
+
+class ScrollingTextWidget(Widget):
+    """
+    Marquee text; cached while it fits. A title that does not fit is rendered
+    once into a strip (text + gap + text), frames only blit a window of it at
+    the scroller's sub-pixel offset.
+    """
+
+    pause_duration = 2.0
+    gap = 30
+
+    def __init__(self, speed: int = 30, synchroniser: Synchroniser = None):
+        super().__init__()
+        self.scroller = Scroller(0, self.pause_duration, speed, synchroniser)
+        self.text: str = None
+        self.font: QtGui.QFont = None
+        self.color: QtGui.QColor = None
+        self.text_width: int = 0
+        self.offset: float = 0.0
+        self._measured = None
+        self._strip: QtGui.QImage = None
+        self._strip_key = None
+
+    @property
+    def is_scrolling(self) -> bool:
+        """The text does not fit; it moves or pauses between cycles."""
+        return self.visible and self.text_width > self.rect.width()
+
+    @property
+    def is_moving(self) -> bool:
+        return self.is_scrolling and self.scroller.is_moving()
+
+    @property
+    def moves_at(self) -> float:
+        """Monotonic time at which the paused text starts moving again."""
+        return self.scroller.moves_at() if self.is_scrolling else None
+
+    def update(self, rect, text, font, color) -> "ScrollingTextWidget":
+        self.rect = rect
+        self.text = text
+        self.font = font
+        self.color = color
+        self.visible = bool(text)
+        if not self.visible:
+            return self
+
+        now = time.monotonic()
+        if self._measured != (text, font_key(font), rect.width()):
+            self.text_width = PresentationFont.get_font_metrics(font).width(text)
+            self._measured = (text, font_key(font), rect.width())
+            self.scroller.canvas_width = rect.width()
+            self.scroller.reset(self.text_width, self.text_width + self.gap, now)
+        self.offset = self.scroller.tick(now)
+        return self
+
+    def inputs(self) -> Hashable:
+        if self.is_scrolling and self.offset > 0:
+            return None
+        return (self.text, font_key(self.font), color_key(self.color))
+
+    def _render_strip(self) -> QtGui.QImage:
+        key = (
+            self.text,
+            font_key(self.font),
+            color_key(self.color),
+            self.rect.height(),
+        )
+        if key == self._strip_key:
+            return self._strip
+
+        height = self.rect.height()
+        strip = QtGui.QImage(
+            2 * self.text_width + self.gap,
+            height,
+            QtGui.QImage.Format.Format_ARGB32_Premultiplied,
+        )
+        strip.fill(QtCore.Qt.GlobalColor.transparent)
+        fm = PresentationFont.get_font_metrics(self.font)
+        baseline = (height + fm.ascent() - fm.descent()) // 2
+        painter = QtGui.QPainter(strip)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setRenderHint(QtGui.QPainter.TextAntialiasing)
+        painter.setFont(self.font)
+        painter.setPen(self.color)
+        painter.drawText(0, baseline, self.text)
+        painter.drawText(self.text_width + self.gap, baseline, self.text)
+        painter.end()
+
+        self._strip = strip
+        self._strip_key = key
+        self.render_count += 1
+        return strip
+
+    def draw(self, painter: QtGui.QPainter, rect: QtCore.QRect):
+        if not self.is_scrolling:
+            painter.save()
+            painter.setFont(self.font)
+            painter.setPen(self.color)
+            painter.drawText(rect, ALIGN_LEFT, self.text)
+            painter.restore()
+            return
+
+        strip = self._render_strip()
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.SmoothPixmapTransform)
+        painter.drawImage(
+            QtCore.QRectF(rect),
+            strip,
+            QtCore.QRectF(self.offset, 0, rect.width(), rect.height()),
+        )
+        painter.restore()
+
+
+class InfoRowWidget(Group):
+    """One row of the info stack: an icon column followed by text."""
+
+    def __init__(self, icon_width: int = 20):
+        super().__init__()
+        self.icon_width = icon_width
+        self.icon: TextWidget = self.add(GlyphTextWidget())
+        self.label: TextWidget = self.add(TextWidget())
+
+    def update(
+        self,
+        rect: QtCore.QRect,
+        icon: str,
+        icon_font: QtGui.QFont,
+        text: str,
+        font: QtGui.QFont,
+        color: QtGui.QColor,
+    ) -> "InfoRowWidget":
+        text_rect = rect.adjusted(self.icon_width, 0, 0, 0) if icon else rect
+        self.icon.update(rect, icon, icon_font, color)
+        self.label.update(text_rect, text, font, color)
+        return self
+
+
+class PlaybackRowWidget(Group):
+
+    def __init__(self):
+        super().__init__()
+        self.icon: TextWidget = self.add(TextWidget())
+        self.title: ScrollingTextWidget = self.add(ScrollingTextWidget())
+
+    def update(
+        self,
+        rect: QtCore.QRect,
+        title: str,
+        font: QtGui.QFont,
+        color: QtGui.QColor,
+    ) -> "PlaybackRowWidget":
+        self.icon.update(rect, "\uf2eb", font, color)
+        self.title.update(rect.adjusted(20, 0, -5, 0), title, font, color)
+        return self
+
+
+class ValuePickerWidget(Group):
+    """Value framed by left/right arrows."""
+
+    def __init__(self):
+        super().__init__()
+        self.left: TextWidget = self.add(TextWidget(alignment=ALIGN_CENTER))
+        self.right: TextWidget = self.add(TextWidget(alignment=ALIGN_CENTER))
+        self.value: TextWidget = self.add(TextWidget(alignment=ALIGN_CENTER))
+
+    def update(
+        self,
+        rect: QtCore.QRect,
+        value: str,
+        arrow_font: QtGui.QFont,
+        value_font: QtGui.QFont,
+        color: QtGui.QColor,
+    ) -> "ValuePickerWidget":
+        self.left.update(
+            QtCore.QRect(rect.left(), rect.top(), 30, rect.height()),
+            "\uf053",
+            arrow_font,
+            color,
+        )
+        self.right.update(
+            QtCore.QRect(rect.right() - 29, rect.top(), 30, rect.height()),
+            "\uf054",
+            arrow_font,
+            color,
+        )
+        self.value.update(
+            rect.adjusted(30, 0, -30, 0),
+            value,
+            value_font,
+            color,
+        )
+        return self
+
+
+class DayCellWidget(Widget):
+    """Day picker cell: vertical toggle icon above the day label."""
+
+    def __init__(self):
+        super().__init__()
+        self.label: str = None
+        self.is_cursor = False
+        self.is_active = False
+        self.is_ok = False
+        self.colors: tuple[QtGui.QColor, QtGui.QColor] = None
+        self.icon_font: QtGui.QFont = None
+        self.label_font: QtGui.QFont = None
+
+    def update(
+        self,
+        rect: QtCore.QRect,
+        label: str,
+        is_cursor: bool,
+        is_active: bool,
+        is_ok: bool,
+        colors: tuple[QtGui.QColor, QtGui.QColor],
+        icon_font: QtGui.QFont,
+        label_font: QtGui.QFont,
+    ) -> "DayCellWidget":
+        self.rect = rect
+        self.label = label
+        self.is_cursor = is_cursor
+        self.is_active = is_active
+        self.is_ok = is_ok
+        self.colors = colors
+        self.icon_font = icon_font
+        self.label_font = label_font
+        return self
+
+    def inputs(self) -> Hashable:
+        return (
+            self.label,
+            self.is_cursor,
+            self.is_active,
+            self.is_ok,
+            color_key(self.colors[0]),
+            color_key(self.colors[1]),
+            font_key(self.icon_font),
+            font_key(self.label_font),
+        )
+
+    def draw(self, painter: QtGui.QPainter, rect: QtCore.QRect):
+        fg_color, bg_color = self.colors
+        text_color = fg_color
+
+        # Highlight cursor position
+        if self.is_cursor:
+            painter.fillRect(rect, fg_color)
+            text_color = bg_color
+
+        painter.setPen(text_color)
+
+        # Active indicator: toggle icon (fa-toggle-on/off) rotated 90° → vertical
+        if not self.is_ok:
+            toggle_char = "\uf204" if self.is_active else "\uf205"
+            painter.save()
+            painter.setFont(self.icon_font)
+            painter.translate(rect.left() + rect.width() // 2, rect.top() + 13)
+            painter.rotate(90)
+            painter.drawText(
+                QtCore.QRect(-13, -14, 26, 26),
+                ALIGN_CENTER,
+                toggle_char,
+            )
+            painter.restore()
+
+        # Day abbreviation (below the symbol)
+        painter.setFont(self.label_font)
+        painter.drawText(
+            QtCore.QRect(rect.left(), rect.top() + 32, rect.width(), 14),
+            ALIGN_CENTER,
+            self.label,
+        )
+
+
+class DefaultNormalScene(Group):
+
+    def __init__(self):
+        super().__init__()
+        self.clock: ClockWidget = self.add(ClockWidget())
+        self.separator_line: LineWidget = self.add(LineWidget())
+        self.info_stack: Group = self.add(Group())
+        self.weather_row = InfoRowWidget(icon_width=22)
+        self.playback_row = PlaybackRowWidget()
+        self.alarm_row = GlyphTextWidget()
+        self.volume_row = TextWidget()
+
+
+class DefaultDimmedScene(Group):
+
+    def __init__(self):
+        super().__init__()
+        self.clock: TextWidget = self.add(GlyphTextWidget())
+        self.alarm_icon: TextWidget = self.add(GlyphTextWidget())
+        self.alarm_time: TextWidget = self.add(TextWidget())
+        self.offline_icon: TextWidget = self.add(TextWidget())
+
+
+class AlarmViewScene(Group):
+
+    def __init__(self):
+        super().__init__()
+        self.header: TextWidget = self.add(TextWidget())
+        self.time: TextWidget = self.add(TextWidget())
+        self.status: TextWidget = self.add(TextWidget(alignment=ALIGN_RIGHT))
+        self.days: TextWidget = self.add(
+            TextWidget(
+                alignment=QtCore.Qt.AlignmentFlag.AlignRight
+                | QtCore.Qt.AlignmentFlag.AlignBottom
+            )
+        )
+
+
+class AlarmEditScene(Group):
+
+    def __init__(self):
+        super().__init__()
+        self.property_name: TextWidget = self.add(TextWidget(alignment=ALIGN_CENTER))
+        self.value: TextWidget = self.add(TextWidget(alignment=ALIGN_CENTER))
+
+
+class PropertyEditScene(Group):
+
+    def __init__(self):
+        super().__init__()
+        self.header: TextWidget = self.add(TextWidget(alignment=ALIGN_CENTER))
+        self.picker: ValuePickerWidget = self.add(ValuePickerWidget())
+
+
+class DayPickerScene(Group):
+
+    def __init__(self, cell_count: int):
+        super().__init__()
+        self.header: TextWidget = self.add(TextWidget(alignment=ALIGN_CENTER))
+        self.cells: List[DayCellWidget] = [
+            self.add(DayCellWidget()) for _ in range(cell_count)
+        ]
@@ -34,7 +34,7 @@ librespotify_env_vars = [
 
 config_file = os.path.join(app_dir, "config.json")
 webroot_file = os.path.join(app_dir, "core", "interface", "web", "template.html")
-active_alarm_definition_file = f"/tmp/toc_active_alarm.json"
+alarm_journal_file = os.path.join(app_dir, "alarm_journal.bin")
 display_shot_file = os.path.join(app_dir, "..", "..", "display_test.png")
 ssl_dir = os.path.join(app_dir, "../rpi/tls")
 
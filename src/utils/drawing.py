@@ -6,6 +6,7 @@ from luma.core.image_composition import ComposableImage
 from PyQt5 import QtGui
 
 import logging
+import threading
 
 from utils.singleton import singleton
 from resources.resources import fonts_dir, weather_icons_dir
@@ -177,16 +178,22 @@ class Synchroniser:
 
 
 class Scroller:
+    """
+    Time driven marquee: wait - scroll one cycle - sync with other scrollers -
+    wait ... The scrolled content has to repeat after `cycle_width` pixels
+    (e.g. a strip of text + gap + text), so a finished cycle looks like its
+    start and rewinding is seamless.
+    """
+
     WAIT_SCROLL = 1
     SCROLLING = 2
-    WAIT_REWIND = 3
     WAIT_SYNC = 4
 
     def __init__(
         self,
         canvas_width: int,
-        scroll_delay,
-        scroll_speed: int = 2,
+        scroll_delay: float,
+        scroll_speed: float = 30,
         synchroniser: Synchroniser = None,
     ):
         if synchroniser is None:
@@ -195,72 +202,74 @@ class Scroller:
         self.speed = scroll_speed
         self.delay = scroll_delay
         self.synchroniser = synchroniser
-        self.image_x_pos = 0
-        self.ticks = 0
-        self.state = self.WAIT_SCROLL
+        self.cycle_width = 0
+        self.image_x_pos = 0.0
         self.must_scroll = False
-        self.synchroniser.busy(self)
-
-    def tick(self, rendered_image):
-        self.max_pos = rendered_image.width - self.canvas_width
-        self.must_scroll = self.max_pos > 0
-        rendered_image = self.render(rendered_image)
-
-        # Repeats the following sequence:
-        #  wait - scroll - wait - rewind -> sync with other scrollers -> wait
-        if self.state == self.WAIT_SCROLL:
-            if not self.is_waiting():
-                self.state = self.SCROLLING
-                self.synchroniser.busy(self)
-
-        elif self.state == self.WAIT_REWIND:
-            if not self.is_waiting():
-                self.synchroniser.ready(self)
-                self.state = self.WAIT_SYNC
-
-        elif self.state == self.WAIT_SYNC:
-            if self.synchroniser.is_synchronised():
-                self.rewind()
+        self.state = self.WAIT_SCROLL
+        self.state_since = 0.0
 
-        elif self.state == self.SCROLLING:
-            if self.image_x_pos < self.max_pos:
-                if self.must_scroll:
-                    self.image_x_pos += self.speed
-            else:
-                self.state = self.WAIT_REWIND
+    def reset(self, content_width: int, cycle_width: int, now: float):
+        self.must_scroll = content_width > self.canvas_width
+        self.cycle_width = cycle_width
+        self.image_x_pos = 0.0
+        self.state = self.WAIT_SCROLL
+        self.state_since = now
+        self.synchroniser.ready(self)
+
+    def tick(self, now: float) -> float:
+        """Advances the state machine to now; returns the x offset into the content."""
+        if not self.must_scroll:
+            return 0.0
+
+        if self.state == self.WAIT_SCROLL and now - self.state_since >= self.delay:
+            self.state = self.SCROLLING
+            self.state_since += self.delay
+            self.synchroniser.busy(self)
+
+        if self.state == self.SCROLLING:
+            self.image_x_pos = (now - self.state_since) * self.speed
+            if self.image_x_pos >= self.cycle_width:
+                self.image_x_pos = 0.0
+                self.state = self.WAIT_SYNC
+                self.synchroniser.ready(self)
 
-        return rendered_image
+        if self.state == self.WAIT_SYNC and self.synchroniser.is_synchronised():
+            self.state = self.WAIT_SCROLL
+            self.state_since = now
 
-    def rewind(self):
-        if self.must_scroll:
-            self.image_x_pos = 0
-        self.state = self.WAIT_SCROLL
+        return self.image_x_pos
 
     def is_scrolling(self) -> bool:
         return self.must_scroll
 
-    def render(self, rendered_image: Image.Image):
-        return rendered_image.crop(
-            (
-                self.image_x_pos,
-                0,
-                self.image_x_pos + self.canvas_width,
-                rendered_image.height,
-            )
-        )
+    def is_moving(self) -> bool:
+        return self.state == self.SCROLLING
 
-    def is_waiting(self):
-        self.ticks += 1
-        if self.ticks > self.delay:
-            self.ticks = 0
-            return False
-        return True
+    def moves_at(self) -> float:
+        """
+        When a pause ends; None while moving, while waiting for the other
+        scrollers or when nothing has to scroll.
+        """
+        if not self.must_scroll or self.state != self.WAIT_SCROLL:
+            # in WAIT_SYNC another scroller still moves and keeps the frames
+            # coming, the frame after it is done ends the wait
+            return None
+        return self.state_since + self.delay
 
 
 @singleton
 class PresentationFontSingleton:
-    _font_cache: Dict[str, BinaryIO] = {}
-    _font_family_cache: Dict[str, QtGui.QFont] = {}
+    """
+    Registry of the presentation fonts: each font file is read and registered
+    with Qt once, QFonts and QFontMetrics are cached per (path, size, weight).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._font_cache: Dict[str, BinaryIO] = {}
+        self._font_families: Dict[str, str] = {}
+        self._font_family_cache: Dict[str, QtGui.QFont] = {}
+        self._font_metrics_cache: Dict[str, QtGui.QFontMetrics] = {}
 
     def _get_cached_font_file(self, font_path: str) -> BinaryIO:
         if font_path not in self._font_cache:
@@ -270,21 +279,39 @@ class PresentationFontSingleton:
         self._font_cache[font_path].seek(0)
         return self._font_cache[font_path]
 
-    def _get_cached_font_family(self, font_path: str, size: int, weight: int) -> QtGui.QFont:
-        font_key = f"{font_path}/{size}/{weight}"
-        if font_key not in self._font_family_cache:
+    def _get_registered_family(self, font_path: str) -> str:
+        family = self._font_families.get(font_path)
+        if family is None:
             id = QtGui.QFontDatabase.addApplicationFont(font_path)
-            if id != -1:
-                families = QtGui.QFontDatabase.applicationFontFamilies(id)
-                if families:
-                    family = families[0]
-                    self._font_family_cache[font_key] = QtGui.QFont(family, size, weight)
-                     
-
-        if font_key in self._font_family_cache:
-            return self._font_family_cache[font_key]
+            families = (
+                QtGui.QFontDatabase.applicationFontFamilies(id) if id != -1 else []
+            )
+            if not families:
+                raise ValueError(f"Could not register font {font_path}")
+            family = families[0]
+            self._font_families[font_path] = family
+            logger.debug("registered font %s as %s", font_path, family)
+        return family
 
-        raise ValueError(f"Could not load font family for font_key {font_key}")
+    def _get_cached_font_family(self, font_path: str, size: int, weight: int) -> QtGui.QFont:
+        font_key = f"{font_path}/{size}/{weight}"
+        font = self._font_family_cache.get(font_key)
+        if font is None:
+            with self._lock:
+                font = self._font_family_cache.get(font_key)
+                if font is None:
+                    family = self._get_registered_family(font_path)
+                    font = QtGui.QFont(family, size, weight)
+                    self._font_family_cache[font_key] = font
+        return font
+
+    def _get_cached_font_metrics(self, font: QtGui.QFont) -> QtGui.QFontMetrics:
+        font_key = font.key()
+        metrics = self._font_metrics_cache.get(font_key)
+        if metrics is None:
+            metrics = QtGui.QFontMetrics(font)
+            self._font_metrics_cache[font_key] = metrics
+        return metrics
 
 
 class PresentationFont:
@@ -305,3 +332,6 @@ class PresentationFont:
 
     def get_font_family(font_path: str, size: int, weight: int) -> QtGui.QFont:
         return PresentationFontSingleton()._get_cached_font_family(font_path, size, weight)
+
+    def get_font_metrics(font: QtGui.QFont) -> QtGui.QFontMetrics:
+        return PresentationFontSingleton()._get_cached_font_metrics(font)
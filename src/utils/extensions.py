@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 from typing import Generic, Type, TypeVar
 from apscheduler.job import Job
@@ -22,6 +23,27 @@ def get_job_arg(job: Job, argType: Type[T]) -> T:
     return job.args[0]
 
 
+def write_atomically(path: str, data: bytes):
+    """Replaces path with data, so that a power cut leaves either the old or the new file."""
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    # persist the rename itself
+    dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
 def respect_ranges(value: float, min_value: int = 0, max_value: int = 15) -> int:
     return int(max(min_value, min(max_value, value)))
 
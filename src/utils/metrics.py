@@ -0,0 +1,174 @@
+import bisect
+import logging
+import threading
+from typing import Callable, Dict, List, Tuple
+
+from utils.singleton import singleton
+
+logger = logging.getLogger("tac.metrics")
+
+# 100 us .. ~13 s, doubling; fixed so that observing never allocates
+LOG_SCALE_BUCKETS: Tuple[float, ...] = tuple(0.0001 * 2**i for i in range(18))
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels, extra: str = None) -> str:
+    parts = [f'{key}="{_escape(value)}"' for key, value in labels]
+    if extra is not None:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
+
+
+class Histogram:
+    """Cumulative histogram of durations in seconds over fixed buckets."""
+
+    def __init__(self, labels: Labels, buckets: Tuple[float, ...]):
+        self.labels = labels
+        self.buckets = buckets
+        # the last slot counts observations above the largest bucket
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += seconds
+            self.count += 1
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile, inf above the last one."""
+        counts, _, count = self.snapshot()
+        rank = q * count
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return bound
+        return float("inf")
+
+
+class Gauge:
+    """Value read from a callback at scrape time."""
+
+    def __init__(self, labels: Labels, read: Callable[[], float]):
+        self.labels = labels
+        self.read = read
+
+
+class MetricFamily:
+
+    def __init__(self, name: str, help: str, type: str):
+        self.name = name
+        self.help = help
+        self.type = type
+        self.children: Dict[Labels, object] = {}
+
+
+@singleton
+class MetricsRegistry:
+    """
+    In-process metrics, exposed in the Prometheus text format.
+
+    histogram() returns the same Histogram for the same name and labels, so
+    hot paths look it up once and keep it.
+    """
+
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def _family(self, name: str, help: str, type: str) -> MetricFamily:
+        family = self._families.get(name)
+        if family is None:
+            family = self._families.setdefault(name, MetricFamily(name, help, type))
+        if family.type != type:
+            raise ValueError(f"metric {name} is a {family.type}, not a {type}")
+        return family
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        buckets: Tuple[float, ...] = LOG_SCALE_BUCKETS,
+        **labels: str,
+    ) -> Histogram:
+        key: Labels = tuple(sorted(labels.items()))
+        with self._lock:
+            family = self._family(name, help, "histogram")
+            histogram = family.children.get(key)
+            if histogram is None:
+                histogram = family.children[key] = Histogram(key, buckets)
+        return histogram
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        read: Callable[[], float],
+        type: str = "gauge",
+        **labels: str,
+    ):
+        """Registers a callback gauge, or counter with type "counter"; replaces one with the same labels."""
+        key: Labels = tuple(sorted(labels.items()))
+        with self._lock:
+            self._family(name, help, type).children[key] = Gauge(key, read)
+
+    def histograms(self, name: str) -> List[Histogram]:
+        with self._lock:
+            family = self._families.get(name)
+            return [] if family is None else list(family.children.values())
+
+    def exposition(self) -> str:
+        with self._lock:
+            families = sorted(self._families.values(), key=lambda f: f.name)
+            children = {f.name: list(f.children.values()) for f in families}
+
+        lines = []
+        for family in families:
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+            for child in children[family.name]:
+                if isinstance(child, Histogram):
+                    self._histogram_lines(family.name, child, lines)
+                else:
+                    try:
+                        value = child.read()
+                    except Exception:
+                        logger.debug("reading %s failed", family.name, exc_info=True)
+                        continue
+                    lines.append(
+                        f"{family.name}{_format_labels(child.labels)} "
+                        f"{_format_value(value)}"
+                    )
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _histogram_lines(name: str, histogram: Histogram, lines: List[str]):
+        counts, total, count = histogram.snapshot()
+        cumulative = 0
+        for bound, bucket_count in zip(histogram.buckets, counts):
+            cumulative += bucket_count
+            le = f'le="{bound:g}"'
+            lines.append(
+                f"{name}_bucket{_format_labels(histogram.labels, le)} {cumulative}"
+            )
+        inf = 'le="+Inf"'
+        lines.append(f"{name}_bucket{_format_labels(histogram.labels, inf)} {count}")
+        lines.append(f"{name}_sum{_format_labels(histogram.labels)} {total!r}")
+        lines.append(f"{name}_count{_format_labels(histogram.labels)} {count}")
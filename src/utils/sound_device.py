@@ -2,9 +2,11 @@ from collections import namedtuple
 import logging
 import math
 import threading
+import time
 from typing import Tuple
 import alsaaudio
 from resources import resources
+from utils.metrics import MetricsRegistry
 
 logger = logging.getLogger("tac.sound_device")
 
@@ -17,10 +19,17 @@ Algorithm = namedtuple(
 class SoundDevice:
 
     def invoke_on_mixer(self, callback):
+        start = time.perf_counter()
         mixer = self.get_mixer(control=self.control, device=self.device)
         if callback is not None:
             return_from_callback = callback(mixer)
         mixer.close()
+        MetricsRegistry().histogram(
+            "tac_alsa_mixer_seconds",
+            "Duration of ALSA mixer calls, including opening the mixer",
+            # get_system_volume.<locals>.callback -> get_system_volume
+            call=callback.__qualname__.split(".")[0] if callback else "open",
+        ).observe(time.perf_counter() - start)
         return return_from_callback
 
     def __init__(self, control="", device="default"):
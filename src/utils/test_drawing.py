@@ -0,0 +1,29 @@
+import unittest
+
+from utils.drawing import Scroller, Synchroniser
+
+
+class TestScroller(unittest.TestCase):
+    def test_moves_at_while_waiting_for_a_partner(self):
+        synchroniser = Synchroniser()
+        short = Scroller(100, scroll_delay=2, synchroniser=synchroniser)
+        long = Scroller(100, scroll_delay=2, synchroniser=synchroniser)
+        short.reset(content_width=150, cycle_width=150, now=0)
+        long.reset(content_width=300, cycle_width=300, now=0)
+        self.assertEqual(short.moves_at(), 2)
+
+        for scroller in (short, long):
+            scroller.tick(3)
+        self.assertIsNone(short.moves_at())
+
+        # 150 px at 30 px/s: the short one is done after 5 s, the long one is not
+        for scroller in (short, long):
+            scroller.tick(8)
+        self.assertEqual(short.state, Scroller.WAIT_SYNC)
+        self.assertIsNone(short.moves_at())
+        self.assertTrue(long.is_moving())
+
+        for scroller in (long, short):
+            scroller.tick(13)
+        self.assertEqual(short.moves_at(), 15)
+        self.assertEqual(long.moves_at(), 15)
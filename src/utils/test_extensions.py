@@ -0,0 +1,35 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from utils.extensions import write_atomically
+
+
+class TestWriteAtomically(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "config.json")
+        with open(self.path, "wb") as f:
+            f.write(b"old")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def test_replaces_the_file(self):
+        write_atomically(self.path, b"new")
+        self.assertEqual(self.read(), b"new")
+        self.assertEqual(os.listdir(self.directory.name), ["config.json"])
+
+    def test_failure_leaves_the_old_file_intact(self):
+        for target in ("os.fsync", "os.replace"):
+            with self.subTest(failing=target):
+                with patch(target, side_effect=OSError("disk full")):
+                    with self.assertRaises(OSError):
+                        write_atomically(self.path, b"new")
+                self.assertEqual(self.read(), b"old")
+                self.assertEqual(os.listdir(self.directory.name), ["config.json"])
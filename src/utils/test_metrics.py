@@ -0,0 +1,31 @@
+import unittest
+from utils.metrics import MetricsRegistry
+
+
+class TestMetrics(unittest.TestCase):
+    def test_histogram_exposition(self):
+        histogram = MetricsRegistry().histogram(
+            "test_seconds", "test histogram", buckets=(0.001, 0.01), handler="h"
+        )
+        self.assertIs(
+            histogram,
+            MetricsRegistry().histogram(
+                "test_seconds", "test histogram", buckets=(0.001, 0.01), handler="h"
+            ),
+        )
+        histogram.observe(0.0005)
+        histogram.observe(0.005)
+        histogram.observe(1.0)
+
+        lines = MetricsRegistry().exposition().splitlines()
+        self.assertIn("# TYPE test_seconds histogram", lines)
+        self.assertIn('test_seconds_bucket{handler="h",le="0.001"} 1', lines)
+        self.assertIn('test_seconds_bucket{handler="h",le="0.01"} 2', lines)
+        self.assertIn('test_seconds_bucket{handler="h",le="+Inf"} 3', lines)
+        self.assertIn('test_seconds_count{handler="h"} 3', lines)
+
+    def test_gauge_is_read_at_exposition(self):
+        values = [1]
+        MetricsRegistry().gauge("test_depth", "test gauge", lambda: values[0], q="a")
+        values[0] = 7
+        self.assertIn('test_depth{q="a"} 7.0', MetricsRegistry().exposition())